@@ -0,0 +1,95 @@
+"""
+Calcul des coups de l'IA dans un thread de fond.
+
+L'interface soumet un calcul et reçoit un ticket, puis interroge
+régulièrement le résultat depuis sa boucle d'événements (``after``) : la
+fenêtre reste réactive pendant que l'IA réfléchit. ``cancel`` invalide les
+calculs en cours ou en attente (ex. lors d'une nouvelle partie) ; leurs
+résultats sont ignorés. Un calcul soumis avec ``cancellable=True`` reçoit en
+plus un ``threading.Event`` (argument ``cancel``) levé par ``cancel`` : il
+peut s'interrompre au lieu d'occuper le thread jusqu'à son terme.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class AIWorker:
+    """
+    Thread unique exécutant les calculs dans l'ordre de soumission.
+
+    Un seul thread garantit qu'une IA n'est jamais utilisée par deux calculs
+    en même temps.
+    """
+
+    def __init__(self):
+        self._tasks: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._done: Dict[int, Tuple[Any, BaseException]] = {}
+        self._last_ticket = 0
+        self._first_valid = 1
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="battleship-ai",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, function: Callable, *args, cancellable: bool = False) -> int:
+        """
+        Planifie ``function(*args)`` et retourne le ticket du calcul.
+
+        Avec ``cancellable``, le calcul est appelé avec l'argument ``cancel``,
+        événement levé lorsque le calcul est annulé.
+        """
+        self._last_ticket += 1
+        cancel = self._cancel if cancellable else None
+        self._tasks.put((self._last_ticket, function, args, cancel))
+        return self._last_ticket
+
+    def cancel(self):
+        """Ignore tous les calculs soumis jusqu'ici et interrompt le calcul en cours."""
+        self._first_valid = self._last_ticket + 1
+        self._done.clear()
+        self._cancel.set()
+        self._cancel = threading.Event()
+
+    def poll(self, ticket: int) -> Tuple[bool, Any]:
+        """
+        Retourne ``(True, résultat)`` si le calcul est terminé, ``(False, None)`` sinon.
+
+        Raises:
+            Exception: L'exception levée par le calcul, le cas échéant
+        """
+        while True:
+            try:
+                done, value, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if done >= self._first_valid:
+                self._done[done] = (value, error)
+        if ticket not in self._done:
+            return False, None
+        value, error = self._done.pop(ticket)
+        if error is not None:
+            raise error
+        return True, value
+
+    def close(self):
+        """Arrête le thread après le calcul en cours."""
+        self.cancel()
+        self._tasks.put(None)
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            ticket, function, args, cancel = task
+            if ticket < self._first_valid:
+                continue
+            try:
+                value = (function(*args) if cancel is None
+                         else function(*args, cancel=cancel))
+                self._results.put((ticket, value, None))
+            except Exception as error:
+                self._results.put((ticket, None, error))
@@ -0,0 +1,523 @@
+"""
+Statistiques agrégées en flux sur des parties simulées.
+
+``GameAnalytics`` consomme les parties une à une (même interface
+``write(record)`` que le journal binaire) et ne conserve que des agrégats de
+taille fixe, par camp :
+
+    cartes des tirs et des touches par case visée
+    distribution du nombre de tirs pour gagner
+    distribution du tir qui coule chaque navire de la flotte
+    tirs et touches au n-ième tir de la partie (courbe de précision)
+
+La mémoire ne dépend que de la taille du plateau et de la flotte, pas du
+nombre de parties. Deux agrégats de même configuration s'additionnent
+(``merge``) : chaque processus du pool joue ses lots, le processus principal
+fusionne les résultats au fil de l'eau. Les agrégats s'exportent en JSON
+(relisible et fusionnable) et en CSV.
+
+Exemple :
+    python -m battleship.analytics --ai density hard -n 1000000 --workers 8 \\
+        --json stats.json --csv stats
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from .models.layouts import RANDOM_PLACEMENT, fleet_placer
+from .models.params import is_known_difficulty
+from .replay import GameRecord, read_games
+from .simulation import play_games
+from .tournament import ChunkTask, chunk_seed
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+ANALYTICS_VERSION = 1
+
+# Lots en attente par processus (borne la mémoire du processus principal)
+_PENDING_PER_WORKER = 2
+
+
+def _zeros(length: int) -> array:
+    return array("Q", bytes(8 * length))
+
+
+def _load(target: array, values: Sequence[int]):
+    if len(values) != len(target):
+        raise ValueError("Statistiques invalides : tableau de mauvaise taille")
+    target[:] = array("Q", values)
+
+
+def _add(target: array, source: array):
+    for index, value in enumerate(source):
+        if value:
+            target[index] += value
+
+
+def histogram_quantile(histogram: Sequence[int], q: float) -> Optional[int]:
+    """Quantile (rang le plus proche) d'un histogramme indexé par la valeur."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = max(1, math.ceil(q * total))
+    seen = 0
+    for value, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return value
+    return len(histogram) - 1
+
+
+def histogram_summary(histogram: Sequence[int]) -> Dict[str, Optional[float]]:
+    """Effectif, moyenne, écart-type, extrêmes et quantiles d'un histogramme."""
+    count = sum(histogram)
+    if not count:
+        return {"count": 0, "mean": None, "stdev": None, "min": None,
+                "p10": None, "p50": None, "p90": None, "max": None}
+    total = sum(value * weight for value, weight in enumerate(histogram))
+    total_sq = sum(value * value * weight for value, weight in enumerate(histogram))
+    mean = total / count
+    variance = (total_sq - count * mean * mean) / (count - 1) if count > 1 else 0.0
+    used = [value for value, weight in enumerate(histogram) if weight]
+    return {
+        "count": count,
+        "mean": mean,
+        "stdev": math.sqrt(max(variance, 0.0)),
+        "min": used[0],
+        "p10": histogram_quantile(histogram, 0.1),
+        "p50": histogram_quantile(histogram, 0.5),
+        "p90": histogram_quantile(histogram, 0.9),
+        "max": used[-1],
+    }
+
+
+class GameAnalytics:
+    """
+    Agrégats de taille fixe d'un flux de parties, par camp (tireur).
+
+    Les histogrammes sont indexés par le nombre de tirs du camp (de 0 au
+    nombre de cases) ; les courbes par tour, par numéro de tir du camp
+    (0 pour son premier tir).
+
+    Attributes:
+        size (int): Taille des plateaux
+        fleet (Tuple[Tuple[str, int], ...]): Nom et longueur de chaque navire
+        labels (Tuple[str, str]): Nom de chaque camp (ex. difficulté de l'IA)
+        games (int): Parties agrégées
+        wins (List[int]): Victoires de chaque camp
+        unfinished (int): Parties sans vainqueur
+        shots (List[array]): Tirs de chaque camp par case visée
+        hits (List[array]): Touches de chaque camp par case visée
+        shots_to_win (List[array]): Histogramme des tirs du camp gagnant
+        shots_to_sink (List[List[array]]): Par camp et par navire adverse,
+            histogramme du numéro du tir qui le coule
+        turn_shots (List[array]): Tirs joués au n-ième tir de chaque camp
+        turn_hits (List[array]): Touches au n-ième tir de chaque camp
+    """
+
+    def __init__(self, size: int = GRID_SIZE,
+                 ships_config: Dict[str, int] = SHIPS_CONFIG,
+                 labels: Sequence[str] = ("1", "2")):
+        self.size = size
+        self.fleet = tuple(ships_config.items())
+        self.labels = tuple(labels)
+        self.games = 0
+        self.wins = [0, 0]
+        self.unfinished = 0
+        cells = size * size
+        self.shots = [_zeros(cells) for _ in range(2)]
+        self.hits = [_zeros(cells) for _ in range(2)]
+        self.shots_to_win = [_zeros(cells + 1) for _ in range(2)]
+        self.shots_to_sink = [[_zeros(cells + 1) for _ in self.fleet]
+                              for _ in range(2)]
+        self.turn_shots = [_zeros(cells) for _ in range(2)]
+        self.turn_hits = [_zeros(cells) for _ in range(2)]
+
+    def _arrays(self) -> List[array]:
+        arrays = []
+        for side in range(2):
+            arrays += [self.shots[side], self.hits[side], self.shots_to_win[side],
+                       self.turn_shots[side], self.turn_hits[side]]
+            arrays += self.shots_to_sink[side]
+        return arrays
+
+    def write(self, record: GameRecord):
+        """
+        Ajoute une partie.
+
+        Raises:
+            ValueError: Si la partie ne correspond pas à la configuration
+        """
+        size = self.size
+        if record.size != size or tuple(record.fleet) != self.fleet:
+            raise ValueError("La partie ne correspond pas aux statistiques")
+
+        # Numéro du navire occupant chaque case touchée, par plateau visé
+        owners = []
+        for placements in record.placements:
+            owner = {}
+            for number, ((_, length), (x, y, horizontal)) in enumerate(
+                    zip(self.fleet, placements)):
+                step = 1 if horizontal else size
+                start = y * size + x
+                for i in range(length):
+                    owner[start + i * step] = number
+            owners.append(owner)
+
+        turns = [0, 0]
+        for shot in record.shots:
+            side = shot.shooter
+            cell = shot.y * size + shot.x
+            turn = turns[side]
+            turns[side] = turn + 1
+            self.shots[side][cell] += 1
+            self.turn_shots[side][turn] += 1
+            if shot.hit:
+                self.hits[side][cell] += 1
+                self.turn_hits[side][turn] += 1
+                if shot.sunk:
+                    self.shots_to_sink[side][owners[1 - side][cell]][turn + 1] += 1
+
+        self.games += 1
+        if record.winner is None:
+            self.unfinished += 1
+        else:
+            self.wins[record.winner] += 1
+            self.shots_to_win[record.winner][turns[record.winner]] += 1
+
+    def merge(self, other: "GameAnalytics"):
+        """
+        Ajoute les agrégats d'un autre objet (ex. d'un autre processus).
+
+        Raises:
+            ValueError: Si les configurations diffèrent
+        """
+        if (other.size, other.fleet, other.labels) != (self.size, self.fleet,
+                                                       self.labels):
+            raise ValueError("Statistiques de configurations différentes")
+        self.games += other.games
+        self.unfinished += other.unfinished
+        for side in range(2):
+            self.wins[side] += other.wins[side]
+        for target, source in zip(self._arrays(), other._arrays()):
+            _add(target, source)
+
+    def accuracy(self, side: int) -> List[float]:
+        """Précision du camp au n-ième tir, jusqu'à son dernier tir observé."""
+        curve = []
+        for shots, hits in zip(self.turn_shots[side], self.turn_hits[side]):
+            if not shots:
+                break
+            curve.append(hits / shots)
+        return curve
+
+    def summary(self) -> Dict[str, object]:
+        """Résumé par camp : victoires, tirs pour gagner et pour couler."""
+        sides = []
+        for side in range(2):
+            sides.append({
+                "label": self.labels[side],
+                "wins": self.wins[side],
+                "shots_to_win": histogram_summary(self.shots_to_win[side]),
+                "shots_to_sink": {
+                    name: histogram_summary(histogram)
+                    for (name, _), histogram in zip(self.fleet,
+                                                    self.shots_to_sink[side])
+                },
+            })
+        return {"games": self.games, "unfinished": self.unfinished,
+                "sides": sides}
+
+    def to_dict(self) -> Dict[str, object]:
+        """Agrégats complets, sérialisables en JSON (résumé compris)."""
+        return {
+            "version": ANALYTICS_VERSION,
+            "size": self.size,
+            "fleet": [list(ship) for ship in self.fleet],
+            "labels": list(self.labels),
+            "games": self.games,
+            "wins": self.wins,
+            "unfinished": self.unfinished,
+            "sides": [{
+                "shots": list(self.shots[side]),
+                "hits": list(self.hits[side]),
+                "shots_to_win": list(self.shots_to_win[side]),
+                "shots_to_sink": [list(histogram)
+                                  for histogram in self.shots_to_sink[side]],
+                "turn_shots": list(self.turn_shots[side]),
+                "turn_hits": list(self.turn_hits[side]),
+            } for side in range(2)],
+            "summary": self.summary(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "GameAnalytics":
+        """
+        Reconstruit des agrégats exportés par ``to_dict``.
+
+        Raises:
+            ValueError: Si le document n'est pas un export valide
+        """
+        try:
+            if data["version"] != ANALYTICS_VERSION:
+                raise ValueError("Version de statistiques non prise en charge")
+            analytics = cls(data["size"], dict(data["fleet"]), data["labels"])
+            analytics.games = data["games"]
+            analytics.wins = list(data["wins"])
+            analytics.unfinished = data["unfinished"]
+            for side in range(2):
+                values = data["sides"][side]
+                for name in ("shots", "hits", "shots_to_win",
+                             "turn_shots", "turn_hits"):
+                    _load(getattr(analytics, name)[side], values[name])
+                if len(values["shots_to_sink"]) != len(analytics.fleet):
+                    raise ValueError("Statistiques invalides : flotte incohérente")
+                for target, histogram in zip(analytics.shots_to_sink[side],
+                                             values["shots_to_sink"]):
+                    _load(target, histogram)
+        except (KeyError, TypeError, IndexError, OverflowError) as error:
+            raise ValueError(f"Statistiques invalides : {error}") from None
+        return analytics
+
+    def write_json(self, path: str):
+        """Écrit les agrégats en JSON."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False)
+
+    @classmethod
+    def read_json(cls, path: str) -> "GameAnalytics":
+        """Relit des agrégats écrits par ``write_json``."""
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def write_csv(self, directory: str):
+        """
+        Écrit les agrégats en quatre fichiers CSV (format long) :
+        ``heatmap.csv``, ``shots_to_win.csv``, ``shots_to_sink.csv`` et
+        ``accuracy.csv``.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        def table(name: str, header: Sequence[str]):
+            file = open(os.path.join(directory, name), "w", newline="",
+                        encoding="utf-8")
+            writer = csv.writer(file)
+            writer.writerow(header)
+            return file, writer
+
+        size = self.size
+        file, writer = table("heatmap.csv", ("camp", "x", "y", "tirs", "touches"))
+        with file:
+            for side in range(2):
+                for cell, (shots, hits) in enumerate(zip(self.shots[side],
+                                                         self.hits[side])):
+                    writer.writerow((self.labels[side], cell % size,
+                                     cell // size, shots, hits))
+
+        file, writer = table("shots_to_win.csv", ("camp", "tirs", "parties"))
+        with file:
+            for side in range(2):
+                for shots, count in enumerate(self.shots_to_win[side]):
+                    if count:
+                        writer.writerow((self.labels[side], shots, count))
+
+        file, writer = table("shots_to_sink.csv", ("camp", "navire", "tirs", "navires"))
+        with file:
+            for side in range(2):
+                for (name, _), histogram in zip(self.fleet, self.shots_to_sink[side]):
+                    for shots, count in enumerate(histogram):
+                        if count:
+                            writer.writerow((self.labels[side], name, shots, count))
+
+        file, writer = table("accuracy.csv", ("camp", "tir", "tirs", "touches"))
+        with file:
+            for side in range(2):
+                for turn, (shots, hits) in enumerate(zip(self.turn_shots[side],
+                                                         self.turn_hits[side])):
+                    if shots:
+                        writer.writerow((self.labels[side], turn + 1, shots, hits))
+
+
+def analyze_chunk(task: ChunkTask) -> GameAnalytics:
+    """Joue un lot de parties et retourne ses agrégats (exécuté dans un processus du pool)."""
+    analytics = GameAnalytics(task.size, task.ships_config, task.pairing)
+    rng = random.Random(chunk_seed(task.master_seed, task.pairing,
+                                   task.chunk_index))
+    play_games(task.games, task.pairing, rng, task.size, task.ships_config,
+               first_offset=task.chunk_index * task.games, log=analytics,
+               placement=task.placement)
+    return analytics
+
+
+def iter_tasks(pairing: Tuple[str, str], games: int, chunk_size: int,
+               master_seed: int, size: int = GRID_SIZE,
+               ships_config: Dict[str, int] = SHIPS_CONFIG,
+               placement: Tuple[str, str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+               ) -> Iterator[ChunkTask]:
+    """
+    Découpe une confrontation en lots, au fur et à mesure.
+
+    Les lots et leurs graines sont ceux de ``tournament.make_tasks`` : les
+    parties agrégées sont celles du tournoi de même graine.
+    """
+    for chunk_index, start in enumerate(range(0, games, chunk_size)):
+        yield ChunkTask(pairing, chunk_index, min(chunk_size, games - start),
+                        master_seed, size, ships_config, tuple(placement))
+
+
+def run_analytics(pairing: Tuple[str, str], games: int, master_seed: int = 0,
+                  chunk_size: int = 2000, workers: Optional[int] = None,
+                  size: int = GRID_SIZE,
+                  ships_config: Dict[str, int] = SHIPS_CONFIG,
+                  placement: Tuple[str, str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+                  ) -> GameAnalytics:
+    """
+    Joue une confrontation sur un pool de processus et agrège ses parties.
+
+    Au plus ``_PENDING_PER_WORKER`` lots par processus sont en attente à un
+    instant donné : la mémoire reste bornée quel que soit ``games``.
+
+    Args:
+        pairing (Tuple[str, str]): Difficulté ou profil de chaque IA
+        games (int): Nombre de parties
+        master_seed (int): Graine maîtresse
+        chunk_size (int): Nombre de parties par lot
+        workers (Optional[int]): Nombre de processus (tous les cœurs par défaut)
+        size (int): Taille des plateaux
+        ships_config (Dict[str, int]): Flotte utilisée par les deux camps
+        placement (Tuple[str, str]): Placement de la flotte de chaque camp
+            (voir ``fleet_placer``)
+
+    Returns:
+        GameAnalytics: Agrégats de toutes les parties
+    """
+    pairing = tuple(pairing)
+    total = GameAnalytics(size, ships_config, pairing)
+    tasks = iter_tasks(pairing, games, chunk_size, master_seed, size,
+                       ships_config, placement)
+    if workers == 1:
+        for task in tasks:
+            total.merge(analyze_chunk(task))
+        return total
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    limit = _PENDING_PER_WORKER * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for task in tasks:
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+            pending.add(executor.submit(analyze_chunk, task))
+        for future in wait(pending).done:
+            total.merge(future.result())
+    return total
+
+
+def format_summary(analytics: GameAnalytics) -> str:
+    """Met en forme le résumé des agrégats."""
+    def describe(summary: Dict[str, Optional[float]]) -> str:
+        if not summary["count"]:
+            return "-"
+        return (f"{summary['mean']:6.2f} ± {summary['stdev']:.2f} "
+                f"(médiane {summary['p50']}, p90 {summary['p90']})")
+
+    lines = [f"Parties agrégées : {analytics.games}"]
+    if analytics.unfinished:
+        lines.append(f"Parties interrompues : {analytics.unfinished}")
+    summary = analytics.summary()
+    for side, values in enumerate(summary["sides"]):
+        lines.append(f"IA {side + 1} ({values['label']}) - "
+                     f"Victoires : {values['wins']}")
+        lines.append(f"  Tirs pour gagner : {describe(values['shots_to_win'])}")
+        for name, ship_summary in values["shots_to_sink"].items():
+            lines.append(f"  Tirs pour couler {name} : {describe(ship_summary)}")
+        curve = analytics.accuracy(side)
+        marks = [turn for turn in (1, 10, 25, 50, 75, 100) if turn <= len(curve)]
+        lines.append("  Précision au n-ième tir : " + ", ".join(
+            f"{turn}: {curve[turn - 1] * 100:.0f}%" for turn in marks))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Agrège en flux les statistiques de parties simulées."
+    )
+    parser.add_argument("--ai", nargs=2, default=["hard", "hard"],
+                        metavar=("IA1", "IA2"),
+                        help="difficulté ou profil réglé de chaque IA")
+    parser.add_argument("-n", "--games", type=int, default=10000,
+                        help="nombre de parties à simuler (0 : aucune)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="graine maîtresse")
+    parser.add_argument("--chunk-size", type=int, default=2000,
+                        help="nombre de parties par lot")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille des plateaux")
+    parser.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    parser.add_argument("--from-log", default=None,
+                        help="agrège un journal binaire au lieu de simuler")
+    parser.add_argument("--merge", nargs="+", default=[], metavar="JSON",
+                        help="exports JSON précédents à ajouter au résultat")
+    parser.add_argument("--json", default=None,
+                        help="fichier JSON où écrire les agrégats")
+    parser.add_argument("--csv", default=None,
+                        help="répertoire où écrire les agrégats en CSV")
+    parser.add_argument("--placement", nargs=2,
+                        default=[RANDOM_PLACEMENT, RANDOM_PLACEMENT],
+                        metavar=("FLOTTE1", "FLOTTE2"),
+                        help="placement de la flotte de chaque IA : 'random' "
+                             "ou IA dont elle doit déjouer les tirs (réserve "
+                             "précalculée)")
+    args = parser.parse_args(argv)
+    for difficulty in args.ai:
+        if not is_known_difficulty(difficulty):
+            parser.error(f"Difficulté ou profil inconnu : {difficulty}")
+
+    start = time.perf_counter()
+    try:
+        if args.from_log:
+            records = read_games(args.from_log)
+            first = next(records, None)
+            if first is None:
+                parser.error(f"{args.from_log} ne contient aucune partie")
+            analytics = GameAnalytics(first.size, dict(first.fleet), args.ai)
+            analytics.write(first)
+            for record in records:
+                analytics.write(record)
+        else:
+            for name in args.placement:
+                fleet_placer(name, args.size, args.fleet)
+            analytics = run_analytics(args.ai, args.games, args.seed,
+                                      args.chunk_size, args.workers,
+                                      args.size, args.fleet,
+                                      tuple(args.placement))
+        for path in args.merge:
+            analytics.merge(GameAnalytics.read_json(path))
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+
+    print(format_summary(analytics))
+    print(f"Durée : {elapsed:.1f}s")
+    if args.json:
+        analytics.write_json(args.json)
+        print(f"Agrégats écrits dans {args.json}")
+    if args.csv:
+        analytics.write_csv(args.csv)
+        print(f"Fichiers CSV écrits dans {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Moteur de parties par lots : K parties avancées d'un tour à la fois.
+
+Les K parties sont stockées dans des tableaux NumPy empilés (un plateau par
+ligne, ``2 * partie + camp``) et chaque appel à ``step`` fait jouer un tir à
+toutes les parties en cours. Le placement des flottes, la résolution des tirs
+et les stratégies 'easy' et 'hard' de ``ComputerAI`` sont vectorisés : le coût
+de l'interpréteur est payé une fois par tour pour tout le lot, et non une
+fois par tir.
+
+Les tirs aléatoires suivent une permutation des cases propre à chaque IA :
+la première case non ciblée de la permutation est uniforme parmi les cases
+libres, sans tirage par case. Les stratégies 'density' et 'solver' ne sont
+pas vectorisées ; utiliser ``simulation.play_games`` pour celles-ci.
+
+NumPy est requis.
+
+Exemple :
+    python simulate.py --games 1000000 --ai hard easy --batch
+"""
+
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+import numpy as np
+from .simulation import SimulationReport
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+# Difficultés prises en charge par le moteur par lots
+BATCH_DIFFICULTIES = ("easy", "hard")
+
+# Nombre de parties par lot dans play_batch
+DEFAULT_BATCH_SIZE = 20000
+
+# Tirages d'un placement avant de considérer la flotte dans une impasse
+_DRAW_TRIES = 32
+
+# Directions explorées autour d'une touche isolée, dans l'ordre de ComputerAI
+_DX = np.array([0, 1, 0, -1])
+_DY = np.array([1, 0, -1, 0])
+
+
+@lru_cache(maxsize=None)
+def placement_cells(size: int, length: int) -> np.ndarray:
+    """
+    Cases de chaque placement possible d'un navire.
+
+    Returns:
+        ndarray: Tableau (placements, longueur) des indices ``y * size + x``
+        (horizontaux puis verticaux, horizontaux seuls pour une case)
+    """
+    steps = np.arange(length)
+    origins = np.arange(size * size).reshape(size, size)
+    tables = [(origins[:, :size - length + 1].ravel()[:, None] + steps)]
+    if length > 1:
+        tables.append(origins[:size - length + 1, :].ravel()[:, None]
+                      + steps * size)
+    table = np.concatenate(tables)
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def cell_coordinates(size: int):
+    """Colonne et ligne de chaque case."""
+    cells = np.arange(size * size)
+    return cells % size, cells // size
+
+
+@lru_cache(maxsize=None)
+def neighbour_cells(size: int) -> np.ndarray:
+    """
+    Voisines de chaque case, dans l'ordre des directions de ``ComputerAI``.
+
+    Returns:
+        ndarray: Tableau (cases, 4) des voisines, -1 hors du plateau
+    """
+    xs, ys = cell_coordinates(size)
+    x, y = xs[:, None] + _DX, ys[:, None] + _DY
+    inside = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+    table = np.where(inside, y * size + x, -1)
+    table.setflags(write=False)
+    return table
+
+
+class BatchGames:
+    """
+    Lot de parties jouées en parallèle entre deux IA.
+
+    Attributes:
+        games (int): Nombre de parties du lot
+        size (int): Taille des plateaux
+        turn (int): Nombre de tours joués
+        ship_ids (ndarray): (2K, cases) numéro du navire + 1 par case, 0 = eau
+        shot (ndarray): (2K, cases) cases ciblées de chaque plateau
+        shots_fired (ndarray): (2K,) tirs de chaque IA (``2 * partie + camp``)
+        hits (ndarray): (2K,) touches de chaque IA
+        winner (ndarray): (K,) camp gagnant, -1 tant que la partie continue
+    """
+
+    def __init__(self, games: int, difficulties: Sequence[str] = ("hard", "hard"),
+                 size: int = GRID_SIZE, ships_config: Dict[str, int] = SHIPS_CONFIG,
+                 seed=None, first_offset: int = 0, max_attempts: int = 100):
+        for difficulty in difficulties:
+            if difficulty not in BATCH_DIFFICULTIES:
+                raise ValueError(
+                    f"Difficulté non prise en charge par le moteur par lots : "
+                    f"{difficulty}"
+                )
+        self.games = games
+        self.size = size
+        self.cells = size * size
+        self.lengths = list(ships_config.values())
+        self.rng = np.random.default_rng(seed)
+        self.turn = 0
+
+        boards = 2 * games
+        cell_type = np.int16 if self.cells < 2 ** 15 else np.int32
+        self.first = (first_offset + np.arange(games)) % 2
+        self.hard_side = np.array([difficulty == "hard" for difficulty in difficulties])
+        self.shot = np.zeros((boards, self.cells), dtype=bool)
+        self.shots_fired = np.zeros(boards, dtype=np.int32)
+        self.hits = np.zeros(boards, dtype=np.int32)
+        self.winner = np.full(games, -1, dtype=np.int8)
+
+        self._place_fleets(max_attempts)
+        self.hit_points = np.zeros((boards, len(self.lengths) + 1), dtype=np.int32)
+        self.hit_points[:, 1:] = self.lengths
+        self.cells_left = np.full(boards, sum(self.lengths), dtype=np.int32)
+        self._games = np.arange(games)
+
+        # Tirs aléatoires : permutation des cases et curseur par IA
+        self._order = self.rng.permuted(
+            np.broadcast_to(np.arange(self.cells, dtype=cell_type),
+                            (boards, self.cells)), axis=1
+        )
+        self._cursor = np.zeros(boards, dtype=np.intp)
+
+        # État de la stratégie 'hard' par IA
+        self._last_hit = np.full(boards, -1, dtype=np.int32)
+        self._previous_hit = np.full(boards, -1, dtype=np.int32)
+        self._hit_streak = np.zeros(boards, dtype=np.int32)
+        self._targets = np.zeros(boards * 4 + 1, dtype=np.intp)
+        self._target_head = np.zeros(boards, dtype=np.intp)
+        self._target_count = np.zeros(boards, dtype=np.intp)
+
+        # Vues à plat pour l'indexation rapide
+        self._ship_cells = self.ship_ids.reshape(-1)
+        self._shot_cells = self.shot.reshape(-1)
+        self._order_cells = self._order.reshape(-1)
+        self._hit_points = self.hit_points.reshape(-1)
+        self._hit_stride = self.hit_points.shape[1]
+
+    def _place_fleets(self, max_attempts: int):
+        """
+        Place aléatoirement les flottes de tous les plateaux.
+
+        Chaque navire (du plus long au plus court) reçoit un placement tiré
+        uniformément et retiré s'il chevauche un navire déjà posé ; un plateau
+        sans placement valide après ``_DRAW_TRIES`` tirages recommence sa
+        flotte.
+
+        Raises:
+            ValueError: Si une flotte reste impossible à placer
+        """
+        boards = 2 * self.games
+        ship_type = np.uint8 if len(self.lengths) < 255 else np.uint16
+        self.ship_ids = np.zeros((boards, self.cells), dtype=ship_type)
+        order = sorted(range(len(self.lengths)), key=lambda i: -self.lengths[i])
+        pending = np.arange(boards)
+        for _ in range(max_attempts):
+            if not pending.size:
+                return
+            self.ship_ids[pending] = 0
+            failed = np.zeros(pending.size, dtype=bool)
+            for number in order:
+                table = placement_cells(self.size, self.lengths[number])
+                rows = np.flatnonzero(~failed)
+                boards_left = pending[rows]
+                chosen = np.full(rows.size, -1)
+                todo = np.arange(rows.size)
+                for _ in range(_DRAW_TRIES):
+                    draws = self.rng.integers(len(table), size=todo.size)
+                    free = (self.ship_ids[boards_left[todo, None], table[draws]] == 0).all(axis=1)
+                    chosen[todo[free]] = draws[free]
+                    todo = todo[~free]
+                    if not todo.size:
+                        break
+                failed[rows[todo]] = True
+                placed = chosen >= 0
+                self.ship_ids[boards_left[placed, None], table[chosen[placed]]] = number + 1
+            pending = pending[failed]
+        if pending.size:
+            raise ValueError("Impossible de placer la flotte sur le plateau")
+
+    @property
+    def active(self) -> np.ndarray:
+        """Masque des parties en cours."""
+        return self.winner < 0
+
+    def step(self) -> int:
+        """
+        Fait jouer un tir à chaque partie en cours.
+
+        Returns:
+            int: Nombre de parties encore en cours après ce tour
+        """
+        games = self._games
+        if not games.size:
+            return 0
+        side = self.first[games] ^ (self.turn & 1)
+        shooters = 2 * games + side
+        targets = shooters ^ 1
+        # Indices à plat dans les tableaux (2K, cases)
+        base = targets * self.cells
+        cells = self._choose_cells(shooters, base, self.hard_side[side])
+
+        flat = base + cells
+        ship = self._ship_cells[flat]
+        self._shot_cells[flat] = True
+        self.shots_fired[shooters] += 1
+        hit = np.flatnonzero(ship)
+        hit_boards = targets[hit]
+        hit_points = self._hit_points[hit_boards * self._hit_stride + ship[hit]]
+        hit_points -= 1
+        self._hit_points[hit_boards * self._hit_stride + ship[hit]] = hit_points
+        self.hits[shooters[hit]] += 1
+        self.cells_left[hit_boards] -= 1
+        finished = hit[self.cells_left[hit_boards] == 0]
+        if finished.size:
+            self.winner[games[finished]] = side[finished]
+            self._games = np.flatnonzero(self.winner < 0)
+
+        hard = self.hard_side[side[hit]]
+        self._notify_hits(shooters[hit[hard]], cells[hit[hard]],
+                          hit_points[hard] == 0)
+        self.turn += 1
+        return int(self._games.size)
+
+    def play(self, max_turns: Optional[int] = None):
+        """Joue toutes les parties jusqu'à leur fin (ou ``max_turns`` tours)."""
+        limit = 2 * self.cells if max_turns is None else max_turns
+        while self.turn < limit and self.step():
+            pass
+
+    def _choose_cells(self, shooters: np.ndarray, base: np.ndarray,
+                      hard: np.ndarray) -> np.ndarray:
+        """Choisit la case visée par chaque IA (équivalent de ``get_shot``)."""
+        if not hard.any():
+            return self._random_cells(shooters, base)
+        cells = np.empty(shooters.size, dtype=np.intp)
+        fallback = np.ones(shooters.size, dtype=bool)
+
+        tracking = np.flatnonzero(hard & (self._last_hit[shooters] >= 0))
+        if tracking.size:
+            owners = shooters[tracking]
+            empty = self._target_head[owners] >= self._target_count[owners]
+            if empty.any():
+                self._fill_targets(owners[empty], base[tracking[empty]])
+            ready = self._target_head[owners] < self._target_count[owners]
+            owners, ready = owners[ready], tracking[ready]
+            head = self._target_head[owners]
+            candidates = self._targets[owners * 4 + head]
+            self._target_head[owners] = head + 1
+            valid = ~self._shot_cells[base[ready] + candidates]
+            cells[ready[valid]] = candidates[valid]
+            fallback[ready[valid]] = False
+
+        chosen = np.flatnonzero(fallback)
+        cells[chosen] = self._random_cells(shooters[chosen], base[chosen])
+        return cells
+
+    def _fill_targets(self, shooters: np.ndarray, base: np.ndarray):
+        """Calcule les cibles autour de la dernière touche (``_update_potential_targets``)."""
+        last = self._last_hit[shooters]
+        previous = self._previous_hit[shooters]
+        candidates = neighbour_cells(self.size)[last]
+
+        # Après deux touches : prolonger la ligne dans les deux sens
+        directional = np.flatnonzero((self._hit_streak[shooters] > 1)
+                                     & (previous != last))
+        if directional.size:
+            size = self.size
+            xs, ys = cell_coordinates(size)
+            x, y = xs[last[directional]], ys[last[directional]]
+            dx = x - xs[previous[directional]]
+            dy = y - ys[previous[directional]]
+            new_x = np.stack([x + dx, x - dx], axis=1)
+            new_y = np.stack([y + dy, y - dy], axis=1)
+            inside = (new_x >= 0) & (new_x < size) & (new_y >= 0) & (new_y < size)
+            candidates[directional] = -1
+            candidates[directional, :2] = np.where(inside, new_y * size + new_x, -1)
+
+        inside = candidates >= 0
+        valid = inside & ~self._shot_cells[base[:, None] + np.where(inside, candidates, 0)]
+        # Les candidates valides sont tassées en tête ; les autres vont dans
+        # la case de rebut en fin de tableau
+        slots = np.where(valid, shooters[:, None] * 4 + np.cumsum(valid, axis=1) - 1,
+                         len(self._targets) - 1)
+        self._targets[slots] = candidates
+        self._target_count[shooters] = valid.sum(axis=1)
+        self._target_head[shooters] = 0
+
+    def _random_cells(self, shooters: np.ndarray, base: np.ndarray) -> np.ndarray:
+        """Première case non ciblée de la permutation de chaque IA."""
+        shot = self._shot_cells
+        order = self._order_cells
+        position = shooters * self.cells + self._cursor[shooters]
+        cells = order[position].astype(np.intp)
+        pending = np.flatnonzero(shot[base + cells])
+        while pending.size:
+            position[pending] += 1
+            cells[pending] = order[position[pending]]
+            pending = pending[shot[base[pending] + cells[pending]]]
+        self._cursor[shooters] = position - shooters * self.cells + 1
+        return cells
+
+    def _notify_hits(self, shooters: np.ndarray, cells: np.ndarray,
+                     sunk: np.ndarray):
+        """Met à jour l'état 'hard' après une touche (``notify_hit``)."""
+        cleared = shooters[sunk]
+        self._last_hit[cleared] = -1
+        self._previous_hit[cleared] = -1
+        self._hit_streak[cleared] = 0
+        self._target_head[cleared] = 0
+        self._target_count[cleared] = 0
+
+        tracked = shooters[~sunk]
+        self._previous_hit[tracked] = self._last_hit[tracked]
+        self._last_hit[tracked] = cells[~sunk]
+        self._hit_streak[tracked] += 1
+
+    def report(self) -> SimulationReport:
+        """Statistiques du lot au format de ``simulation.play_games``."""
+        report = SimulationReport()
+        report.games = self.games
+        report.unfinished = int((self.winner < 0).sum())
+        for side in range(2):
+            won = self.winner == side
+            shots = self.shots_fired[2 * np.flatnonzero(won) + side].astype(np.int64)
+            report.wins[side] = int(won.sum())
+            report.winning_shots[side] = int(shots.sum())
+            report.winning_shots_sq[side] = int((shots * shots).sum())
+        return report
+
+
+def play_batch(games: int, difficulties: Sequence[str] = ("hard", "hard"),
+               size: int = GRID_SIZE, ships_config: Dict[str, int] = SHIPS_CONFIG,
+               seed: Optional[int] = None,
+               batch_size: int = DEFAULT_BATCH_SIZE) -> SimulationReport:
+    """
+    Joue une série de parties par lots de ``batch_size``.
+
+    Chaque lot reçoit une graine dérivée de ``seed`` : la même graine redonne
+    les mêmes statistiques. Les camps commencent à tour de rôle.
+
+    Returns:
+        SimulationReport: Statistiques agrégées
+    """
+    report = SimulationReport()
+    start = time.perf_counter()
+    batches = range(0, games, batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    for offset, batch_seed in zip(batches, seeds):
+        batch = BatchGames(min(batch_size, games - offset), difficulties, size,
+                           ships_config, batch_seed, first_offset=offset)
+        batch.play()
+        report.merge(batch.report())
+    report.elapsed = time.perf_counter() - start
+    return report
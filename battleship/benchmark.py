@@ -0,0 +1,512 @@
+"""
+Banc d'essai reproductible des opérations du plateau et de l'IA.
+
+Chaque mesure chronomètre des opérations individuelles (graines fixes) et
+rapporte les latences p50/p99 ainsi que le débit. Les résultats sont écrits
+en JSON et comparés à une référence enregistrée (``benchmarks/baseline.json``,
+fournie, à régénérer avec ``--save-baseline`` sur la machine de mesure) :
+toute régression au-delà de la tolérance fait échouer la commande, de même
+qu'une référence introuvable.
+
+Avec ``--imports``, c'est le temps d'import des modules chargés par les
+processus sans interface qui est mesuré (``-X importtime`` dans un
+interpréteur neuf) ; chaque budget est un multiple du démarrage d'un
+interpréteur nu (``python -c pass``) mesuré sur la même machine. La commande
+échoue si un budget est dépassé ou si l'un de ces modules charge Tk ou NumPy.
+
+Exemple :
+    python benchmark.py --save-baseline
+    python benchmark.py --baseline benchmarks/baseline.json --tolerance 0.25
+    python benchmark.py --imports
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+from .engine import GameEngine
+from .models.board import Board
+from .models import transposition
+from .models.computer_ai import ComputerAI
+from .models.placement import place_random_fleet, uses_index
+from .models.ship import Ship
+from .snapshot import restore_engine, snapshot_engine
+from .utils.constants import SHIPS_CONFIG
+
+DEFAULT_SIZES = (10, 30, 100)
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "benchmarks", "baseline.json"
+)
+STRATEGIES = ("easy", "hard", "density", "solver")
+
+# Nombre d'opérations mesurées par banc (divisé par --quick)
+_OPERATIONS = {
+    "board.place_ship": 20000,
+    "board.can_place_ship": 50000,
+    "board.receive_shot": 50000,
+    "placement.random_fleet": 5000,
+    "ai.get_shot": 5000,
+    "engine.full_game": 100,
+    "snapshot.round_trip": 2000,
+}
+
+# Parties distinctes instantanées par le banc des instantanés
+_SNAPSHOT_GAMES = 20
+
+# Limite de coups mesurés pour le solveur, beaucoup plus lent
+_SOLVER_OPERATIONS = 300
+
+# Budget d'import (temps cumulé du module) des points d'entrée sans
+# interface, en multiple du démarrage d'un interpréteur nu
+IMPORT_BUDGETS = {
+    "battleship.engine": 2.2,
+    "battleship.models.computer_ai": 2.8,
+    "battleship.simulation": 3.0,
+    "battleship.tournament": 3.0,
+    "battleship.tuning": 3.3,
+    "battleship.snapshot": 3.0,
+    "battleship.server": 8.0,
+}
+
+# Modules qu'un processus sans interface ne doit jamais charger
+HEADLESS_FORBIDDEN = ("tkinter", "numpy")
+
+# Mesures d'import par module (on garde la plus rapide)
+_IMPORT_REPEATS = 5
+
+
+class Timings:
+    """Durées individuelles (en nanosecondes) d'un banc."""
+
+    def __init__(self):
+        self.samples: List[int] = []
+        self.total = 0
+
+    def add(self, elapsed: int):
+        self.samples.append(elapsed)
+        self.total += elapsed
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        count = len(ordered)
+        if not count:
+            return {"ops": 0, "p50_us": 0.0, "p99_us": 0.0, "ops_per_sec": 0.0}
+        return {
+            "ops": count,
+            "p50_us": ordered[count // 2] / 1000,
+            "p99_us": ordered[min(count - 1, (count * 99) // 100)] / 1000,
+            "ops_per_sec": count / (self.total / 1e9) if self.total else 0.0,
+        }
+
+
+def bench_place_ship(size: int, operations: int, rng: random.Random) -> Timings:
+    """Placements réussis de navires sur des plateaux successifs."""
+    timings = Timings()
+    clock = time.perf_counter_ns
+    board = Board(size)
+    lengths = list(SHIPS_CONFIG.values())
+    while len(timings.samples) < operations:
+        length = lengths[len(timings.samples) % len(lengths)]
+        ship = Ship("Navire", length)
+        x, y = rng.randrange(size), rng.randrange(size)
+        horizontal = rng.random() < 0.5
+        start = clock()
+        placed = board.place_ship(ship, x, y, horizontal)
+        elapsed = clock() - start
+        if placed:
+            timings.add(elapsed)
+            if len(board.ships) == len(lengths):
+                board = Board(size)
+    return timings
+
+
+def bench_can_place_ship(size: int, operations: int, rng: random.Random) -> Timings:
+    """Tests de placement sur un plateau portant une flotte standard."""
+    timings = Timings()
+    clock = time.perf_counter_ns
+    board = Board(size)
+    place_random_fleet(board, SHIPS_CONFIG, rng)
+    ship = Ship("Navire", 3)
+    for _ in range(operations):
+        x, y = rng.randrange(size), rng.randrange(size)
+        horizontal = rng.random() < 0.5
+        start = clock()
+        board.can_place_ship(ship, x, y, horizontal)
+        timings.add(clock() - start)
+    return timings
+
+
+def bench_receive_shot(size: int, operations: int, rng: random.Random) -> Timings:
+    """Tirs sur des cases non ciblées de plateaux successifs."""
+    timings = Timings()
+    clock = time.perf_counter_ns
+    board = Board(size)
+    place_random_fleet(board, SHIPS_CONFIG, rng)
+    for _ in range(operations):
+        if board.shot_count >= board.cells // 2:
+            board = Board(size)
+            place_random_fleet(board, SHIPS_CONFIG, rng)
+        x, y = board.random_unshot_cell(rng)
+        start = clock()
+        board.receive_shot(x, y)
+        timings.add(clock() - start)
+    return timings
+
+
+def bench_random_fleet(size: int, operations: int, rng: random.Random) -> Timings:
+    """Placement aléatoire d'une flotte complète."""
+    timings = Timings()
+    clock = time.perf_counter_ns
+    for _ in range(operations):
+        board = Board(size)
+        start = clock()
+        place_random_fleet(board, SHIPS_CONFIG, rng)
+        timings.add(clock() - start)
+    return timings
+
+
+def bench_get_shot(strategy: str, size: int, operations: int,
+                   rng: random.Random, use_book: bool = False) -> Timings:
+    """
+    Latence de décision d'une stratégie au fil de parties complètes.
+
+    Par défaut, chaque coup est calculé : sans livre d'ouvertures et avec la
+    table de transposition désactivée. Avec ``use_book``, le livre et la
+    table (vidée au départ) servent comme en jeu.
+    """
+    cache = transposition.SHARED_CACHE
+    saved = cache.max_size
+    cache.clear()
+    if not use_book:
+        cache.configure(0)
+    timings = Timings()
+    clock = time.perf_counter_ns
+    try:
+        while len(timings.samples) < operations:
+            board = Board(size)
+            place_random_fleet(board, SHIPS_CONFIG, rng)
+            ai = ComputerAI(strategy, rng, use_book=use_book)
+            while not board.all_ships_sunk() and len(timings.samples) < operations:
+                start = clock()
+                x, y = ai.get_shot(board)
+                timings.add(clock() - start)
+                hit, sunk = board.receive_shot(x, y)
+                if hit:
+                    ai.notify_hit(x, y, sunk is not None, sunk)
+    finally:
+        cache.configure(saved)
+        cache.clear()
+    return timings
+
+
+def bench_full_game(size: int, operations: int, rng: random.Random) -> Timings:
+    """Partie complète 'hard' contre 'hard' (placement compris)."""
+    timings = Timings()
+    clock = time.perf_counter_ns
+    for _ in range(operations):
+        start = clock()
+        shooters = [ComputerAI("hard", rng), ComputerAI("hard", rng)]
+        GameEngine.new_game(shooters, size, SHIPS_CONFIG, rng).play()
+        timings.add(clock() - start)
+    return timings
+
+
+def bench_snapshot(size: int, operations: int, rng: random.Random) -> Timings:
+    """Instantané puis restauration d'une partie 'hard' à mi-parcours."""
+    engines = []
+    for _ in range(_SNAPSHOT_GAMES):
+        shooters = [ComputerAI("hard", rng), ComputerAI("hard", rng)]
+        engine = GameEngine.new_game(shooters, size, SHIPS_CONFIG, rng)
+        for _ in range(rng.randrange(min(size * size, 200))):
+            if engine.is_over:
+                break
+            engine.step()
+        engines.append(engine)
+
+    timings = Timings()
+    clock = time.perf_counter_ns
+    for operation in range(operations):
+        engine = engines[operation % len(engines)]
+        start = clock()
+        restore_engine(snapshot_engine(engine))
+        timings.add(clock() - start)
+    return timings
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, seed: int = 0,
+                   scale: float = 1.0,
+                   progress: Optional[Callable[[str], None]] = None
+                   ) -> Dict[str, Dict[str, float]]:
+    """
+    Exécute tous les bancs pour chaque taille de plateau.
+
+    Args:
+        sizes (Sequence[int]): Tailles de plateau mesurées
+        seed (int): Graine de chaque banc
+        scale (float): Facteur appliqué au nombre d'opérations
+        progress: Fonction appelée avec le nom de chaque banc
+
+    Returns:
+        Dict[str, Dict[str, float]]: Résumé par banc (``nom[taille]``)
+    """
+    def count(name: str) -> int:
+        return max(1, int(_OPERATIONS[name] * scale))
+
+    benches = []
+    for size in sizes:
+        benches += [
+            (f"board.place_ship[{size}]",
+             lambda rng, size=size: bench_place_ship(size, count("board.place_ship"), rng)),
+            (f"board.can_place_ship[{size}]",
+             lambda rng, size=size: bench_can_place_ship(size, count("board.can_place_ship"), rng)),
+            (f"board.receive_shot[{size}]",
+             lambda rng, size=size: bench_receive_shot(size, count("board.receive_shot"), rng)),
+            (f"placement.random_fleet[{size}]",
+             lambda rng, size=size: bench_random_fleet(size, count("placement.random_fleet"), rng)),
+        ]
+        for strategy in STRATEGIES:
+            operations = count("ai.get_shot")
+            if strategy == "solver":
+                operations = max(1, int(_SOLVER_OPERATIONS * scale))
+            benches.append((
+                f"ai.get_shot.{strategy}[{size}]",
+                lambda rng, size=size, strategy=strategy, operations=operations:
+                    bench_get_shot(strategy, size, operations, rng)
+            ))
+        if uses_index(size):
+            # Livre d'ouvertures et table de transposition, mesurés à part
+            benches.append((
+                f"ai.get_shot.density.book[{size}]",
+                lambda rng, size=size: bench_get_shot(
+                    "density", size, count("ai.get_shot"), rng, use_book=True)
+            ))
+        benches.append((
+            f"engine.full_game[{size}]",
+            lambda rng, size=size: bench_full_game(
+                size, max(1, count("engine.full_game") * 10 // size), rng)
+        ))
+        benches.append((
+            f"snapshot.round_trip[{size}]",
+            lambda rng, size=size: bench_snapshot(size, count("snapshot.round_trip"), rng)
+        ))
+
+    results = {}
+    for name, bench in benches:
+        if progress:
+            progress(name)
+        results[name] = bench(random.Random(f"{seed}:{name}")).summary()
+    return results
+
+
+def _import_env() -> Dict[str, str]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    # Mesure avec le bytecode en cache, comme une fois le jeu installé
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure_startup(repeats: int = _IMPORT_REPEATS) -> float:
+    """Meilleur temps (ms) de ``python -c pass``, référence des budgets."""
+    env = _import_env()
+    timings = []
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter_ns()
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+        timings.append((time.perf_counter_ns() - start) / 1e6)
+    return min(timings)
+
+
+def measure_import(module: str, repeats: int = _IMPORT_REPEATS) -> Dict[str, object]:
+    """
+    Mesure l'import d'un module dans des interpréteurs neufs.
+
+    Returns:
+        Dict[str, object]: Meilleur temps cumulé (``import_ms``) et modules
+        interdits chargés au passage (``forbidden``)
+    """
+    env = _import_env()
+    code = (f"import sys, {module}; "
+            f"print(' '.join(name for name in {HEADLESS_FORBIDDEN!r} "
+            f"if name in sys.modules))")
+
+    timings = []
+    forbidden: List[str] = []
+    # Le premier import écrit le bytecode et n'est pas compté
+    for attempt in range(max(1, repeats) + 1):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                 env=env, capture_output=True, text=True, check=True)
+        forbidden = process.stdout.split()
+        for line in process.stderr.splitlines():
+            fields = line.split("|")
+            if attempt and len(fields) == 3 and fields[2].strip() == module:
+                timings.append(int(fields[1]) / 1000)
+    return {"import_ms": min(timings, default=0.0), "forbidden": forbidden}
+
+
+def check_imports(budgets: Dict[str, float] = IMPORT_BUDGETS,
+                  repeats: int = _IMPORT_REPEATS,
+                  startup_ms: Optional[float] = None
+                  ) -> Dict[str, Dict[str, object]]:
+    """
+    Mesure l'import de chaque module budgété.
+
+    Args:
+        budgets: Budget de chaque module, en multiple de ``startup_ms``
+        repeats: Mesures par module (on garde la plus rapide)
+        startup_ms: Démarrage d'un interpréteur nu (mesuré si absent)
+    """
+    if startup_ms is None:
+        startup_ms = measure_startup(repeats)
+    return {module: {**measure_import(module, repeats), "budget": budget,
+                     "budget_ms": budget * startup_ms}
+            for module, budget in budgets.items()}
+
+
+def import_problems(imports: Dict[str, Dict[str, object]]) -> List[str]:
+    """Décrit les budgets dépassés et les modules interdits chargés."""
+    problems = []
+    for module, result in imports.items():
+        if result["import_ms"] > result["budget_ms"]:
+            problems.append(f"{module}: import {result['import_ms']:.1f}ms "
+                            f"(budget {result['budget_ms']:.1f}ms)")
+        if result["forbidden"]:
+            problems.append(f"{module}: charge {', '.join(result['forbidden'])}")
+    return problems
+
+
+def compare(results: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """
+    Compare des résultats à une référence.
+
+    Returns:
+        List[str]: Description des régressions (p50 plus lent ou débit plus
+        faible que la référence au-delà de la tolérance)
+    """
+    regressions = []
+    for name, reference in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current["p50_us"] > reference["p50_us"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p50 {current['p50_us']:.2f}us "
+                f"(référence {reference['p50_us']:.2f}us)"
+            )
+        if current["ops_per_sec"] * (1 + tolerance) < reference["ops_per_sec"]:
+            regressions.append(
+                f"{name}: {current['ops_per_sec']:.0f} ops/s "
+                f"(référence {reference['ops_per_sec']:.0f} ops/s)"
+            )
+    return regressions
+
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    """Met en forme les résultats en tableau."""
+    lines = [f"{'Banc':<34} {'ops':>7} {'p50 (us)':>11} {'p99 (us)':>11} {'ops/s':>12}"]
+    for name, summary in results.items():
+        lines.append(
+            f"{name:<34} {summary['ops']:>7} {summary['p50_us']:>11.2f} "
+            f"{summary['p99_us']:>11.2f} {summary['ops_per_sec']:>12.0f}"
+        )
+    return "\n".join(lines)
+
+
+def format_imports(imports: Dict[str, Dict[str, object]]) -> str:
+    """Met en forme les temps d'import en tableau."""
+    lines = [f"{'Import':<34} {'ms':>7} {'budget':>11}"]
+    for module, result in imports.items():
+        budget = f"x{result['budget']} = {result['budget_ms']:.0f}"
+        lines.append(f"{module:<34} {result['import_ms']:>7.1f} {budget:>11}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Banc d'essai des opérations du plateau et de l'IA."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="tailles de plateau mesurées")
+    parser.add_argument("--seed", type=int, default=0, help="graine des bancs")
+    parser.add_argument("--quick", action="store_true",
+                        help="dix fois moins d'opérations")
+    parser.add_argument("--output", default=None,
+                        help="fichier JSON où écrire les résultats")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="référence à laquelle comparer les résultats")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="enregistre les résultats comme nouvelle référence")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="écart relatif toléré avant de signaler une régression")
+    parser.add_argument("--imports", action="store_true",
+                        help="mesure seulement les temps d'import sans interface "
+                             "(budgets relatifs au démarrage de l'interpréteur)")
+    args = parser.parse_args(argv)
+    if (not args.imports and not args.save_baseline
+            and not os.path.exists(args.baseline)):
+        parser.error(f"Référence introuvable : {args.baseline} (à créer avec "
+                     f"--save-baseline)")
+
+    if args.imports:
+        startup = measure_startup()
+        imports = check_imports(startup_ms=startup)
+        problems = import_problems(imports)
+        print(f"Interpréteur nu (python -c pass) : {startup:.1f} ms\n")
+        print(format_imports(imports))
+        if problems:
+            print("\nBUDGETS D'IMPORT DÉPASSÉS :", file=sys.stderr)
+            for problem in problems:
+                print(f"  {problem}", file=sys.stderr)
+            sys.exit(1)
+        print("\nTous les imports respectent leur budget.")
+        return
+
+    results = run_benchmarks(
+        args.sizes, args.seed, 0.1 if args.quick else 1.0,
+        progress=lambda name: print(f"... {name}", file=sys.stderr)
+    )
+    print(format_results(results))
+
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("quick") != args.quick:
+        print("Attention : la référence n'a pas été mesurée avec le même "
+              "nombre d'opérations")
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print("\nRÉGRESSIONS DE PERFORMANCE :", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        sys.exit(1)
+    print("\nAucune régression par rapport à la référence.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Affichage d'un plateau sur un unique ``tk.Canvas``.
+
+Seules les cases qui ne sont pas de l'eau possèdent des éléments graphiques,
+créés à la demande. Les modifications sont accumulées dans un ensemble de
+cases « sales » et appliquées en un seul lot lors du prochain passage de la
+boucle Tk, ce qui garde l'ouverture de la fenêtre et les remises à zéro
+rapides, même sur les grands plateaux.
+"""
+
+import tkinter as tk
+from typing import Callable, Dict, Optional, Set, Tuple
+from .utils.constants import CELL_SIZE, WATER_COLOR
+
+# Largeur maximale (en pixels) d'une grille affichée
+MAX_GRID_PIXELS = 400
+
+# Taille minimale d'une case pour tracer le quadrillage et les symboles
+_MIN_DETAIL_SIZE = 12
+
+
+class BoardCanvas(tk.Canvas):
+    """
+    Grille de jeu dessinée sur un canvas.
+
+    Attributes:
+        size (int): Nombre de cases par côté
+        cell_size (int): Taille d'une case en pixels
+    """
+
+    def __init__(self, master, size: int,
+                 on_click: Optional[Callable[[int, int], None]] = None):
+        self.size = size
+        self.cell_size = max(2, min(CELL_SIZE, MAX_GRID_PIXELS // size))
+        pixels = self.size * self.cell_size
+        super().__init__(master, width=pixels, height=pixels,
+                         bg=WATER_COLOR, highlightthickness=0)
+
+        self._on_click = on_click
+        self._states: Dict[Tuple[int, int], Tuple[str, str]] = {}
+        self._items: Dict[Tuple[int, int], Tuple[int, Optional[int]]] = {}
+        self._dirty: Set[Tuple[int, int]] = set()
+        self._flush_pending = False
+
+        if self.cell_size >= _MIN_DETAIL_SIZE:
+            for i in range(1, size):
+                offset = i * self.cell_size
+                self.create_line(offset, 0, offset, pixels, fill="#C0C0C0")
+                self.create_line(0, offset, pixels, offset, fill="#C0C0C0")
+        self.bind("<Button-1>", self._clicked)
+
+    def set_cell(self, x: int, y: int, color: str, symbol: str = ""):
+        """Change l'aspect d'une case (appliqué au prochain rafraîchissement)."""
+        if self._states.get((x, y), (WATER_COLOR, "")) == (color, symbol):
+            return
+        self._states[(x, y)] = (color, symbol)
+        self._dirty.add((x, y))
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.after_idle(self.flush)
+
+    def reset(self):
+        """Remet toutes les cases à l'état « eau »."""
+        self.delete("cell")
+        self._states.clear()
+        self._items.clear()
+        self._dirty.clear()
+
+    def flush(self):
+        """Redessine en un seul lot les cases modifiées."""
+        self._flush_pending = False
+        cell = self.cell_size
+        detailed = cell >= _MIN_DETAIL_SIZE
+        for x, y in self._dirty:
+            color, symbol = self._states.get((x, y), (WATER_COLOR, ""))
+            rectangle, text = self._items.get((x, y), (None, None))
+            if rectangle is None:
+                left, top = x * cell, y * cell
+                rectangle = self.create_rectangle(
+                    left, top, left + cell, top + cell,
+                    fill=color, outline="#C0C0C0" if detailed else "",
+                    tags="cell"
+                )
+                if detailed:
+                    text = self.create_text(
+                        left + cell / 2, top + cell / 2, text=symbol,
+                        font=("TkDefaultFont", max(8, cell // 2)), tags="cell"
+                    )
+                self._items[(x, y)] = (rectangle, text)
+            else:
+                self.itemconfig(rectangle, fill=color)
+                if text is not None:
+                    self.itemconfig(text, text=symbol)
+        self._dirty.clear()
+
+    def _clicked(self, event):
+        """Convertit un clic en coordonnées de case."""
+        x, y = event.x // self.cell_size, event.y // self.cell_size
+        if self._on_click and 0 <= x < self.size and 0 <= y < self.size:
+            self._on_click(x, y)
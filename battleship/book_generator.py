@@ -0,0 +1,119 @@
+"""
+Génération hors ligne du livre d'ouvertures de l'IA 'density'.
+
+Des parties sont jouées sans interface contre des flottes aléatoires ; chaque
+position rencontrée dans les premiers tirs est enregistrée avec la décision
+de l'IA. Seules les positions assez fréquentes sont conservées.
+
+Exemple :
+    python -m battleship.book_generator --games 20000 --depth 12
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from .models.board import Board
+from .models.computer_ai import ComputerAI
+from .models.opening_book import DEFAULT_BOOK_PATH, OpeningBook, fleet_key
+from .models.placement import place_random_fleet, uses_index
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+
+def generate_book(games: int, depth: int, size: int = GRID_SIZE,
+                  ships_config: Dict[str, int] = SHIPS_CONFIG,
+                  seed: Optional[int] = None, min_count: int = 2,
+                  book: Optional[OpeningBook] = None) -> OpeningBook:
+    """
+    Joue des parties et enregistre les décisions des premiers tirs.
+
+    Args:
+        games (int): Nombre de parties jouées
+        depth (int): Nombre de tirs enregistrés par partie
+        size (int): Taille du plateau
+        ships_config (Dict[str, int]): Flotte visée
+        seed (Optional[int]): Graine du générateur aléatoire
+        min_count (int): Nombre minimal d'occurrences d'une position
+        book (Optional[OpeningBook]): Livre à compléter (nouveau par défaut)
+
+    Returns:
+        OpeningBook: Livre contenant la section (taille, flotte) générée
+
+    Raises:
+        ValueError: Si la taille n'utilise pas l'index de placements (la
+            stratégie n'y est pas déterministe)
+    """
+    if not uses_index(size):
+        raise ValueError(f"Plateau {size}x{size} trop grand pour un livre "
+                         "d'ouvertures")
+    rng = random.Random(seed)
+    book = book if book is not None else OpeningBook()
+    fleet = fleet_key(ships_config.values())
+    counts: Counter = Counter()
+    moves: Dict[int, int] = {}
+
+    for _ in range(games):
+        board = Board(size)
+        place_random_fleet(board, ships_config, rng)
+        ai = ComputerAI("density", rng, ships_config, use_book=False)
+        for _ in range(depth):
+            key = ai.position_key(board)
+            x, y = ai.get_shot(board)
+            moves[key] = y * size + x
+            counts[key] += 1
+            hit, ship = board.receive_shot(x, y)
+            if hit:
+                ai.notify_hit(x, y, ship is not None, ship)
+            if board.all_ships_sunk():
+                break
+
+    book.sections[(size, fleet)] = {
+        key: cell for key, cell in moves.items() if counts[key] >= min_count
+    }
+    return book
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Génère le livre d'ouvertures de l'IA 'density'."
+    )
+    parser.add_argument("-n", "--games", type=int, default=20000,
+                        help="nombre de parties jouées")
+    parser.add_argument("--depth", type=int, default=12,
+                        help="nombre de tirs enregistrés par partie")
+    parser.add_argument("--min-count", type=int, default=2,
+                        help="occurrences minimales d'une position conservée")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille du plateau")
+    parser.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine du générateur aléatoire")
+    parser.add_argument("-o", "--output", default=DEFAULT_BOOK_PATH,
+                        help="fichier du livre ; les sections des autres "
+                             "plateaux et flottes sont conservées")
+    args = parser.parse_args(argv)
+
+    book = OpeningBook(args.output if os.path.exists(args.output) else None)
+    start = time.perf_counter()
+    try:
+        generate_book(args.games, args.depth, args.size, args.fleet,
+                      seed=args.seed, min_count=args.min_count, book=book)
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    book.save(args.output)
+    print(f"{len(book)} positions enregistrées dans {args.output} "
+          f"({elapsed:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
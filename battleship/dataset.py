@@ -0,0 +1,326 @@
+"""
+Export des parties simulées en tableaux NumPy de forme fixe.
+
+Un jeu de données est un répertoire contenant :
+
+    meta.json    taille du plateau, flotte et nombre de lignes
+    shots.npy    (lignes, cases) int16/int32 : case visée à chaque tour, -1 ensuite
+    hits.npy     (lignes, cases) uint8 : 1 si le tir du tour a touché
+    layout.npy   (lignes, cases) uint8/uint16 : numéro du navire + 1 par case
+    games.npy    (lignes, 4) int32 : partie, camp visé, nombre de tirs, coulé
+
+Chaque ligne décrit un plateau attaqué (deux lignes par partie). L'écriture
+n'utilise que la bibliothèque standard : les fichiers ``.npy`` sont écrits
+ligne par ligne et leur en-tête est complété à la fermeture. L'analyse ouvre
+les fichiers avec ``numpy.load(mmap_mode="r")`` et parcourt les lignes par
+blocs, sans jamais charger le jeu de données en mémoire.
+
+Exemple :
+    python -m battleship.dataset export donnees --games 100000 --ai density hard
+    python -m battleship.dataset analyze donnees
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from .replay import GameRecord, read_games
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+# Taille réservée pour l'en-tête des fichiers .npy (multiple de 64)
+_NPY_HEADER_SIZE = 128
+
+# Mémoire de travail visée par bloc de lignes lors de l'analyse (octets)
+ANALYSIS_BYTES = 1 << 26
+
+
+class _NpyRowWriter:
+    """Écrit un tableau .npy à deux dimensions ligne par ligne."""
+
+    def __init__(self, path: str, typecode: str, descr: str, width: int):
+        self._file = open(path, "wb")
+        self._typecode = typecode
+        self._descr = descr
+        self._width = width
+        self.rows = 0
+        self._file.write(self._header())
+
+    def _header(self) -> bytes:
+        header = (f"{{'descr': '{self._descr}', 'fortran_order': False, "
+                  f"'shape': ({self.rows}, {self._width}), }}")
+        prefix = b"\x93NUMPY\x01\x00"
+        length = _NPY_HEADER_SIZE - len(prefix) - 2
+        text = header.ljust(length - 1) + "\n"
+        return prefix + struct.pack("<H", length) + text.encode("latin1")
+
+    def write(self, values: Sequence[int]):
+        self._file.write(array(self._typecode, values).tobytes())
+        self.rows += 1
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+
+def _dtypes(size: int, ships: int) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    """Types (array, numpy) des cases visées et du numéro de navire."""
+    cell_type = ("h", "<i2") if size * size < 2 ** 15 else ("i", "<i4")
+    ship_type = ("B", "|u1") if ships < 255 else ("H", "<u2")
+    return cell_type, ship_type
+
+
+class DatasetWriter:
+    """
+    Écrit des parties dans un jeu de données à forme fixe.
+
+    Accepte les mêmes ``GameRecord`` que le journal binaire ; utilisable
+    comme gestionnaire de contexte.
+    """
+
+    def __init__(self, directory: str, size: int = GRID_SIZE,
+                 ships_config: Dict[str, int] = SHIPS_CONFIG):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+        self.fleet = list(ships_config.items())
+        cells = size * size
+        cell_type, ship_type = _dtypes(size, len(self.fleet))
+        path = os.path.join
+        self._shots = _NpyRowWriter(path(directory, "shots.npy"), *cell_type, cells)
+        self._hits = _NpyRowWriter(path(directory, "hits.npy"), "B", "|u1", cells)
+        self._layout = _NpyRowWriter(path(directory, "layout.npy"), *ship_type, cells)
+        self._games = _NpyRowWriter(path(directory, "games.npy"), "i", "<i4", 4)
+        self._game_index = 0
+
+    @property
+    def rows(self) -> int:
+        """Nombre de plateaux écrits."""
+        return self._games.rows
+
+    def write(self, record: GameRecord):
+        """
+        Ajoute les deux plateaux d'une partie.
+
+        Raises:
+            ValueError: Si la partie ne correspond pas au jeu de données
+                (taille, longueurs des navires) ou sort du plateau ; rien
+                n'est écrit dans ce cas
+        """
+        size = self.size
+        cells = size * size
+        if (record.size != size
+                or [length for _, length in record.fleet]
+                != [length for _, length in self.fleet]):
+            raise ValueError("La partie ne correspond pas au jeu de données")
+
+        rows = []
+        for side in range(2):
+            layout = [0] * cells
+            for number, ((name, length), (x, y, horizontal)) in enumerate(
+                    zip(record.fleet, record.placements[side]), start=1):
+                if not (0 <= x < size and 0 <= y < size
+                        and (x if horizontal else y) + length <= size):
+                    raise ValueError(f"Placement invalide pour {name} en ({x}, {y})")
+                step = 1 if horizontal else size
+                start = y * size + x
+                for i in range(length):
+                    if layout[start + i * step]:
+                        raise ValueError(f"Placement invalide pour {name} "
+                                         f"en ({x}, {y})")
+                    layout[start + i * step] = number
+
+            shots = [-1] * cells
+            hits = [0] * cells
+            turn = 0
+            for shot in record.shots:
+                if shot.shooter not in (0, 1):
+                    raise ValueError(f"Tireur invalide : {shot.shooter}")
+                if shot.shooter == 1 - side:
+                    if not (0 <= shot.x < size and 0 <= shot.y < size):
+                        raise ValueError(f"Tir hors du plateau en ({shot.x}, {shot.y})")
+                    if turn == cells:
+                        raise ValueError("Partie invalide : plus de tirs que de cases")
+                    shots[turn] = shot.y * size + shot.x
+                    hits[turn] = shot.hit
+                    turn += 1
+            rows.append((shots, hits, layout, turn))
+
+        for side, (shots, hits, layout, turn) in enumerate(rows):
+            self._shots.write(shots)
+            self._hits.write(hits)
+            self._layout.write(layout)
+            self._games.write((self._game_index, side, turn,
+                               int(record.winner == 1 - side)))
+        self._game_index += 1
+
+    def close(self):
+        for writer in (self._shots, self._hits, self._layout, self._games):
+            writer.close()
+        meta = {"size": self.size, "fleet": self.fleet,
+                "rows": self._games.rows, "games": self._game_index}
+        with open(os.path.join(self.directory, "meta.json"), "w",
+                  encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False, indent=2)
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_dataset(directory: str) -> Dict:
+    """
+    Ouvre un jeu de données en mémoire projetée (lecture seule).
+
+    Returns:
+        Dict: ``meta`` et les tableaux ``shots``, ``hits``, ``layout``, ``games``
+    """
+    import numpy as np
+
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as file:
+        dataset = {"meta": json.load(file)}
+    for name in ("shots", "hits", "layout", "games"):
+        dataset[name] = np.load(os.path.join(directory, f"{name}.npy"),
+                                mmap_mode="r")
+    return dataset
+
+
+def _blocks(rows: int, cells: int) -> List[slice]:
+    """
+    Découpe les lignes en blocs dont les temporaires (au plus 8 octets par
+    case) tiennent dans ``ANALYSIS_BYTES``, quelle que soit la taille du
+    plateau.
+    """
+    step = max(1, ANALYSIS_BYTES // (8 * cells))
+    return [slice(start, min(rows, start + step))
+            for start in range(0, rows, step)]
+
+
+def cell_statistics(dataset: Dict):
+    """
+    Calcule, par case, la probabilité d'occupation et le taux de touche.
+
+    Returns:
+        Tuple[ndarray, ndarray]: Occupation et taux de touche des tirs, de
+        forme (taille, taille)
+    """
+    import numpy as np
+
+    size = dataset["meta"]["size"]
+    cells = size * size
+    occupied = np.zeros(cells, dtype=np.int64)
+    shot_counts = np.zeros(cells, dtype=np.int64)
+    hit_counts = np.zeros(cells, dtype=np.int64)
+    rows = dataset["games"].shape[0]
+    for block in _blocks(rows, cells):
+        occupied += (dataset["layout"][block] > 0).sum(axis=0)
+        shots = dataset["shots"][block]
+        fired = shots >= 0
+        shot_counts += np.bincount(shots[fired], minlength=cells)
+        hit_counts += np.bincount(shots[fired & (dataset["hits"][block] > 0)],
+                                  minlength=cells)
+
+    occupancy = occupied / max(rows, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hit_rate = np.where(shot_counts > 0, hit_counts / shot_counts, np.nan)
+    return occupancy.reshape(size, size), hit_rate.reshape(size, size)
+
+
+def mean_shots_to_sink(dataset: Dict) -> Dict[str, float]:
+    """
+    Nombre moyen de tirs reçus par un plateau avant que chaque navire coule.
+
+    Seuls les navires effectivement coulés sont comptés. Seuls les tirs au
+    but sont parcourus : pour chacun, la case visée donne le navire touché
+    (lecture dans ``layout``) ; un navire coule au tour de sa dernière
+    touche, une fois toutes ses cases touchées (le moteur refuse les tirs
+    répétés).
+    """
+    import numpy as np
+
+    meta = dataset["meta"]
+    cells = meta["size"] ** 2
+    fleet = meta["fleet"]
+    ships = len(fleet)
+    lengths = np.array([length for _, length in fleet], dtype=np.int64)
+    totals = np.zeros(ships, dtype=np.int64)
+    counts = np.zeros(ships, dtype=np.int64)
+    rows = dataset["games"].shape[0]
+    for block in _blocks(rows, cells):
+        row, turn = np.nonzero(dataset["hits"][block])
+        cell = dataset["shots"][block][row, turn]
+        number = dataset["layout"][block][row, cell].astype(np.int64) - 1
+        key = row * ships + number
+        block_rows = block.stop - block.start
+        hit_counts = np.bincount(key, minlength=block_rows * ships)
+        sink_turn = np.full(block_rows * ships, -1, dtype=np.int64)
+        np.maximum.at(sink_turn, key, turn)
+        sunk = (hit_counts.reshape(block_rows, ships) == lengths)
+        sink_turn = sink_turn.reshape(block_rows, ships)
+        totals += np.where(sunk, sink_turn + 1, 0).sum(axis=0)
+        counts += sunk.sum(axis=0)
+    return {name: (totals[number] / counts[number] if counts[number] else float("nan"))
+            for number, (name, _) in enumerate(fleet)}
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Exporte et analyse des parties en tableaux NumPy."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="simule et exporte des parties")
+    export.add_argument("directory", help="répertoire du jeu de données")
+    export.add_argument("-n", "--games", type=int, default=1000,
+                        help="nombre de parties à simuler")
+    export.add_argument("--ai", nargs=2, default=["hard", "hard"],
+                        metavar=("IA1", "IA2"), help="difficulté de chaque IA")
+    export.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille des plateaux")
+    export.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    export.add_argument("--seed", type=int, default=None,
+                        help="graine du générateur aléatoire")
+    export.add_argument("--from-log", default=None,
+                        help="convertit un journal binaire au lieu de simuler")
+
+    analyze = commands.add_parser("analyze", help="analyse un jeu de données")
+    analyze.add_argument("directory", help="répertoire du jeu de données")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from .simulation import play_games
+        with DatasetWriter(args.directory, args.size, args.fleet) as writer:
+            if args.from_log:
+                for record in read_games(args.from_log):
+                    writer.write(record)
+            else:
+                play_games(args.games, args.ai, random.Random(args.seed),
+                           args.size, args.fleet, log=writer)
+        print(f"{writer.rows} plateaux exportés dans {args.directory}")
+        return
+
+    dataset = open_dataset(args.directory)
+    occupancy, hit_rate = cell_statistics(dataset)
+    print(f"{dataset['meta']['games']} parties, "
+          f"{dataset['games'].shape[0]} plateaux")
+    print("Probabilité d'occupation par case :")
+    for row in occupancy:
+        print(" ".join(f"{value:.2f}" for value in row))
+    print("Taux de touche des tirs par case :")
+    for row in hit_rate:
+        print(" ".join(f"{value:.2f}" for value in row))
+    print("Tirs moyens reçus avant de couler :")
+    for name, mean in mean_shots_to_sink(dataset).items():
+        print(f"  {name}: {mean:.2f}")
+
+
+if __name__ == "__main__":
+    main()
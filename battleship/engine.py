@@ -0,0 +1,168 @@
+"""
+Moteur de jeu sans interface graphique.
+
+Le moteur fait s'affronter deux tireurs (IA ou tirs scriptés), chacun
+visant le plateau de l'autre, jusqu'à ce qu'une flotte soit coulée.
+Aucun import de tkinter n'est nécessaire.
+"""
+
+import random
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from .models.board import Board
+from .models.placement import place_random_fleet
+from .models.ship import Ship
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+
+class ScriptedShooter:
+    """
+    Tireur qui joue une séquence de tirs fixée à l'avance.
+
+    Attributes:
+        shots (List[Tuple[int, int]]): Tirs restants à jouer
+    """
+
+    def __init__(self, shots: Iterable[Tuple[int, int]]):
+        self._shots = iter(shots)
+
+    def get_shot(self, board: Board) -> Tuple[int, int]:
+        """Retourne le prochain tir de la séquence."""
+        try:
+            return next(self._shots)
+        except StopIteration:
+            raise ValueError("La séquence de tirs est épuisée") from None
+
+    def notify_hit(self, x: int, y: int, sunk: bool, ship=None):
+        """Les tirs scriptés ignorent les résultats."""
+
+
+class ShotResult(NamedTuple):
+    """Résultat d'un tir joué par le moteur."""
+    shooter: int
+    x: int
+    y: int
+    hit: bool
+    sunk: Optional[Ship]
+
+
+class GameResult(NamedTuple):
+    """
+    Résultat d'une partie terminée.
+
+    Attributes:
+        winner (Optional[int]): Indice du tireur gagnant (None si interrompue)
+        shots (Tuple[int, int]): Nombre de tirs de chaque tireur
+        hits (Tuple[int, int]): Nombre de touches de chaque tireur
+    """
+    winner: Optional[int]
+    shots: Tuple[int, int]
+    hits: Tuple[int, int]
+
+    @property
+    def winner_shots(self) -> Optional[int]:
+        """Nombre de tirs nécessaires au gagnant."""
+        return None if self.winner is None else self.shots[self.winner]
+
+
+class GameEngine:
+    """
+    Boucle de jeu tour par tour entre deux tireurs.
+
+    Le tireur ``i`` vise ``boards[1 - i]``. Chaque tireur expose
+    ``get_shot(board)`` et ``notify_hit(x, y, sunk, ship)``, comme
+    ``ComputerAI``.
+
+    Attributes:
+        boards (Tuple[Board, Board]): Plateaux des deux camps
+        shooters (Tuple): Tireurs des deux camps
+        current (int): Indice du tireur dont c'est le tour
+        winner (Optional[int]): Indice du gagnant une fois la partie finie
+        history (Optional[List[ShotResult]]): Tirs joués (si ``record``)
+    """
+
+    def __init__(self, boards: Sequence[Board], shooters: Sequence,
+                 first: int = 0, record: bool = False):
+        self.boards = tuple(boards)
+        self.shooters = tuple(shooters)
+        self.current = first
+        self.winner: Optional[int] = None
+        self.stats = {'shots': [0, 0], 'hits': [0, 0]}
+        self.history: Optional[List[ShotResult]] = [] if record else None
+
+    @classmethod
+    def new_game(cls, shooters: Sequence, size: int = GRID_SIZE,
+                 ships_config: Dict[str, int] = SHIPS_CONFIG,
+                 rng=random, first: int = 0,
+                 record: bool = False,
+                 placers: Optional[Sequence[Callable]] = None) -> "GameEngine":
+        """
+        Crée une partie avec deux flottes placées aléatoirement.
+
+        ``placers`` donne, pour chaque camp, une fonction de même signature
+        que ``place_random_fleet`` (ex. ``layouts.fleet_placer``).
+        """
+        boards = []
+        for side in range(2):
+            board = Board(size)
+            placer = placers[side] if placers else place_random_fleet
+            placer(board, ships_config, rng)
+            boards.append(board)
+        return cls(boards, shooters, first, record)
+
+    @property
+    def is_over(self) -> bool:
+        """Vrai lorsqu'une des flottes est entièrement coulée."""
+        return self.winner is not None
+
+    def step(self) -> ShotResult:
+        """Joue le tir du tireur courant et passe la main."""
+        if self.is_over:
+            raise RuntimeError("La partie est terminée")
+
+        shooter_index = self.current
+        shooter = self.shooters[shooter_index]
+        target = self.boards[1 - shooter_index]
+
+        x, y = shooter.get_shot(target)
+        if not target._is_valid_position(x, y) or target.is_shot(x, y):
+            raise ValueError(f"Tir invalide en ({x}, {y})")
+
+        hit, sunk = target.receive_shot(x, y)
+        self.stats['shots'][shooter_index] += 1
+        if hit:
+            self.stats['hits'][shooter_index] += 1
+            shooter.notify_hit(x, y, sunk is not None, sunk)
+            if sunk and target.all_ships_sunk():
+                self.winner = shooter_index
+
+        self.current = 1 - shooter_index
+        result = ShotResult(shooter_index, x, y, hit, sunk)
+        if self.history is not None:
+            self.history.append(result)
+        return result
+
+    def play(self, max_shots: Optional[int] = None) -> GameResult:
+        """
+        Joue la partie jusqu'à la fin.
+
+        Args:
+            max_shots (Optional[int]): Limite de tirs au total (sécurité)
+
+        Returns:
+            GameResult: Résultat de la partie
+        """
+        if max_shots is None:
+            max_shots = 2 * sum(board.size * board.size for board in self.boards)
+        shots = 0
+        while not self.is_over and shots < max_shots:
+            self.step()
+            shots += 1
+        return self.result()
+
+    def result(self) -> GameResult:
+        """Retourne le résultat courant de la partie."""
+        return GameResult(
+            self.winner,
+            tuple(self.stats['shots']),
+            tuple(self.stats['hits'])
+        )
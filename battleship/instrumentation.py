@@ -0,0 +1,299 @@
+"""
+Instrumentation optionnelle des chemins critiques.
+
+Désactivée par défaut. ``enable()`` remplace les méthodes surveillées par des
+versions chronométrées et ``disable()`` restaure les originales : hors
+activation, le seul coût résiduel est le test du booléen ``enabled`` aux
+quelques points de comptage placés dans le code (replis sur un tir
+aléatoire de l'IA).
+
+Mesures collectées :
+
+    temps      histogrammes de latence (ns) par méthode ; ``ai.get_shot`` est
+               ventilé par difficulté
+    tailles    histogrammes de valeurs (taille de la liste de cibles)
+    compteurs  événements (touches, replis sur un tir aléatoire et leur cause)
+
+Exemple :
+    from battleship import instrumentation
+    instrumentation.enable(dump_path="stats.jsonl", dump_interval=10)
+    ...
+    print(instrumentation.format_stats())
+"""
+
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Vrai lorsque l'instrumentation est active (lu par les points de comptage)
+enabled = False
+
+# Nombre de seaux des histogrammes (puissances de deux)
+_BUCKETS = 48
+
+
+class Histogram:
+    """
+    Histogramme à seaux logarithmiques (puissances de deux).
+
+    Le seau ``i`` compte les valeurs ``v`` telles que ``v.bit_length() == i``.
+    """
+
+    __slots__ = ("buckets", "count", "total", "minimum", "maximum")
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+
+    def add(self, value: int):
+        self.buckets[min(value.bit_length(), _BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "Histogram"):
+        for i, value in enumerate(other.buckets):
+            self.buckets[i] += value
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None else min(self.minimum, value)
+                self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def percentile(self, fraction: float) -> int:
+        """Borne supérieure du seau contenant le quantile demandé."""
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for i, value in enumerate(self.buckets):
+            seen += value
+            if seen >= rank and value:
+                return min((1 << i) - 1, self.maximum)
+        return self.maximum
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.minimum,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.maximum,
+            "buckets": {f"<{1 << i}": value
+                        for i, value in enumerate(self.buckets) if value},
+        }
+
+
+class Stats:
+    """
+    Statistiques accumulées dans le processus.
+
+    Attributes:
+        timings (Dict[str, Histogram]): Latences en nanosecondes
+        sizes (Dict[str, Histogram]): Tailles observées
+        counters (Counter): Compteurs d'événements
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: Dict[str, Histogram] = {}
+        self.sizes: Dict[str, Histogram] = {}
+        self.counters: Counter = Counter()
+
+    def record_time(self, name: str, elapsed: int):
+        with self._lock:
+            histogram = self.timings.get(name)
+            if histogram is None:
+                histogram = self.timings[name] = Histogram()
+            histogram.add(elapsed)
+
+    def record_size(self, name: str, value: int):
+        with self._lock:
+            histogram = self.sizes.get(name)
+            if histogram is None:
+                histogram = self.sizes[name] = Histogram()
+            histogram.add(value)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def reset(self):
+        with self._lock:
+            self.timings.clear()
+            self.sizes.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> Dict:
+        """Copie sérialisable en JSON des statistiques courantes."""
+        with self._lock:
+            return {
+                "timings_ns": {name: histogram.as_dict()
+                               for name, histogram in sorted(self.timings.items())},
+                "sizes": {name: histogram.as_dict()
+                          for name, histogram in sorted(self.sizes.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+STATS = Stats()
+
+
+def count(name: str, amount: int = 1):
+    """Incrémente un compteur (à appeler uniquement si ``enabled``)."""
+    STATS.count(name, amount)
+
+
+def snapshot() -> Dict:
+    """Statistiques courantes (voir ``Stats.snapshot``)."""
+    return STATS.snapshot()
+
+
+def reset():
+    """Remet toutes les statistiques à zéro."""
+    STATS.reset()
+
+
+def _timed(function: Callable, name: str,
+           after: Optional[Callable] = None) -> Callable:
+    """Enveloppe une méthode pour chronométrer chacun de ses appels."""
+    clock = time.perf_counter_ns
+    record = STATS.record_time
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        start = clock()
+        result = function(self, *args, **kwargs)
+        record(name(self) if callable(name) else name, clock() - start)
+        if after is not None:
+            after(self, result)
+        return result
+
+    return wrapper
+
+
+def _after_receive_shot(board, result: Tuple[bool, object]):
+    hit, sunk = result
+    STATS.count("board.hits" if hit else "board.misses")
+    if sunk is not None:
+        STATS.count("board.sunk")
+
+
+def _after_update_targets(ai, result):
+    STATS.record_size("ai.potential_targets", len(ai.potential_targets))
+
+
+def _targets() -> List[Tuple[type, str, object, Optional[Callable]]]:
+    """Méthodes surveillées (les rappels Tk seulement si l'interface est chargée)."""
+    from .models.board import Board
+    from .models.computer_ai import ComputerAI
+
+    targets = [
+        (ComputerAI, "get_shot",
+         lambda ai: f"ai.get_shot.{ai.difficulty}", None),
+        (ComputerAI, "_random_shot", "ai._random_shot", None),
+        (ComputerAI, "_update_potential_targets",
+         "ai._update_potential_targets", _after_update_targets),
+        (Board, "receive_shot", "board.receive_shot", _after_receive_shot),
+    ]
+    gui = sys.modules.get(f"{__package__}.main")
+    if gui is not None:
+        targets += [
+            (gui.GameWindow, "_handle_shot", "gui._handle_shot", None),
+            (gui.GameWindow, "_computer_turn", "gui._computer_turn", None),
+        ]
+    return targets
+
+
+_patched: List[Tuple[type, str, Callable]] = []
+_dumper: Optional["_PeriodicDump"] = None
+
+
+class _PeriodicDump(threading.Thread):
+    """Écrit périodiquement les statistiques (une ligne JSON par écriture)."""
+
+    def __init__(self, path: Optional[str], interval: float):
+        super().__init__(name="battleship-stats", daemon=True)
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            dump(self.path)
+
+
+def dump(path: Optional[str] = None):
+    """Ajoute les statistiques courantes à ``path`` (ou sur stderr)."""
+    import json
+    line = json.dumps({"time": time.time(), **snapshot()}, ensure_ascii=False)
+    if path is None:
+        print(line, file=sys.stderr)
+        return
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+
+
+def enable(dump_path: Optional[str] = None,
+           dump_interval: Optional[float] = None):
+    """
+    Active l'instrumentation.
+
+    Args:
+        dump_path (Optional[str]): Fichier JSON Lines des écritures
+            périodiques (stderr par défaut)
+        dump_interval (Optional[float]): Période des écritures en secondes
+            (aucune écriture périodique par défaut)
+    """
+    global enabled, _dumper
+    if not enabled:
+        for cls, attribute, name, after in _targets():
+            original = cls.__dict__[attribute]
+            _patched.append((cls, attribute, original))
+            setattr(cls, attribute, _timed(original, name, after))
+        enabled = True
+    if dump_interval and _dumper is None:
+        _dumper = _PeriodicDump(dump_path, dump_interval)
+        _dumper.start()
+
+
+def disable():
+    """Restaure les méthodes d'origine et arrête les écritures périodiques."""
+    global enabled, _dumper
+    while _patched:
+        cls, attribute, original = _patched.pop()
+        setattr(cls, attribute, original)
+    enabled = False
+    if _dumper is not None:
+        _dumper.stopped.set()
+        _dumper = None
+
+
+def format_stats(stats: Optional[Dict] = None) -> str:
+    """Met en forme les statistiques pour l'affichage."""
+    stats = stats or snapshot()
+    lines = [f"{'Mesure':<36} {'appels':>9} {'moy. (us)':>10} "
+             f"{'p50 (us)':>10} {'p99 (us)':>10} {'max (us)':>10}"]
+    for name, values in stats["timings_ns"].items():
+        lines.append(
+            f"{name:<36} {values['count']:>9} {values['mean'] / 1000:>10.2f} "
+            f"{values['p50'] / 1000:>10.2f} {values['p99'] / 1000:>10.2f} "
+            f"{values['max'] / 1000:>10.2f}"
+        )
+    for name, values in stats["sizes"].items():
+        lines.append(f"{name:<36} {values['count']:>9} "
+                     f"moyenne {values['mean']:.2f}, max {values['max']}")
+    for name, value in stats["counters"].items():
+        lines.append(f"{name:<36} {value:>9}")
+    return "\n".join(lines)
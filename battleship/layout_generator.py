@@ -0,0 +1,412 @@
+"""
+Génération hors ligne des réserves de flottes résistantes à une IA.
+
+La recherche procède en trois temps :
+
+1. statistiques : le tireur joue contre des flottes aléatoires et l'on
+   mesure le tour moyen auquel il vise chaque case ainsi que le nombre
+   moyen de tirs nécessaires (conservés dans le fichier des réserves et
+   réutilisés aux générations suivantes) ;
+2. candidats : des dispositions sont tirées en favorisant les placements
+   dont les cases sont visées tard, puis classées par une estimation
+   immédiate (tour où le dernier navire est découvert). Une seconde famille
+   favorise en plus les navires qui se touchent, ce que les statistiques par
+   case ne voient pas (l'IA 'hard' oublie une touche sur un navire voisin
+   quand elle coule celui qu'elle vise) ; chaque famille fournit la moitié
+   des dispositions évaluées ;
+3. évaluation : les meilleurs candidats jouent par lots sur un pool de
+   processus, tous contre les mêmes graines ; à chaque tour la meilleure
+   moitié est conservée et joue deux fois plus de parties, jusqu'à la
+   taille de la réserve, dont la moyenne est revalidée sur d'autres graines.
+
+Exemple :
+    python -m battleship.layout_generator --ai hard --candidates 5000 --finalists 64
+"""
+
+import argparse
+import math
+import random
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .models.board import Board
+from .models.computer_ai import ComputerAI
+from .models.layouts import (DEFAULT_LAYOUTS_PATH, Layout, apply_layout,
+                             load_stats, save_pool)
+from .models.params import is_known_difficulty
+from .models.placement import place_random_fleet, placement_index, uses_index
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+
+class StatsTask(NamedTuple):
+    """Lot de parties contre des flottes aléatoires confié à un processus."""
+    shooter: str
+    first_game: int
+    games: int
+    seed: str
+    size: int
+    ships_config: Dict[str, int]
+
+
+class EvalTask(NamedTuple):
+    """Lot de dispositions évaluées sur les mêmes parties par un processus."""
+    shooter: str
+    layouts: Tuple[Layout, ...]
+    first_game: int
+    games: int
+    seed: str
+    size: int
+    ships_config: Dict[str, int]
+
+
+class GeneratedPool(NamedTuple):
+    """
+    Résultat d'une génération.
+
+    Attributes:
+        layouts (List[Layout]): Réserve, de la plus résistante à la moins résistante
+        shot_turns (List[float]): Tour moyen auquel chaque case est visée
+        mean_shots (float): Tirs moyens contre la réserve (graines de validation)
+        random_mean_shots (float): Tirs moyens contre des flottes aléatoires
+    """
+    layouts: List[Layout]
+    shot_turns: List[float]
+    mean_shots: float
+    random_mean_shots: float
+
+
+def play_against(shooter: str, board: Board, ships_config: Dict[str, int],
+                 rng: random.Random, turns: Optional[List[int]] = None) -> int:
+    """
+    Fait tirer une IA jusqu'à couler la flotte d'un plateau.
+
+    Args:
+        turns (Optional[List[int]]): Reçoit, pour chaque case visée, le
+            numéro du tir (à partir de 0)
+
+    Returns:
+        int: Nombre de tirs nécessaires
+    """
+    ai = ComputerAI(shooter, rng, ships_config)
+    size = board.size
+    shots = 0
+    while not board.all_ships_sunk():
+        x, y = ai.get_shot(board)
+        hit, ship = board.receive_shot(x, y)
+        if turns is not None:
+            turns[y * size + x] = shots
+        shots += 1
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    return shots
+
+
+def gather_stats(task: StatsTask) -> Tuple[List[int], int]:
+    """
+    Joue un lot contre des flottes aléatoires (exécuté dans un processus du pool).
+
+    Returns:
+        Tuple[List[int], int]: Somme, par case, du tour où elle est visée
+        (nombre de tirs de la partie si elle ne l'est jamais) et somme des
+        tirs des parties
+    """
+    cells = task.size * task.size
+    sums = [0] * cells
+    total = 0
+    for game in range(task.first_game, task.first_game + task.games):
+        rng = random.Random(f"{task.seed}:{game}")
+        board = Board(task.size)
+        place_random_fleet(board, task.ships_config, rng)
+        turns = [-1] * cells
+        shots = play_against(task.shooter, board, task.ships_config, rng, turns)
+        total += shots
+        for cell, turn in enumerate(turns):
+            sums[cell] += turn if turn >= 0 else shots
+    return sums, total
+
+
+def evaluate_layouts(task: EvalTask) -> List[int]:
+    """
+    Joue chaque disposition du lot sur les mêmes graines (exécuté dans un
+    processus du pool).
+
+    Returns:
+        List[int]: Somme des tirs nécessaires, par disposition
+    """
+    totals = []
+    for layout in task.layouts:
+        total = 0
+        for game in range(task.first_game, task.first_game + task.games):
+            board = Board(task.size)
+            apply_layout(board, task.ships_config, layout)
+            total += play_against(task.shooter, board, task.ships_config,
+                                  random.Random(f"{task.seed}:{game}"))
+        totals.append(total)
+    return totals
+
+
+def _placement_weights(size: int, length: int, shot_turns: Sequence[float],
+                       beta: float) -> List[float]:
+    """Poids de chaque placement : les navires découverts tard sont favorisés."""
+    scale = max(shot_turns) or 1.0
+    return [math.exp(beta * min(shot_turns[cell] for cell in cells) / scale)
+            for cells in placement_index(size, length).cells]
+
+
+@lru_cache(maxsize=None)
+def _halo_masks(size: int, length: int) -> Tuple[int, ...]:
+    """Masque des cases voisines (hors navire) de chaque placement."""
+    halos = []
+    for cells in placement_index(size, length).cells:
+        halo = 0
+        for cell in cells:
+            x, y = cell % size, cell // size
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < size and 0 <= ny < size:
+                    halo |= 1 << (ny * size + nx)
+        for cell in cells:
+            halo &= ~(1 << cell)
+        halos.append(halo)
+    return tuple(halos)
+
+
+def sample_layout(size: int, lengths: Sequence[int],
+                  weights: Dict[int, List[float]], rng: random.Random,
+                  contact: float = 0.0) -> Optional[Layout]:
+    """
+    Tire une disposition, du plus long navire au plus court (None si impasse).
+
+    ``contact`` multiplie le poids d'un placement par ``exp(contact)`` pour
+    chaque case de navire déjà placé qui le touche.
+    """
+    chosen: List[Optional[Tuple[int, int, bool]]] = [None] * len(lengths)
+    occupied = 0
+    for number in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+        index = placement_index(size, lengths[number])
+        candidates = [placement for placement, mask in enumerate(index.masks)
+                      if not mask & occupied]
+        if not candidates:
+            return None
+        length_weights = weights[lengths[number]]
+        if contact and occupied:
+            halos = _halo_masks(size, lengths[number])
+            candidate_weights = [
+                length_weights[placement]
+                * math.exp(contact * bin(halos[placement] & occupied).count("1"))
+                for placement in candidates
+            ]
+        else:
+            candidate_weights = [length_weights[placement]
+                                 for placement in candidates]
+        placement = rng.choices(candidates, candidate_weights)[0]
+        occupied |= index.masks[placement]
+        chosen[number] = index.origins[placement]
+    return tuple(chosen)
+
+
+def estimate_layout(size: int, layout: Layout, lengths: Sequence[int],
+                    shot_turns: Sequence[float]) -> float:
+    """
+    Estimation immédiate de la résistance d'une disposition : tour où le
+    dernier navire est découvert, départagé par la moyenne des découvertes.
+    """
+    found = []
+    for (x, y, horizontal), length in zip(layout, lengths):
+        step = 1 if horizontal else size
+        start = y * size + x
+        found.append(min(shot_turns[start + i * step] for i in range(length)))
+    return max(found) + sum(found) / len(found)
+
+
+def generate_pool(shooter: str, size: int = GRID_SIZE,
+                  ships_config: Dict[str, int] = SHIPS_CONFIG,
+                  stats_games: int = 2000, candidates: int = 5000,
+                  finalists: int = 64, games: int = 200, pool_size: int = 16,
+                  beta: float = 8.0, contact: float = 1.0, seed: int = 0,
+                  workers: Optional[int] = None, chunk_size: int = 250,
+                  stats: Optional[Tuple[Sequence[float], float]] = None,
+                  progress: Optional[Callable[[str], None]] = None
+                  ) -> GeneratedPool:
+    """
+    Cherche les dispositions les plus résistantes à une IA.
+
+    Args:
+        shooter (str): Difficulté ou profil visé
+        size (int): Taille du plateau
+        ships_config (Dict[str, int]): Flotte placée
+        stats_games (int): Parties des statistiques par case
+        candidates (int): Dispositions tirées
+        finalists (int): Dispositions évaluées en jouant
+        games (int): Parties jouées par disposition au premier tour
+        pool_size (int): Dispositions conservées
+        beta (float): Préférence des tirages pour les cases visées tard
+        contact (float): Préférence de la seconde famille pour les navires
+            qui se touchent (0 : une seule famille)
+        seed (int): Graine des tirages et des parties
+        workers (Optional[int]): Nombre de processus (tous les cœurs par défaut)
+        chunk_size (int): Nombre de parties par lot
+        stats (Optional[Tuple[Sequence[float], float]]): Statistiques déjà
+            calculées (tour moyen par case, tirs moyens contre des flottes
+            aléatoires) ; la première étape est alors sautée
+        progress: Fonction appelée avec un message après chaque étape
+
+    Returns:
+        GeneratedPool: Réserve et mesures
+
+    Raises:
+        ValueError: Si le plateau est trop grand pour l'index de placements
+    """
+    if not uses_index(size):
+        raise ValueError("Plateau trop grand pour la recherche de dispositions")
+    report = progress or (lambda message: None)
+    cells = size * size
+    lengths = list(ships_config.values())
+
+    executor = None
+    if workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+    run = executor.map if executor is not None else map
+    try:
+        if stats is None:
+            tasks = [StatsTask(shooter, start, min(chunk_size, stats_games - start),
+                               f"{seed}:stats", size, ships_config)
+                     for start in range(0, stats_games, chunk_size)]
+            sums = [0] * cells
+            total = 0
+            for chunk_sums, chunk_total in run(gather_stats, tasks):
+                total += chunk_total
+                for cell, value in enumerate(chunk_sums):
+                    sums[cell] += value
+            stats = [value / stats_games for value in sums], total / stats_games
+            report(f"Statistiques : {stats_games} parties contre des flottes aléatoires")
+        shot_turns, random_mean = list(stats[0]), stats[1]
+        if len(shot_turns) != cells:
+            raise ValueError("Statistiques de tir d'une autre taille de plateau")
+        report(f"Flottes aléatoires : {random_mean:.2f} tirs en moyenne")
+
+        rng = random.Random(f"{seed}:candidats")
+        weights = {length: _placement_weights(size, length, shot_turns, beta)
+                   for length in set(lengths)}
+        families = (0.0, contact) if contact else (0.0,)
+        ranked: List[Layout] = []
+        drawn = 0
+        for family, family_contact in enumerate(families):
+            wanted = candidates // len(families)
+            family_pool = set()
+            for _ in range(wanted * 4):
+                if len(family_pool) >= wanted:
+                    break
+                layout = sample_layout(size, lengths, weights, rng, family_contact)
+                if layout is not None and layout not in ranked:
+                    family_pool.add(layout)
+            drawn += len(family_pool)
+            share = (finalists * (family + 1)) // len(families) - len(ranked)
+            ranked += sorted(family_pool, key=lambda layout: -estimate_layout(
+                size, layout, lengths, shot_turns))[:share]
+        report(f"{drawn} candidats tirés, {len(ranked)} évalués")
+
+        def evaluate(layouts: Sequence[Layout], first_game: int, count: int,
+                     tag: str) -> List[int]:
+            group = max(1, chunk_size // count)
+            tasks = [EvalTask(shooter, tuple(layouts[start:start + group]),
+                              first_game, count, f"{seed}:{tag}", size, ships_config)
+                     for start in range(0, len(layouts), group)]
+            return [total for totals in run(evaluate_layouts, tasks)
+                    for total in totals]
+
+        totals = dict.fromkeys(ranked, 0)
+        survivors = ranked
+        played, target = 0, games
+        while len(survivors) > pool_size:
+            results = evaluate(survivors, played, target - played, "evaluation")
+            for layout, total in zip(survivors, results):
+                totals[layout] += total
+            survivors = sorted(survivors, key=lambda layout: -totals[layout])
+            report(f"{len(survivors)} dispositions après {target} parties, "
+                   f"meilleure : {totals[survivors[0]] / target:.2f} tirs")
+            survivors = survivors[:max(pool_size, len(survivors) // 2)]
+            played, target = target, target * 2
+
+        validated = evaluate(survivors, 0, games, "validation")
+        order = sorted(range(len(survivors)), key=lambda i: -validated[i])
+        layouts = [survivors[i] for i in order]
+        mean_shots = sum(validated) / (len(validated) * games)
+        report(f"Réserve : {mean_shots:.2f} tirs en moyenne "
+               f"({len(layouts)} flottes, graines de validation)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return GeneratedPool(layouts, shot_turns, mean_shots, random_mean)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Génère une réserve de flottes résistantes à une IA."
+    )
+    parser.add_argument("--ai", default="hard",
+                        help="difficulté ou profil réglé auquel résister")
+    parser.add_argument("--stats-games", type=int, default=2000,
+                        help="parties des statistiques de tir par case")
+    parser.add_argument("--refresh-stats", action="store_true",
+                        help="recalcule les statistiques déjà enregistrées")
+    parser.add_argument("--candidates", type=int, default=5000,
+                        help="dispositions tirées")
+    parser.add_argument("--finalists", type=int, default=64,
+                        help="dispositions évaluées en jouant")
+    parser.add_argument("-n", "--games", type=int, default=200,
+                        help="parties par disposition évaluée")
+    parser.add_argument("--pool-size", type=int, default=16,
+                        help="dispositions conservées dans la réserve")
+    parser.add_argument("--beta", type=float, default=8.0,
+                        help="préférence des tirages pour les cases visées tard")
+    parser.add_argument("--contact", type=float, default=1.0,
+                        help="préférence de la seconde famille de candidats "
+                             "pour les navires qui se touchent (0 : désactivée)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="graine des tirages et des parties")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--chunk-size", type=int, default=250,
+                        help="nombre de parties par lot")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille du plateau")
+    parser.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    parser.add_argument("-o", "--output", default=DEFAULT_LAYOUTS_PATH,
+                        help="fichier des réserves ; les autres réserves sont "
+                             "conservées")
+    args = parser.parse_args(argv)
+    if not is_known_difficulty(args.ai):
+        parser.error(f"Difficulté ou profil inconnu : {args.ai}")
+    if min(args.stats_games, args.candidates, args.finalists, args.games,
+           args.pool_size) < 1:
+        parser.error("Les nombres de parties et de dispositions doivent être positifs")
+
+    start = time.perf_counter()
+    try:
+        stats = None
+        if not args.refresh_stats:
+            stats = load_stats(args.ai, args.size, args.fleet, args.output)
+        result = generate_pool(args.ai, args.size, args.fleet, args.stats_games,
+                               args.candidates, args.finalists, args.games,
+                               args.pool_size, args.beta, args.contact, args.seed,
+                               args.workers, args.chunk_size, stats,
+                               progress=lambda message: print(message, flush=True))
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+
+    save_pool(args.ai, args.size, args.fleet, result.layouts, result.shot_turns,
+              result.random_mean_shots, args.output,
+              mean_shots=round(result.mean_shots, 3), games=args.games)
+    print(f"Réserve contre '{args.ai}' enregistrée dans {args.output} : "
+          f"{result.mean_shots:.2f} tirs contre {result.random_mean_shots:.2f} "
+          f"pour des flottes aléatoires ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
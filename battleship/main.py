@@ -2,30 +2,57 @@
 Point d'entrée principal du jeu de bataille navale.
 """
 
+import argparse
 import tkinter as tk
+from tkinter import filedialog, messagebox
+from . import instrumentation
+from .ai_worker import AIWorker
+from .board_canvas import BoardCanvas
 from .models.board import Board
 from .models.ship import Ship
-from .utils.constants import *
+from .snapshot import decode_snapshot, encode_snapshot
+from .utils.constants import (AI_DELAY, AI_POLL_INTERVAL, GAME_PHASES, GRID_SIZE,
+                              HIT_COLOR, HIT_SYMBOL, MISS_COLOR, MISS_SYMBOL,
+                              SHIP_COLOR, SHIPS_CONFIG, THINKING_MSG, TURN_MSG)
 from .models.computer_ai import ComputerAI
+from .models.layouts import RANDOM_PLACEMENT, fleet_placer
+from .models.params import is_known_difficulty
+import random
 import time
 
 class GameWindow(tk.Tk):
-    def __init__(self):
+    def __init__(self, size: int = GRID_SIZE, ships_config=SHIPS_CONFIG,
+                 difficulty: str = "hard", time_budget=None,
+                 placement: str = RANDOM_PLACEMENT):
         super().__init__()
         self.title("Bataille Navale")
+        self.size = size
+        self.ships_config = ships_config
+        self.difficulty = difficulty
+        self.time_budget = time_budget
+        self.place_computer_fleet = fleet_placer(placement, size, ships_config)
         
         # Configuration de la fenêtre
         self.geometry("1000x600")
         
         # Initialisation des plateaux
-        self.player_board = Board()
-        self.computer_board = Board()
+        self.player_board = Board(self.size)
+        self.computer_board = Board(self.size)
         self.current_ship = None
         self.placement_horizontal = True
         self.game_phase = "placement"  # "placement" ou "playing"
         
-        # Initialisation de l'IA
-        self.computer_ai = ComputerAI("hard")
+        # Initialisation de l'IA (coups calculés dans un thread de fond)
+        self.rng = random.Random()
+        self.computer_ai = ComputerAI(self.difficulty, self.rng,
+                                      self.ships_config, self.time_budget)
+        self.ai_worker = AIWorker()
+        self._ai_ticket = None
+        self._ai_poll = None
+        self._ai_started = 0.0
+        
+        # Instantanés pris avant chaque tir du joueur (annulation)
+        self.undo_stack = []
         
         # Statistiques
         self.stats = {
@@ -57,6 +84,19 @@ class GameWindow(tk.Tk):
         )
         self.rotation_btn.pack(side=tk.LEFT, padx=5)
         
+        # Annulation, sauvegarde et chargement de la partie
+        self.undo_btn = tk.Button(
+            control_frame,
+            text="Annuler le tir",
+            command=self._undo_shot,
+            state=tk.DISABLED
+        )
+        self.undo_btn.pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="Sauvegarder",
+                  command=self._save_game).pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="Charger",
+                  command=self._load_game).pack(side=tk.LEFT, padx=5)
+        
         # Label d'état
         self.status_label = tk.Label(control_frame, text="Placez vos navires")
         self.status_label.pack(side=tk.LEFT, padx=20)
@@ -70,46 +110,20 @@ class GameWindow(tk.Tk):
         player_frame.pack(side=tk.LEFT, padx=20)
         tk.Label(player_frame, text="Votre flotte").pack()
         
-        self.player_buttons = []
-        player_grid = tk.Frame(player_frame)
-        player_grid.pack()
-        
-        for y in range(GRID_SIZE):
-            row = []
-            for x in range(GRID_SIZE):
-                btn = tk.Button(
-                    player_grid,
-                    width=2,
-                    height=1,
-                    bg=WATER_COLOR,
-                    command=lambda x=x, y=y: self._player_cell_clicked(x, y)
-                )
-                btn.grid(row=y, column=x)
-                row.append(btn)
-            self.player_buttons.append(row)
+        self.player_canvas = BoardCanvas(
+            player_frame, self.size, self._player_cell_clicked
+        )
+        self.player_canvas.pack()
         
         # Grille de l'ordinateur
         computer_frame = tk.Frame(grids_frame)
         computer_frame.pack(side=tk.RIGHT, padx=20)
         tk.Label(computer_frame, text="Flotte ennemie").pack()
         
-        self.computer_buttons = []
-        computer_grid = tk.Frame(computer_frame)
-        computer_grid.pack()
-        
-        for y in range(GRID_SIZE):
-            row = []
-            for x in range(GRID_SIZE):
-                btn = tk.Button(
-                    computer_grid,
-                    width=2,
-                    height=1,
-                    bg=WATER_COLOR,
-                    command=lambda x=x, y=y: self._computer_cell_clicked(x, y)
-                )
-                btn.grid(row=y, column=x)
-                row.append(btn)
-            self.computer_buttons.append(row)
+        self.computer_canvas = BoardCanvas(
+            computer_frame, self.size, self._computer_cell_clicked
+        )
+        self.computer_canvas.pack()
             
         # Frame des statistiques
         stats_frame = tk.Frame(main_frame)
@@ -159,7 +173,8 @@ class GameWindow(tk.Tk):
             f"Précision: {computer_accuracy:.1f}%\n"
             f"Temps de jeu: {minutes}m {seconds}s"
         )
-        self.stats_label.config(text=stats_text)
+        if stats_text != self.stats_label.cget("text"):
+            self.stats_label.config(text=stats_text)
         
         # Mise à jour toutes les secondes
         self.after(1000, self._update_stats)
@@ -190,7 +205,7 @@ class GameWindow(tk.Tk):
                 # Mettre à jour l'affichage
                 positions = self.current_ship.positions
                 for px, py in positions:
-                    self.player_buttons[py][px].config(bg=SHIP_COLOR)
+                    self.player_canvas.set_cell(px, py, SHIP_COLOR)
                 
                 # Passer au navire suivant
                 self._start_ship_placement()
@@ -200,48 +215,85 @@ class GameWindow(tk.Tk):
         if (x, y) in self.computer_board.shots:
             return
         
+        self.undo_stack.append(self.snapshot())
+        self.undo_btn.config(state=tk.NORMAL)
         hit, sunk = self.computer_board.receive_shot(x, y)
         if hit:
             self.stats['player_hits'] += 1
-            self.computer_buttons[y][x].config(bg=HIT_COLOR, text=HIT_SYMBOL)
+            self.computer_canvas.set_cell(x, y, HIT_COLOR, HIT_SYMBOL)
             if sunk:
                 self.status_label.config(text=f"{sunk.name} coulé !")
                 self._update_sunk_ships()
                 # Afficher le navire coulé
                 for sx, sy in sunk.positions:
-                    self.computer_buttons[sy][sx].config(bg=SHIP_COLOR, text=HIT_SYMBOL)
-                if all(ship.is_sunk() for ship in self.computer_board.ships):
+                    self.computer_canvas.set_cell(sx, sy, SHIP_COLOR, HIT_SYMBOL)
+                if self.computer_board.all_ships_sunk():
                     self._end_game(True)
                     return
             else:
                 self.status_label.config(text="Touché !")
         else:
             self.stats['player_misses'] += 1
-            self.computer_buttons[y][x].config(bg=MISS_COLOR, text=MISS_SYMBOL)
+            self.computer_canvas.set_cell(x, y, MISS_COLOR, MISS_SYMBOL)
             self.status_label.config(text="Manqué !")
         
-        self.after(500, self._computer_turn)
+        self._start_computer_turn()
     
-    def _computer_turn(self):
-        """Tour de l'ordinateur"""
-        x, y = self.computer_ai.get_shot(self.player_board)
-        hit, sunk = self.player_board.receive_shot(x, y)
+    def _start_computer_turn(self):
+        """Lance le calcul du coup de l'ordinateur ; les clics sont ignorés jusqu'au tir"""
+        self.game_phase = "computer_turn"
+        self._ai_started = time.monotonic()
+        self._ai_ticket = self.ai_worker.submit(
+            self.computer_ai.get_shot, self.player_board, cancellable=True
+        )
+        self._ai_poll = self.after(AI_POLL_INTERVAL, self._poll_computer_turn)
+    
+    def _poll_computer_turn(self):
+        """Consulte le calcul en cours depuis la boucle Tk"""
+        elapsed = (time.monotonic() - self._ai_started) * 1000
+        done, shot = self.ai_worker.poll(self._ai_ticket)
+        if not done:
+            if elapsed >= AI_DELAY:
+                self.status_label.config(text=THINKING_MSG)
+            self._ai_poll = self.after(AI_POLL_INTERVAL, self._poll_computer_turn)
+            return
         
-        self.computer_ai.notify_hit(x, y, sunk is not None)
+        # Tir prêt : l'afficher au plus tôt AI_DELAY ms après celui du joueur
+        self._ai_ticket = None
+        remaining = int(AI_DELAY - elapsed)
+        if remaining > 0:
+            self._ai_poll = self.after(remaining, lambda: self._computer_turn(*shot))
+        else:
+            self._computer_turn(*shot)
+    
+    def _cancel_computer_turn(self):
+        """Abandonne le coup de l'ordinateur en cours de calcul"""
+        if self._ai_poll is not None:
+            self.after_cancel(self._ai_poll)
+            self._ai_poll = None
+        self._ai_ticket = None
+        self.ai_worker.cancel()
+    
+    def _computer_turn(self, x: int, y: int):
+        """Tour de l'ordinateur : applique le tir calculé"""
+        self._ai_poll = None
+        self.game_phase = "playing"
+        hit, sunk = self.player_board.receive_shot(x, y)
         
         if hit:
+            self.computer_ai.notify_hit(x, y, sunk is not None, sunk)
             self.stats['computer_hits'] += 1
-            self.player_buttons[y][x].config(bg=HIT_COLOR, text=HIT_SYMBOL)
+            self.player_canvas.set_cell(x, y, HIT_COLOR, HIT_SYMBOL)
             if sunk:
                 self.status_label.config(text=f"L'ordinateur a coulé votre {sunk.name} !")
                 self._update_sunk_ships()
-                if all(ship.is_sunk() for ship in self.player_board.ships):
+                if self.player_board.all_ships_sunk():
                     self._end_game(False)
             else:
                 self.status_label.config(text="L'ordinateur vous a touché !")
         else:
             self.stats['computer_misses'] += 1
-            self.player_buttons[y][x].config(bg=MISS_COLOR, text=MISS_SYMBOL)
+            self.player_canvas.set_cell(x, y, MISS_COLOR, MISS_SYMBOL)
             self.status_label.config(text="L'ordinateur a manqué !")
     
     def _toggle_orientation(self):
@@ -250,16 +302,15 @@ class GameWindow(tk.Tk):
     
     def _update_player_grid(self):
         """Met à jour l'affichage de la grille du joueur"""
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                if self.player_board.grid[y][x]:
-                    self.player_buttons[y][x].config(bg=SHIP_COLOR)
+        for ship in self.player_board.ships:
+            for x, y in ship.positions:
+                self.player_canvas.set_cell(x, y, SHIP_COLOR)
     
     def _start_ship_placement(self):
         """Commence le placement des navires"""
         # Vérifie s'il reste des navires à placer
-        for name, size in SHIPS_CONFIG.items():
-            if not any(ship.name == name for ship in self.player_board.ships):
+        for name, size in self.ships_config.items():
+            if name not in self.player_board.ship_names:
                 self.current_ship = Ship(name, size)
                 self.status_label.config(text=f"Placez votre {name} ({size} cases)")
                 return
@@ -271,17 +322,8 @@ class GameWindow(tk.Tk):
         self._place_computer_ships()
     
     def _place_computer_ships(self):
-        """Place aléatoirement les navires de l'ordinateur"""
-        import random
-        for name, size in SHIPS_CONFIG.items():
-            ship = Ship(name, size)
-            placed = False
-            while not placed:
-                x = random.randint(0, GRID_SIZE - 1)
-                y = random.randint(0, GRID_SIZE - 1)
-                horizontal = random.choice([True, False])
-                if self.computer_board.place_ship(ship, x, y, horizontal):
-                    placed = True
+        """Place les navires de l'ordinateur (aléatoirement ou depuis une réserve)"""
+        self.place_computer_fleet(self.computer_board, self.ships_config, self.rng)
     
     def _end_game(self, player_won: bool):
         """Termine la partie"""
@@ -292,7 +334,8 @@ class GameWindow(tk.Tk):
         if player_won:
             for ship in self.computer_board.ships:
                 for x, y in ship.positions:
-                    self.computer_buttons[y][x].config(bg=SHIP_COLOR)
+                    symbol = HIT_SYMBOL if self.computer_board.is_hit(x, y) else ""
+                    self.computer_canvas.set_cell(x, y, SHIP_COLOR, symbol)
         
         # Afficher la boîte de dialogue de fin
         dialog = tk.Toplevel(self)
@@ -324,13 +367,17 @@ class GameWindow(tk.Tk):
     def _reset_game(self):
         """Réinitialise la partie"""
         # Réinitialiser les plateaux
-        self.player_board = Board()
-        self.computer_board = Board()
+        self.player_board = Board(self.size)
+        self.computer_board = Board(self.size)
         
-        # Réinitialiser l'IA
-        self.computer_ai = ComputerAI("hard")
+        # Réinitialiser l'IA (et abandonner un coup en cours de calcul)
+        self._cancel_computer_turn()
+        self.computer_ai = ComputerAI(self.difficulty, self.rng,
+                                      self.ships_config, self.time_budget)
         
-        # Réinitialiser les statistiques
+        # Réinitialiser les statistiques et l'historique d'annulation
+        self.undo_stack.clear()
+        self.undo_btn.config(state=tk.DISABLED)
         self.stats = {
             'player_hits': 0,
             'player_misses': 0,
@@ -344,11 +391,9 @@ class GameWindow(tk.Tk):
         self.current_ship = None
         self.placement_horizontal = True
         
-        # Réinitialiser les boutons
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                self.player_buttons[y][x].config(bg=WATER_COLOR)
-                self.computer_buttons[y][x].config(bg=WATER_COLOR)
+        # Réinitialiser les grilles
+        self.player_canvas.reset()
+        self.computer_canvas.reset()
         
         # Réactiver le bouton de rotation
         self.rotation_btn.config(state=tk.NORMAL)
@@ -356,20 +401,158 @@ class GameWindow(tk.Tk):
         # Commencer le placement
         self._start_ship_placement()
     
+    def snapshot(self) -> bytes:
+        """Encode la partie en cours (plateaux, IA, statistiques)."""
+        counters = (
+            GAME_PHASES.index(self.game_phase),
+            self.stats['player_hits'],
+            self.stats['player_misses'],
+            self.stats['computer_hits'],
+            self.stats['computer_misses'],
+            int(time.time() - self.stats['start_time']),
+            self.placement_horizontal
+        )
+        return encode_snapshot((self.player_board, self.computer_board),
+                               [(self.computer_ai, 0)], counters)
+    
+    def restore(self, data: bytes):
+        """
+        Restaure une partie encodée par ``snapshot``.
+        
+        Raises:
+            ValueError: Si les données ne sont pas une partie valide
+        """
+        snapshot = decode_snapshot(data)
+        if len(snapshot.boards) != 2 or len(snapshot.counters) != 7:
+            raise ValueError("Instantané de partie invalide")
+        if snapshot.boards[0].size != self.size:
+            raise ValueError(f"La partie sauvegardée utilise un plateau "
+                             f"{snapshot.boards[0].size}x{snapshot.boards[0].size}")
+        
+        self._cancel_computer_turn()
+        self.player_board, self.computer_board = snapshot.boards
+        self.computer_ai = snapshot.ais[0][0]
+        self.rng = self.computer_ai.rng
+        phase, player_hits, player_misses, computer_hits, computer_misses, \
+            elapsed, horizontal = snapshot.counters
+        self.stats = {
+            'player_hits': player_hits,
+            'player_misses': player_misses,
+            'computer_hits': computer_hits,
+            'computer_misses': computer_misses,
+            'start_time': time.time() - elapsed
+        }
+        self.game_phase = GAME_PHASES[phase]
+        self.placement_horizontal = bool(horizontal)
+        
+        self._redraw_boards()
+        self._update_sunk_ships()
+        if self.game_phase == "placement":
+            self.rotation_btn.config(state=tk.NORMAL)
+            self._start_ship_placement()
+            return
+        self.rotation_btn.config(state=tk.DISABLED)
+        if self.game_phase == "computer_turn":
+            self._start_computer_turn()
+        elif self.game_phase == "playing":
+            self.status_label.config(text=TURN_MSG)
+        else:
+            self.status_label.config(text="Partie terminée")
+    
+    def _redraw_boards(self):
+        """Redessine les deux grilles à partir des plateaux"""
+        self.player_canvas.reset()
+        self.computer_canvas.reset()
+        self._update_player_grid()
+        for canvas, board in ((self.player_canvas, self.player_board),
+                              (self.computer_canvas, self.computer_board)):
+            for x, y in board.shots:
+                if board.is_hit(x, y):
+                    canvas.set_cell(x, y, HIT_COLOR, HIT_SYMBOL)
+                else:
+                    canvas.set_cell(x, y, MISS_COLOR, MISS_SYMBOL)
+        for ship in self.computer_board.sunk_ships:
+            for x, y in ship.positions:
+                self.computer_canvas.set_cell(x, y, SHIP_COLOR, HIT_SYMBOL)
+    
+    def _undo_shot(self):
+        """Annule le dernier tir du joueur et la réponse de l'ordinateur"""
+        if not self.undo_stack or self.game_phase == "game_over":
+            return
+        self.restore(self.undo_stack.pop())
+        if not self.undo_stack:
+            self.undo_btn.config(state=tk.DISABLED)
+    
+    def _save_game(self):
+        """Sauvegarde la partie en cours dans un fichier"""
+        path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".bsave",
+            filetypes=[("Parties sauvegardées", "*.bsave")]
+        )
+        if path:
+            with open(path, "wb") as file:
+                file.write(self.snapshot())
+    
+    def _load_game(self):
+        """Charge une partie sauvegardée"""
+        path = filedialog.askopenfilename(
+            parent=self, filetypes=[("Parties sauvegardées", "*.bsave")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, "rb") as file:
+                self.restore(file.read())
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Chargement impossible", str(error), parent=self)
+            return
+        self.undo_stack.clear()
+        self.undo_btn.config(state=tk.DISABLED)
+    
     def _update_sunk_ships(self):
         """Met à jour l'affichage des navires coulés"""
         # Navires du joueur
-        player_sunk = [ship.name for ship in self.player_board.ships if ship.is_sunk()]
+        player_sunk = [ship.name for ship in self.player_board.sunk_ships]
         self.player_sunk_list.config(text="\n".join(player_sunk) if player_sunk else "Aucun")
         
         # Navires de l'ordinateur
-        computer_sunk = [ship.name for ship in self.computer_board.ships if ship.is_sunk()]
+        computer_sunk = [ship.name for ship in self.computer_board.sunk_ships]
         self.computer_sunk_list.config(text="\n".join(computer_sunk) if computer_sunk else "Aucun")
 
-def main():
+def main(argv=None):
     """Lance le jeu"""
-    app = GameWindow()
+    parser = argparse.ArgumentParser(description="Bataille navale contre l'ordinateur.")
+    parser.add_argument("--ai", default="hard",
+                        help="difficulté de l'ordinateur (easy, hard, density, "
+                             "solver) ou nom d'un profil réglé")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="durée maximale d'un coup de l'IA 'solver' en secondes")
+    parser.add_argument("--placement", default=RANDOM_PLACEMENT,
+                        help="placement de la flotte de l'ordinateur : 'random' "
+                             "ou IA dont elle doit déjouer les tirs (réserve "
+                             "précalculée)")
+    parser.add_argument("--stats", default=None, metavar="FICHIER",
+                        help="mesure les chemins critiques et écrit les statistiques "
+                             "dans FICHIER (JSON Lines)")
+    parser.add_argument("--stats-interval", type=float, default=10.0,
+                        help="période d'écriture des statistiques en secondes")
+    args = parser.parse_args(argv)
+    if not is_known_difficulty(args.ai):
+        parser.error(f"Difficulté ou profil inconnu : {args.ai}")
+    try:
+        fleet_placer(args.placement, GRID_SIZE, SHIPS_CONFIG)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.stats:
+        instrumentation.enable(args.stats, args.stats_interval)
+    app = GameWindow(difficulty=args.ai, time_budget=args.time_budget,
+                     placement=args.placement)
     app.mainloop()
+    app.ai_worker.close()
+    if instrumentation.enabled:
+        instrumentation.disable()
+        instrumentation.dump(args.stats)
 
 if __name__ == "__main__":
     main()
@@ -1,63 +1,370 @@
 """
 Module représentant le plateau de jeu.
+
+L'état du plateau est stocké sous forme d'ensembles de bits : la case
+(x, y) correspond au bit ``y * size + x``. Les masques entiers
+(``ship_mask``, ``shot_mask``, ``hit_mask``) sont tenus à jour à chaque
+placement et à chaque tir ; un placement se vérifie par un seul test
+``segment & ship_mask``. Chaque masque a un double en ``bytearray`` (un bit
+par case) qui garde les tests d'une case en O(1) quelle que soit la taille
+du plateau, là où décaler un grand entier coûte O(cases).
 """
 
-from typing import List, Tuple, Optional
+import random
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple, Optional
 from .ship import Ship
+from . import zobrist
+
+# Proportion minimale de cases libres pour tirer une case au hasard par rejet
+_REJECTION_FREE_RATIO = 1 / 64
+
+
+def _bitset(cells: int) -> bytearray:
+    """Crée un ensemble de bits vide pour ``cells`` cases."""
+    return bytearray((cells + 7) >> 3)
+
+
+class _GridRow:
+    """Vue en lecture seule d'une ligne du plateau."""
+
+    __slots__ = ("_board", "_offset")
+
+    def __init__(self, board: "Board", y: int):
+        self._board = board
+        self._offset = y * board.size
+
+    def __getitem__(self, x: int) -> Optional[Ship]:
+        if not 0 <= x < self._board.size:
+            raise IndexError(x)
+        return self._board._ship_at.get(self._offset + x)
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self) -> Iterator[Optional[Ship]]:
+        ship_at = self._board._ship_at
+        for index in range(self._offset, self._offset + self._board.size):
+            yield ship_at.get(index)
+
+
+class _GridView:
+    """Vue ``grid[y][x]`` compatible avec l'ancienne grille de listes."""
+
+    __slots__ = ("_board",)
+
+    def __init__(self, board: "Board"):
+        self._board = board
+
+    def __getitem__(self, y: int) -> _GridRow:
+        if not 0 <= y < self._board.size:
+            raise IndexError(y)
+        return _GridRow(self._board, y)
+
+    def __len__(self) -> int:
+        return self._board.size
+
+    def __iter__(self) -> Iterator[_GridRow]:
+        for y in range(self._board.size):
+            yield _GridRow(self._board, y)
+
+
+class _ShotLog(Sequence):
+    """
+    Historique des tirs stocké dans deux tableaux d'entiers.
+
+    Se comporte comme l'ancienne liste de tuples ``(x, y)`` ; le test
+    ``(x, y) in shots`` est en O(1) pour les cases du plateau.
+    """
+
+    __slots__ = ("_board", "_xs", "_ys")
+
+    def __init__(self, board: "Board"):
+        self._board = board
+        self._xs = array("l")
+        self._ys = array("l")
+
+    def append(self, shot: Tuple[int, int]):
+        self._xs.append(shot[0])
+        self._ys.append(shot[1])
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return list(zip(self._xs[item], self._ys[item]))
+        return self._xs[item], self._ys[item]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._xs, self._ys)
+
+    def __contains__(self, shot) -> bool:
+        x, y = shot
+        if self._board._is_valid_position(x, y):
+            return self._board.is_shot(x, y)
+        return any(shot == logged for logged in self)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
 
 class Board:
+    """
+    Plateau de jeu.
+
+    Attributes:
+        size (int): Taille du plateau (size x size)
+        ships (List[Ship]): Navires placés
+        shots (Sequence[Tuple[int, int]]): Historique des tirs reçus
+        shot_count (int): Nombre de cases distinctes ciblées
+        ships_left (int): Nombre de navires non coulés
+        sunk_ships (List[Ship]): Navires coulés, dans l'ordre
+        ship_names (Set[str]): Noms des navires placés
+        hit_points_left (int): Cases de navire non touchées
+        ship_mask (int): Cases occupées par un navire
+        shot_mask (int): Cases déjà ciblées
+        hit_mask (int): Cases touchées
+        miss_mask (int): Cases manquées (calculé à la lecture)
+        zobrist (int): Empreinte de Zobrist des faits observés par le tireur
+            (cases manquées, touchées, navires coulés), indépendante de
+            l'ordre des tirs
+    """
+
     def __init__(self, size: int = 10):
         self.size = size
-        self.grid = [[None for _ in range(size)] for _ in range(size)]
+        self.cells = size * size
         self.ships: List[Ship] = []
-        self.shots: List[Tuple[int, int]] = []
-    
+        self.shots = _ShotLog(self)
+        self.shot_count = 0
+        self.ships_left = 0
+        self.sunk_ships: List[Ship] = []
+        self.ship_names: Set[str] = set()
+        self.hit_points_left = 0
+        self.zobrist = 0
+        self.ship_mask = 0
+        self.shot_mask = 0
+        self.hit_mask = 0
+        self._zobrist_keys = zobrist.shot_table(self.cells)
+        self._shot_bits = _bitset(self.cells)
+        self._hit_bits = _bitset(self.cells)
+        self._ship_at: Dict[int, Ship] = {}
+        self._free_pool: Optional[List[int]] = None
+        self.grid = _GridView(self)
+
+    @property
+    def miss_mask(self) -> int:
+        return self.shot_mask & ~self.hit_mask
+
     def place_ship(self, ship: Ship, x: int, y: int, horizontal: bool) -> bool:
         """Place un navire sur le plateau"""
-        if not self.can_place_ship(ship, x, y, horizontal):
+        mask = self.segment_mask(x, y, ship.size, horizontal) if ship.size > 0 else 0
+        if not mask or mask & self.ship_mask:
             return False
-        
-        positions = []
+
+        self.ship_mask |= mask
+        step = 1 if horizontal else self.size
+        start = y * self.size + x
         for i in range(ship.size):
-            pos_x = x + (i if horizontal else 0)
-            pos_y = y + (0 if horizontal else i)
-            positions.append((pos_x, pos_y))
-            self.grid[pos_y][pos_x] = ship
-        
-        for pos_x, pos_y in positions:
-            ship.add_position(pos_x, pos_y)
-        
+            self._ship_at[start + i * step] = ship
+        ship.place(x, y, horizontal)
+
+        self.hit_points_left += ship.size
+        self.ships_left += 1
+        self.ship_names.add(ship.name)
         self.ships.append(ship)
         return True
-    
+
     def can_place_ship(self, ship: Ship, x: int, y: int, horizontal: bool) -> bool:
         """Vérifie si un navire peut être placé à une position"""
-        for i in range(ship.size):
-            pos_x = x + (i if horizontal else 0)
-            pos_y = y + (0 if horizontal else i)
-            
-            if not self._is_valid_position(pos_x, pos_y):
-                return False
-            
-            if self.grid[pos_y][pos_x] is not None:
-                return False
-        
-        return True
-    
+        if ship.size <= 0:
+            return False
+        mask = self.segment_mask(x, y, ship.size, horizontal)
+        return mask != 0 and mask & self.ship_mask == 0
+
+    def segment_mask(self, x: int, y: int, length: int, horizontal: bool) -> int:
+        """
+        Calcule le masque d'un segment de ``length`` cases.
+
+        Returns:
+            int: Masque du segment, ou 0 s'il dépasse du plateau
+        """
+        size = self.size
+        if horizontal:
+            if not (0 <= x and x + length <= size and 0 <= y < size):
+                return 0
+            return ((1 << length) - 1) << (y * size + x)
+
+        if not (0 <= x < size and 0 <= y and y + length <= size):
+            return 0
+        mask = 0
+        bit = 1 << (y * size + x)
+        for _ in range(length):
+            mask |= bit
+            bit <<= size
+        return mask
+
     def receive_shot(self, x: int, y: int) -> Tuple[bool, Optional[Ship]]:
         """Reçoit un tir et retourne si c'est un hit et le navire coulé"""
         self.shots.append((x, y))
-        
+
         if not self._is_valid_position(x, y):
             return False, None
-        
-        ship = self.grid[y][x]
+
+        index = y * self.size + x
+        byte, bit = index >> 3, 1 << (index & 7)
+        first_shot = not self._shot_bits[byte] & bit
+        ship = self._ship_at.get(index)
+        if first_shot:
+            self._shot_bits[byte] |= bit
+            self.shot_mask |= 1 << index
+            self.shot_count += 1
+            keys = self._zobrist_keys
+            if keys is not None:
+                self.zobrist ^= keys[index << 1 | (ship is not None)]
+            else:
+                self.zobrist ^= zobrist.shot_key(index, ship is not None)
+
         if ship is None:
             return False, None
-        
-        ship.hit(x, y)
+
+        if first_shot:
+            self._hit_bits[byte] |= bit
+            self.hit_mask |= 1 << index
+            self.hit_points_left -= 1
+            if ship.hit(x, y) and ship.is_sunk():
+                self.ships_left -= 1
+                self.sunk_ships.append(ship)
+                self.zobrist ^= zobrist.sunk_key(ship)
         return True, ship if ship.is_sunk() else None
-    
+
+    def receive_shots(self, indices: Iterable[int]):
+        """
+        Applique en une passe une suite de tirs (indices ``y * size + x``).
+
+        Équivaut à ``receive_shot`` tir par tir, sans construire les
+        résultats ; sert à restaurer une partie.
+
+        Raises:
+            ValueError: Si un indice est hors du plateau
+        """
+        size = self.size
+        cells = self.cells
+        shot_bits = self._shot_bits
+        hit_bits = self._hit_bits
+        ship_at = self._ship_at
+        keys = self._zobrist_keys
+        xs, ys = self.shots._xs, self.shots._ys
+        for index in indices:
+            if not 0 <= index < cells:
+                raise ValueError(f"Case {index} hors du plateau")
+            y, x = divmod(index, size)
+            xs.append(x)
+            ys.append(y)
+            byte, bit = index >> 3, 1 << (index & 7)
+            if shot_bits[byte] & bit:
+                continue
+            shot_bits[byte] |= bit
+            self.shot_mask |= 1 << index
+            self.shot_count += 1
+            ship = ship_at.get(index)
+            if keys is not None:
+                self.zobrist ^= keys[index << 1 | (ship is not None)]
+            else:
+                self.zobrist ^= zobrist.shot_key(index, ship is not None)
+            if ship is not None:
+                hit_bits[byte] |= bit
+                self.hit_mask |= 1 << index
+                self.hit_points_left -= 1
+                if ship.hit(x, y) and ship.is_sunk():
+                    self.ships_left -= 1
+                    self.sunk_ships.append(ship)
+                    self.zobrist ^= zobrist.sunk_key(ship)
+
+    def shot_indices(self) -> List[int]:
+        """
+        Indices (``y * size + x``) des tirs reçus, dans l'ordre.
+
+        Raises:
+            ValueError: Si un tir reçu est hors du plateau
+        """
+        size = self.size
+        xs, ys = self.shots._xs, self.shots._ys
+        if xs and (min(xs) < 0 or max(xs) >= size or min(ys) < 0 or max(ys) >= size):
+            raise ValueError("Un tir reçu est hors du plateau")
+        return [y * size + x for x, y in zip(xs, ys)]
+
+    def is_shot(self, x: int, y: int) -> bool:
+        """Vérifie en O(1) si une case a déjà été ciblée"""
+        if not self._is_valid_position(x, y):
+            return False
+        index = y * self.size + x
+        return bool(self._shot_bits[index >> 3] >> (index & 7) & 1)
+
+    def is_hit(self, x: int, y: int) -> bool:
+        """Vérifie en O(1) si une case a été touchée"""
+        if not self._is_valid_position(x, y):
+            return False
+        index = y * self.size + x
+        return bool(self._hit_bits[index >> 3] >> (index & 7) & 1)
+
+    def all_ships_sunk(self) -> bool:
+        """Vérifie si toutes les cases occupées ont été touchées"""
+        return self.hit_points_left == 0
+
+    def unshot_cells(self) -> List[Tuple[int, int]]:
+        """Retourne les cases qui n'ont pas encore été ciblées"""
+        size = self.size
+        return [(index % size, index // size) for index in self._unshot_indices()]
+
+    def random_unshot_cell(self, rng=random) -> Tuple[int, int]:
+        """
+        Tire une case non ciblée uniformément au hasard.
+
+        Tant que le plateau est peu ciblé, un tirage avec rejet suffit. Au-delà,
+        une réserve de cases libres est construite une seule fois puis purgée
+        au fil des tirages, ce qui garde un coût amorti en O(1).
+        """
+        size = self.size
+        cells = self.cells
+        free = cells - self.shot_count
+        if free <= 0:
+            raise ValueError("Toutes les cases ont déjà été ciblées")
+
+        shot_bits = self._shot_bits
+        if free >= cells * _REJECTION_FREE_RATIO:
+            while True:
+                index = rng.randrange(cells)
+                if not shot_bits[index >> 3] >> (index & 7) & 1:
+                    return index % size, index // size
+
+        pool = self._free_pool
+        if pool is None:
+            pool = self._free_pool = self._unshot_indices()
+        while True:
+            position = rng.randrange(len(pool))
+            index = pool[position]
+            if not shot_bits[index >> 3] >> (index & 7) & 1:
+                return index % size, index // size
+            pool[position] = pool[-1]
+            pool.pop()
+
+    def _unshot_indices(self) -> List[int]:
+        """Indices des cases non ciblées, dans l'ordre des lignes."""
+        indices = []
+        cells = self.cells
+        for byte_index, byte in enumerate(self._shot_bits):
+            if byte == 0xFF:
+                continue
+            base = byte_index << 3
+            for bit in range(8):
+                if not byte >> bit & 1 and base + bit < cells:
+                    indices.append(base + bit)
+        return indices
+
     def _is_valid_position(self, x: int, y: int) -> bool:
         """Vérifie si une position est valide sur le plateau"""
-        return 0 <= x < self.size and 0 <= y < self.size 
\ No newline at end of file
+        return 0 <= x < self.size and 0 <= y < self.size
@@ -3,35 +3,86 @@ Module d'intelligence artificielle pour l'ordinateur.
 """
 
 import random
-from typing import List, Tuple, Optional
+import threading
+from collections import Counter
+from typing import Dict, List, Tuple, Optional
 from .board import Board
+from .density import LocalDensityTargeting, make_density_targeting
+from . import opening_book, transposition
+from .params import DEFAULT_PARAMS, DIFFICULTIES, StrategyParams, load_profile
+from .placement import uses_index
+from .ship import Ship
+from .. import instrumentation
+from ..utils.constants import SHIPS_CONFIG
 
 class ComputerAI:
     """
     Intelligence artificielle pour l'ordinateur.
     
     Attributes:
-        difficulty (str): Niveau de difficulté ('easy' ou 'hard')
+        difficulty (str): Niveau de difficulté ('easy', 'hard', 'density'
+            ou 'solver') ; un autre nom désigne un profil (voir ``params``)
+        profile (Optional[str]): Nom du profil chargé, le cas échéant
+        params (StrategyParams): Réglages numériques de la stratégie
         last_hit (Optional[Tuple[int, int]]): Dernière position touchée
         potential_targets (List[Tuple[int, int]]): Cibles potentielles après un hit
+        rng (random.Random): Générateur aléatoire propre à l'IA
+        ships_config (Dict[str, int]): Flotte adverse attendue
+        time_budget (Optional[float]): Durée maximale d'un coup ('solver')
+        use_book (bool): Consulte la table de transposition ('density',
+            seule stratégie déterministe) et, avec les réglages par défaut,
+            le livre d'ouvertures
+        sunk_ships (List[Ship]): Navires adverses coulés, dans l'ordre
     """
     
-    def __init__(self, difficulty: str = "hard"):
+    # Tirages tentés sur les cases du damier avant un tir aléatoire simple
+    PARITY_TRIES = 64
+    
+    def __init__(self, difficulty: str = "hard",
+                 rng: Optional[random.Random] = None,
+                 ships_config: Dict[str, int] = SHIPS_CONFIG,
+                 time_budget: Optional[float] = None,
+                 use_book: bool = True,
+                 params: Optional[StrategyParams] = None):
+        self.profile = None
+        if difficulty not in DIFFICULTIES:
+            self.profile = difficulty
+            difficulty, profile_params = load_profile(difficulty)
+            if params is None:
+                params = profile_params
         self.difficulty = difficulty
+        self.params = params if params is not None else DEFAULT_PARAMS
+        self.rng = rng if rng is not None else random.Random()
+        self.ships_config = ships_config
+        self.time_budget = time_budget
+        self.use_book = use_book and difficulty == "density"
+        self.density = None
         self.last_hit: Optional[Tuple[int, int]] = None
         self.potential_targets: List[Tuple[int, int]] = []
         self.successful_hits: List[Tuple[int, int]] = []
+        self.sunk_ships: List[Ship] = []
+        self._fleet = opening_book.fleet_key(ships_config.values())
+        self._strategy: Optional[Tuple[int, int]] = None
+        self._remaining = Counter(ships_config.values())
+        self._spacing = min(self._remaining, default=1)
+        self._longest = max(self._remaining, default=1)
     
-    def get_shot(self, board: Board) -> Tuple[int, int]:
+    def get_shot(self, board: Board,
+                 cancel: Optional[threading.Event] = None) -> Tuple[int, int]:
         """
         Détermine la prochaine case à cibler.
         
         Args:
             board (Board): Plateau du joueur
+            cancel (Optional[threading.Event]): Abrège le calcul du solveur
+                lorsqu'il est levé (le tir retourné n'est alors pas optimal)
             
         Returns:
             Tuple[int, int]: Coordonnées (x, y) du tir
         """
+        if self.difficulty in ("density", "solver"):
+            return self._density_shot(board, cancel)
+        
         if self.difficulty == "easy" or not self.last_hit:
             return self._random_shot(board)
         
@@ -43,10 +94,15 @@ class ComputerAI:
             target = self.potential_targets.pop(0)
             if self._is_valid_target(board, target):
                 return target
+            if instrumentation.enabled:
+                instrumentation.count("ai.fallback.stale_target")
+        elif instrumentation.enabled:
+            instrumentation.count("ai.fallback.no_target")
         
         return self._random_shot(board)
     
-    def notify_hit(self, x: int, y: int, sunk: bool):
+    def notify_hit(self, x: int, y: int, sunk: bool,
+                   ship: Optional[Ship] = None):
         """
         Notifie l'IA du résultat d'un tir.
         
@@ -54,7 +110,13 @@ class ComputerAI:
             x (int): Coordonnée X du tir
             y (int): Coordonnée Y du tir
             sunk (bool): True si un navire a été coulé
+            ship (Optional[Ship]): Navire coulé (requis par 'density' et 'solver')
         """
+        if sunk and ship is not None:
+            self._count_sunk(ship)
+            if self.density is not None:
+                self.density.notify_sunk(ship)
+        
         if sunk:
             self.last_hit = None
             self.potential_targets.clear()
@@ -63,14 +125,110 @@ class ComputerAI:
             self.last_hit = (x, y)
             self.successful_hits.append((x, y))
     
+    def _count_sunk(self, ship: Ship):
+        """Enregistre un navire adverse coulé et les longueurs restantes."""
+        self.sunk_ships.append(ship)
+        if self._remaining[ship.size] > 0:
+            self._remaining[ship.size] -= 1
+            lengths = [length for length, count in self._remaining.items() if count]
+            self._spacing = min(lengths, default=1)
+            self._longest = max(lengths, default=1)
+    
+    def _density_shot(self, board: Board,
+                      cancel: Optional[threading.Event] = None) -> Tuple[int, int]:
+        """
+        Vise la case couverte par le plus de placements possibles.
+        
+        Sur les grands plateaux (sans index de placements), 'density' et
+        'solver' utilisent la variante locale ``LocalDensityTargeting`` ; à
+        partir de ``VECTOR_MIN_SIZE`` de côté, la carte de 'density' est
+        vectorisée si NumPy est disponible (mêmes décisions).
+        """
+        key = None
+        if self.use_book and uses_index(board.size):
+            if transposition.SHARED_CACHE.active:
+                key = self._cache_key(board)
+            known = self._known_shot(board, key)
+            if known is not None:
+                return known
+        if self.density is None:
+            if not uses_index(board.size):
+                self.density = LocalDensityTargeting(
+                    board.size, self.ships_config, self.rng,
+                    self.params.target_weight, self.params.smoothing
+                )
+            elif self.difficulty == "solver":
+                from .solver import MonteCarloTargeting
+                self.density = MonteCarloTargeting(
+                    board.size, self.ships_config, self.rng,
+                    time_budget=self.time_budget
+                )
+            else:
+                self.density = make_density_targeting(board.size, self.ships_config,
+                                                      self.params.target_weight,
+                                                      self.params.smoothing)
+            for ship in self.sunk_ships:
+                self.density.notify_sunk(ship)
+        if self.difficulty == "solver" and uses_index(board.size):
+            self.density.cancel = cancel
+        target = self.density.best_cell(board)
+        if target is None:
+            if instrumentation.enabled:
+                instrumentation.count("ai.fallback.no_density_target")
+            return self._random_shot(board)
+        if key is not None:
+            transposition.SHARED_CACHE.put(key, target[1] * board.size + target[0])
+        return target
+    
+    def position_key(self, board: Board) -> int:
+        """Empreinte de l'état observé de ``board`` (clé du livre d'ouvertures)."""
+        return board.zobrist
+    
+    def _cache_key(self, board: Board) -> int:
+        """Clé de la table de transposition : stratégie et état observé."""
+        if self._strategy is None or self._strategy[0] != board.size:
+            self._strategy = (board.size, transposition.strategy_key(
+                board.size, self._fleet, self.params
+            ))
+        return transposition.position_key(self._strategy[1], board.zobrist)
+    
+    def _known_shot(self, board: Board,
+                    key: Optional[int]) -> Optional[Tuple[int, int]]:
+        """
+        Coup du livre d'ouvertures ou de la table de transposition, s'il
+        existe (``key`` vaut None lorsque la table est désactivée).
+        """
+        size = board.size
+        cell = None
+        source = "book"
+        if self.params == DEFAULT_PARAMS:
+            cell = opening_book.default_book().lookup(size, self._fleet,
+                                                      board.zobrist)
+        if cell is None and key is not None:
+            cell = transposition.SHARED_CACHE.get(key)
+            source = "cache"
+        if cell is None:
+            if instrumentation.enabled:
+                instrumentation.count("ai.book.miss")
+            return None
+        x, y = cell % size, cell // size
+        if board.is_shot(x, y):
+            return None
+        if instrumentation.enabled:
+            instrumentation.count(f"ai.{source}.hit")
+        return x, y
+    
     def _random_shot(self, board: Board) -> Tuple[int, int]:
-        """Choisit une case aléatoire non ciblée."""
-        available_shots = [
-            (x, y) for x in range(board.size) 
-            for y in range(board.size) 
-            if (x, y) not in board.shots
-        ]
-        return random.choice(available_shots)
+        """Choisit une case aléatoire non ciblée (sur le damier si ``parity``)."""
+        if self.params.parity and self._spacing > 1:
+            size = board.size
+            spacing = self._spacing
+            randrange = self.rng.randrange
+            for _ in range(self.PARITY_TRIES):
+                x, y = randrange(size), randrange(size)
+                if (x + y) % spacing == 0 and not board.is_shot(x, y):
+                    return x, y
+        return board.random_unshot_cell(self.rng)
     
     def _update_potential_targets(self, board: Board, pos: Tuple[int, int]):
         """Met à jour la liste des cibles potentielles."""
@@ -88,9 +246,29 @@ class ComputerAI:
             new_x, new_y = x + dx, y + dy
             if self._is_valid_target(board, (new_x, new_y)):
                 self.potential_targets.append((new_x, new_y))
+        
+        # Ordre des essais : rang fixe, corrigé par l'espace libre au-delà
+        weight = self.params.space_weight
+        if weight and len(self.potential_targets) > 1:
+            rank = {target: i for i, target in enumerate(self.potential_targets)}
+            self.potential_targets.sort(
+                key=lambda target: rank[target]
+                - weight * self._free_run(board, pos, target)
+            )
+    
+    def _free_run(self, board: Board, pos: Tuple[int, int],
+                  target: Tuple[int, int]) -> int:
+        """Cases libres consécutives depuis ``target``, dans le sens pos -> target."""
+        dx, dy = target[0] - pos[0], target[1] - pos[1]
+        x, y = target
+        run = 0
+        while run < self._longest - 1 and self._is_valid_target(board, (x, y)):
+            run += 1
+            x, y = x + dx, y + dy
+        return run
     
     def _is_valid_target(self, board: Board, pos: Tuple[int, int]) -> bool:
         """Vérifie si une position est une cible valide."""
         x, y = pos
-        return (board._is_valid_position(x, y) and 
-                (x, y) not in board.shots) 
\ No newline at end of file
+        return (board._is_valid_position(x, y) and
+                not board.is_shot(x, y)) 
\ No newline at end of file
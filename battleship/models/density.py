@@ -0,0 +1,617 @@
+"""
+Stratégie de ciblage par densité de probabilité.
+
+Pour chaque navire encore à flot, on compte tous les placements légaux
+compatibles avec les tirs observés ; la case couverte par le plus grand nombre
+de placements est la plus probable. Les comptes sont maintenus de manière
+incrémentale à partir de l'index de placements partagé : un nouveau tir
+manqué (ou un navire coulé) ne retire que les placements qui passent par les
+cases concernées.
+"""
+
+import random
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+from .board import Board
+from .placement import INDEX_CACHE_SIZE, placement_index
+from .ship import Ship
+
+# Poids d'une touche non coulée couverte par un placement en mode cible
+TARGET_WEIGHT = 16
+
+# Côté minimal du plateau pour la carte de densité vectorisée (NumPy)
+VECTOR_MIN_SIZE = 40
+
+
+class DensityTargeting:
+    """
+    Carte de densité incrémentale pour un plateau adverse.
+
+    Attributes:
+        size (int): Taille du plateau visé
+        remaining (Counter): Nombre de navires restants par longueur
+        counts (List[int]): Nombre pondéré de placements vivants par case
+        target_weight (float): Poids d'une touche couverte en mode cible
+        smoothing (float): Part de la densité des voisines ajoutée en chasse
+        shot_mask (int): Cases ciblées, tenues à jour à partir de
+            l'historique des tirs (sans reconstruire les masques du plateau)
+    """
+
+    def __init__(self, size: int, ships_config: Dict[str, int],
+                 target_weight: float = TARGET_WEIGHT, smoothing: float = 0.0):
+        self.size = size
+        self.target_weight = target_weight
+        self.smoothing = smoothing
+        self.remaining = Counter(ships_config.values())
+        self.blocked_mask = 0
+        self.hit_mask = 0
+        self.sunk_mask = 0
+        self.shot_mask = 0
+        self._seen_shots = 0
+        self.counts = [0] * (size * size)
+        self._alive: Dict[int, bytearray] = {}
+        self._length_counts: Dict[int, List[int]] = {}
+
+        for length, multiplicity in self.remaining.items():
+            placements = placement_index(size, length)
+            self._alive[length] = bytearray(b"\x01") * len(placements.masks)
+            length_counts = [0] * (size * size)
+            for indices in placements.cells:
+                for index in indices:
+                    length_counts[index] += 1
+            self._length_counts[length] = length_counts
+            for index, count in enumerate(length_counts):
+                self.counts[index] += multiplicity * count
+
+    def observe(self, board: Board):
+        """Intègre les tirs apparus sur le plateau depuis le dernier appel."""
+        shots = board.shots
+        if self._seen_shots == len(shots):
+            return
+        size = self.size
+        shot_mask = self.shot_mask
+        new_hits = new_misses = 0
+        for x, y in shots[self._seen_shots:]:
+            if not (0 <= x < size and 0 <= y < size):
+                continue
+            bit = 1 << (y * size + x)
+            shot_mask |= bit
+            if board.is_hit(x, y):
+                new_hits |= bit
+            else:
+                new_misses |= bit
+        self._seen_shots = len(shots)
+        self.shot_mask = shot_mask
+        self.hit_mask |= new_hits
+        new_blocked = new_misses & ~self.blocked_mask
+        if new_blocked:
+            self._block(new_blocked)
+
+    def notify_sunk(self, ship: Ship):
+        """Retire un navire coulé et bloque ses cases."""
+        length = ship.size
+        mask = 0
+        for x, y in ship.positions:
+            mask |= 1 << (y * self.size + x)
+        self.sunk_mask |= mask
+
+        if self.remaining[length] > 0:
+            self.remaining[length] -= 1
+            length_counts = self._length_counts[length]
+            counts = self.counts
+            for index, count in enumerate(length_counts):
+                if count:
+                    counts[index] -= count
+
+        self._block(mask & ~self.blocked_mask)
+
+    def best_cell(self, board: Board) -> Optional[Tuple[int, int]]:
+        """
+        Retourne la case non ciblée la plus probable.
+
+        Returns:
+            Optional[Tuple[int, int]]: Case choisie, ou None si aucun
+            placement n'est compatible avec les observations
+        """
+        self.observe(board)
+        open_hits = self.hit_mask & ~self.sunk_mask
+        if open_hits:
+            index = self._target_cell(open_hits, self.shot_mask)
+        else:
+            index = self._hunt_cell(self.shot_mask)
+        if index is None:
+            return None
+        return index % self.size, index // self.size
+
+    def _hunt_cell(self, shot_mask: int) -> Optional[int]:
+        """Case de densité maximale quand aucune touche n'est en cours."""
+        if self.smoothing:
+            return self._smoothed_hunt_cell(shot_mask)
+        counts = self.counts
+        best = max(counts)
+        if best <= 0:
+            return None
+        index = counts.index(best)
+        if not shot_mask >> index & 1:
+            return index
+        # Sécurité : en chasse, les cases ciblées ont normalement un compte nul
+        best_index = None
+        best = 0
+        for index, count in enumerate(counts):
+            if count > best and not shot_mask >> index & 1:
+                best, best_index = count, index
+        return best_index
+
+    def _smoothed_hunt_cell(self, shot_mask: int) -> Optional[int]:
+        """Variante lissée : ajoute une part de la densité moyenne des voisines."""
+        size = self.size
+        counts = self.counts
+        weight = self.smoothing / 4
+        best_index = None
+        best = 0.0
+        for index, count in enumerate(counts):
+            if count <= 0 or shot_mask >> index & 1:
+                continue
+            x = index % size
+            neighbours = 0
+            if x > 0:
+                neighbours += counts[index - 1]
+            if x < size - 1:
+                neighbours += counts[index + 1]
+            if index >= size:
+                neighbours += counts[index - size]
+            if index + size < len(counts):
+                neighbours += counts[index + size]
+            score = count + weight * neighbours
+            if score > best:
+                best, best_index = score, index
+        return best_index
+
+    def _target_cell(self, open_hits: int, shot_mask: int) -> Optional[int]:
+        """Case la plus probable parmi les placements couvrant une touche."""
+        size = self.size
+        target_weight = self.target_weight
+        scores: Dict[int, int] = {}
+        hits = []
+        pending = open_hits
+        while pending:
+            low = pending & -pending
+            hits.append(low.bit_length() - 1)
+            pending ^= low
+
+        for length, multiplicity in self.remaining.items():
+            if not multiplicity:
+                continue
+            masks, cells, by_cell, _ = placement_index(size, length)
+            alive = self._alive[length]
+            seen = set()
+            for hit in hits:
+                for placement in by_cell[hit]:
+                    if placement in seen or not alive[placement]:
+                        continue
+                    seen.add(placement)
+                    covered = bin(masks[placement] & open_hits).count("1")
+                    weight = multiplicity * target_weight ** covered
+                    for index in cells[placement]:
+                        if not shot_mask >> index & 1:
+                            scores[index] = scores.get(index, 0) + weight
+
+        if not scores:
+            return self._hunt_cell(shot_mask)
+        return max(scores, key=scores.__getitem__)
+
+    def _block(self, mask: int):
+        """Supprime les placements qui traversent les cases de ``mask``."""
+        self.blocked_mask |= mask
+        size = self.size
+        counts = self.counts
+        while mask:
+            low = mask & -mask
+            cell = low.bit_length() - 1
+            mask ^= low
+            for length, alive in self._alive.items():
+                _, cells, by_cell, _ = placement_index(size, length)
+                multiplicity = self.remaining[length]
+                length_counts = self._length_counts[length]
+                for placement in by_cell[cell]:
+                    if not alive[placement]:
+                        continue
+                    alive[placement] = 0
+                    for index in cells[placement]:
+                        length_counts[index] -= 1
+                        counts[index] -= multiplicity
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def _vector_index(size: int, length: int):
+    """
+    Index de placements au format NumPy : cases de chaque placement
+    (placements x longueur) et placements couvrant chaque case (CSR).
+    """
+    import numpy as np
+    placements = placement_index(size, length)
+    cells = np.array(placements.cells, dtype=np.intp)
+    starts = np.zeros(size * size + 1, dtype=np.intp)
+    starts[1:] = np.cumsum([len(ids) for ids in placements.by_cell])
+    by_cell = np.array([placement for ids in placements.by_cell
+                        for placement in ids], dtype=np.intp)
+    return cells, starts, by_cell
+
+
+class VectorDensityTargeting:
+    """
+    Carte de densité tenue dans des tableaux NumPy (import différé).
+
+    Même suivi incrémental et mêmes décisions que ``DensityTargeting`` (à
+    poids entiers près : les sommes de poids non entiers peuvent différer au
+    dernier bit), mais chaque mise à jour et chaque choix de case est une
+    opération vectorisée. Utilisée à partir de ``VECTOR_MIN_SIZE`` cases de
+    côté, où le parcours des comptes en Python domine le coût d'un coup.
+
+    Attributes:
+        size (int): Taille du plateau visé
+        remaining (Counter): Nombre de navires restants par longueur
+        counts (numpy.ndarray): Nombre pondéré de placements vivants par case
+        target_weight (float): Poids d'une touche couverte en mode cible
+        smoothing (float): Part de la densité des voisines ajoutée en chasse
+    """
+
+    def __init__(self, size: int, ships_config: Dict[str, int],
+                 target_weight: float = TARGET_WEIGHT, smoothing: float = 0.0):
+        import numpy as np
+        self.size = size
+        self.target_weight = target_weight
+        self.smoothing = smoothing
+        self.remaining = Counter(ships_config.values())
+        cells = size * size
+        self.counts = np.zeros(cells, dtype=np.int64)
+        self._alive: Dict[int, "np.ndarray"] = {}
+        self._length_counts: Dict[int, "np.ndarray"] = {}
+        for length, multiplicity in self.remaining.items():
+            placement_cells, _, _ = _vector_index(size, length)
+            self._alive[length] = np.ones(len(placement_cells), dtype=bool)
+            length_counts = np.bincount(placement_cells.ravel(), minlength=cells)
+            self._length_counts[length] = length_counts
+            self.counts += multiplicity * length_counts
+        self._shot = np.zeros(cells, dtype=bool)
+        self._hit = np.zeros(cells, dtype=bool)
+        self._sunk = np.zeros(cells, dtype=bool)
+        self._blocked = np.zeros(cells, dtype=bool)
+        self._seen_shots = 0
+
+    def observe(self, board: Board):
+        """Intègre les tirs apparus sur le plateau depuis le dernier appel."""
+        shots = board.shots
+        if self._seen_shots == len(shots):
+            return
+        size = self.size
+        misses = []
+        for x, y in shots[self._seen_shots:]:
+            if not (0 <= x < size and 0 <= y < size):
+                continue
+            index = y * size + x
+            self._shot[index] = True
+            if board.is_hit(x, y):
+                self._hit[index] = True
+            else:
+                misses.append(index)
+        self._seen_shots = len(shots)
+        if misses:
+            self._block(misses)
+
+    def notify_sunk(self, ship: Ship):
+        """Retire un navire coulé et bloque ses cases."""
+        size = self.size
+        indices = [y * size + x for x, y in ship.positions]
+        self._sunk[indices] = True
+        length = ship.size
+        if self.remaining[length] > 0:
+            self.remaining[length] -= 1
+            self.counts -= self._length_counts[length]
+        self._block(indices)
+
+    def best_cell(self, board: Board) -> Optional[Tuple[int, int]]:
+        """Retourne la case non ciblée la plus probable (voir ``DensityTargeting``)."""
+        self.observe(board)
+        open_hits = self._hit & ~self._sunk
+        hits = open_hits.nonzero()[0]
+        if len(hits):
+            index = self._target_cell(open_hits, hits)
+        else:
+            index = self._hunt_cell()
+        if index is None:
+            return None
+        return index % self.size, index // self.size
+
+    def _hunt_cell(self) -> Optional[int]:
+        """Case de densité maximale, la première en cas d'égalité."""
+        import numpy as np
+        counts = self.counts
+        if self.smoothing:
+            size = self.size
+            grid = counts.reshape(size, size)
+            neighbours = np.zeros_like(grid)
+            neighbours[:, 1:] += grid[:, :-1]
+            neighbours[:, :-1] += grid[:, 1:]
+            neighbours[1:, :] += grid[:-1, :]
+            neighbours[:-1, :] += grid[1:, :]
+            scores = counts + self.smoothing / 4 * neighbours.ravel()
+            scores[(counts <= 0) | self._shot] = 0.0
+        else:
+            scores = np.where(self._shot, 0, counts)
+        index = int(scores.argmax())
+        return index if scores[index] > 0 else None
+
+    def _covering(self, length: int, hits):
+        """Placements vivants d'une longueur couvrant au moins une touche."""
+        import numpy as np
+        _, starts, by_cell = _vector_index(self.size, length)
+        ids = np.concatenate([by_cell[starts[hit]:starts[hit + 1]] for hit in hits])
+        ids = np.unique(ids)
+        return ids[self._alive[length][ids]]
+
+    def _target_cell(self, open_hits, hits) -> Optional[int]:
+        """Case la plus probable parmi les placements couvrant une touche."""
+        import numpy as np
+        cells_count = self.size * self.size
+        scores = np.zeros(cells_count)
+        reached = np.zeros(cells_count, dtype=bool)
+        for length, multiplicity in self.remaining.items():
+            if not multiplicity:
+                continue
+            ids = self._covering(length, hits)
+            if not len(ids):
+                continue
+            cells = _vector_index(self.size, length)[0][ids]
+            covered = open_hits[cells].sum(axis=1)
+            weights = multiplicity * self.target_weight ** covered
+            flat = cells.ravel()
+            scores += np.bincount(flat, weights=np.repeat(weights, length),
+                                  minlength=cells_count)
+            reached[flat] = True
+        candidates = reached & ~self._shot
+        if not candidates.any():
+            return self._hunt_cell()
+        best = scores[candidates].max()
+        ties = candidates & (scores == best)
+        tied = ties.nonzero()[0]
+        if len(tied) == 1:
+            return int(tied[0])
+        return self._first_inserted(ties, hits)
+
+    def _first_inserted(self, ties, hits) -> int:
+        """
+        Départage comme ``DensityTargeting`` : la case ex aequo atteinte la
+        première en parcourant longueurs, touches puis placements.
+        """
+        for length, multiplicity in self.remaining.items():
+            if not multiplicity:
+                continue
+            _, cells, by_cell, _ = placement_index(self.size, length)
+            alive = self._alive[length]
+            seen = set()
+            for hit in hits.tolist():
+                for placement in by_cell[hit]:
+                    if placement in seen or not alive[placement]:
+                        continue
+                    seen.add(placement)
+                    for index in cells[placement]:
+                        if ties[index]:
+                            return index
+        return int(ties.nonzero()[0][0])
+
+    def _block(self, indices: List[int]):
+        """Supprime les placements qui traversent les cases ``indices``."""
+        import numpy as np
+        new = [index for index in indices if not self._blocked[index]]
+        if not new:
+            return
+        self._blocked[new] = True
+        cells_count = self.size * self.size
+        for length, alive in self._alive.items():
+            placement_cells, starts, by_cell = _vector_index(self.size, length)
+            if len(new) == 1:
+                ids = by_cell[starts[new[0]]:starts[new[0] + 1]]
+            else:
+                ids = np.unique(np.concatenate(
+                    [by_cell[starts[index]:starts[index + 1]] for index in new]))
+            ids = ids[alive[ids]]
+            if not len(ids):
+                continue
+            alive[ids] = False
+            removed = np.bincount(placement_cells[ids].ravel(),
+                                  minlength=cells_count)
+            self._length_counts[length] -= removed
+            self.counts -= self.remaining[length] * removed
+
+
+def make_density_targeting(size: int, ships_config: Dict[str, int],
+                           target_weight: float = TARGET_WEIGHT,
+                           smoothing: float = 0.0):
+    """
+    Carte de densité adaptée au plateau : vectorisée à partir de
+    ``VECTOR_MIN_SIZE`` si NumPy est disponible, en Python pur sinon.
+    """
+    if size >= VECTOR_MIN_SIZE:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            return VectorDensityTargeting(size, ships_config, target_weight,
+                                          smoothing)
+    return DensityTargeting(size, ships_config, target_weight, smoothing)
+
+
+class LocalDensityTargeting:
+    """
+    Variante de la carte de densité pour les grands plateaux.
+
+    Aucun index global n'est construit : en chasse, l'IA tire au hasard sur
+    les cases de parité compatible avec le plus petit navire restant ; en
+    mode cible, seuls les placements passant par les touches en cours sont
+    énumérés, à partir des tests O(1) du plateau. Le coût d'une décision ne
+    dépend donc pas de la surface du plateau.
+
+    Avec un lissage, la chasse compare quelques cases de parité tirées au
+    hasard : densité locale de la case (placements qui la couvrent sans
+    case ciblée) plus une part de celle de ses voisines.
+
+    Attributes:
+        size (int): Taille du plateau visé
+        remaining (Counter): Nombre de navires restants par longueur
+        open_hits (Set[int]): Touches appartenant à des navires non coulés
+        target_weight (float): Poids d'une touche couverte en mode cible
+        smoothing (float): Part de la densité des voisines ajoutée en chasse
+    """
+
+    # Tirages tentés sur les cases de parité avant un tir aléatoire simple
+    PARITY_TRIES = 64
+
+    # Cases de parité comparées par un tir de chasse lissé
+    SMOOTHED_TRIES = 8
+
+    def __init__(self, size: int, ships_config: Dict[str, int], rng=None,
+                 target_weight: float = TARGET_WEIGHT, smoothing: float = 0.0):
+        self.size = size
+        self.target_weight = target_weight
+        self.smoothing = smoothing
+        self.remaining = Counter(ships_config.values())
+        self.rng = rng if rng is not None else random.Random()
+        self.open_hits: Set[int] = set()
+        self.sunk_cells: Set[int] = set()
+        self._seen_shots = 0
+
+    def observe(self, board: Board):
+        """Intègre les tirs apparus sur le plateau depuis le dernier appel."""
+        shots = board.shots
+        size = self.size
+        for x, y in shots[self._seen_shots:]:
+            if board.is_hit(x, y):
+                index = y * size + x
+                if index not in self.sunk_cells:
+                    self.open_hits.add(index)
+        self._seen_shots = len(shots)
+
+    def notify_sunk(self, ship: Ship):
+        """Retire un navire coulé et libère ses touches."""
+        if self.remaining[ship.size] > 0:
+            self.remaining[ship.size] -= 1
+        for x, y in ship.positions:
+            index = y * self.size + x
+            self.sunk_cells.add(index)
+            self.open_hits.discard(index)
+
+    def best_cell(self, board: Board) -> Optional[Tuple[int, int]]:
+        """Retourne la case non ciblée la plus probable."""
+        self.observe(board)
+        if self.open_hits:
+            target = self._target_cell(board)
+            if target is not None:
+                return target
+        return self._hunt_cell(board)
+
+    def _hunt_cell(self, board: Board) -> Optional[Tuple[int, int]]:
+        """Tir de chasse sur une case de parité compatible."""
+        lengths = [length for length, count in self.remaining.items() if count]
+        if board.shot_count >= board.cells:
+            return None
+        parity = min(lengths) if lengths else 1
+        if self.smoothing:
+            return self._smoothed_hunt_cell(board, parity)
+        size = self.size
+        randrange = self.rng.randrange
+        for _ in range(self.PARITY_TRIES):
+            x, y = randrange(size), randrange(size)
+            if (x + y) % parity == 0 and not board.is_shot(x, y):
+                return x, y
+        return board.random_unshot_cell(self.rng)
+
+    def _smoothed_hunt_cell(self, board: Board, parity: int) -> Tuple[int, int]:
+        """Variante lissée : la meilleure de quelques cases de parité."""
+        size = self.size
+        weight = self.smoothing / 4
+        randrange = self.rng.randrange
+        best_cell = None
+        best = 0.0
+        for _ in range(self.SMOOTHED_TRIES):
+            x, y = randrange(size), randrange(size)
+            if (x + y) % parity or board.is_shot(x, y):
+                continue
+            count = self._local_count(board, x, y)
+            if count <= 0:
+                continue
+            neighbours = 0
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < size and 0 <= ny < size and not board.is_shot(nx, ny):
+                    neighbours += self._local_count(board, nx, ny)
+            score = count + weight * neighbours
+            if score > best:
+                best, best_cell = score, (x, y)
+        return best_cell if best_cell is not None else board.random_unshot_cell(self.rng)
+
+    def _local_count(self, board: Board, x: int, y: int) -> int:
+        """Placements des navires restants couvrant (x, y) sans case ciblée."""
+        size = self.size
+        is_shot = board.is_shot
+        total = 0
+        for length, multiplicity in self.remaining.items():
+            if not multiplicity:
+                continue
+            for horizontal in ((True,) if length == 1 else (True, False)):
+                coordinate = x if horizontal else y
+                for first in range(max(0, coordinate - length + 1),
+                                   min(coordinate, size - length) + 1):
+                    for i in range(length):
+                        if (is_shot(first + i, y) if horizontal
+                                else is_shot(x, first + i)):
+                            break
+                    else:
+                        total += multiplicity
+        return total
+
+    def _target_cell(self, board: Board) -> Optional[Tuple[int, int]]:
+        """Case la plus probable parmi les placements couvrant une touche."""
+        size = self.size
+        open_hits = self.open_hits
+        sunk_cells = self.sunk_cells
+        scores: Dict[int, float] = {}
+        seen = set()
+
+        for hit in open_hits:
+            hit_x, hit_y = hit % size, hit // size
+            for length, multiplicity in self.remaining.items():
+                if not multiplicity:
+                    continue
+                for horizontal in ((True,) if length == 1 else (True, False)):
+                    step = 1 if horizontal else size
+                    coordinate = hit_x if horizontal else hit_y
+                    for offset in range(length):
+                        first = coordinate - offset
+                        if first < 0 or first + length > size:
+                            continue
+                        start = hit - offset * step
+                        key = (length, horizontal, start)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+
+                        indices = range(start, start + length * step, step)
+                        covered = 0
+                        for index in indices:
+                            if index in open_hits:
+                                covered += 1
+                            elif (index in sunk_cells
+                                  or board.is_shot(index % size, index // size)):
+                                break
+                        else:
+                            weight = multiplicity * self.target_weight ** covered
+                            for index in indices:
+                                if index not in open_hits:
+                                    scores[index] = scores.get(index, 0) + weight
+
+        if not scores:
+            return None
+        index = max(scores, key=scores.__getitem__)
+        return index % size, index // size
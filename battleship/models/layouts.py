@@ -0,0 +1,185 @@
+"""
+Placement de flottes choisies contre un tireur donné.
+
+Une réserve (« pool ») regroupe des dispositions de flotte précalculées pour
+résister le plus longtemps possible à une stratégie de ``ComputerAI`` ; elle
+est produite par ``python -m battleship.layout_generator`` à partir de
+statistiques de tir par case, elles aussi conservées dans le fichier. Au
+début d'une partie, le placement tire une disposition de la réserve : coût
+constant, quelle que soit la recherche qui l'a produite.
+
+Fichier des réserves (JSON) :
+
+    {"version": 1,
+     "pools": {"hard:10:5,4,3,3,2,2": {"layouts": [[[x, y, horizontal], ...], ...],
+                                       "shot_turns": [...], "mean_shots": 61.2,
+                                       "random_mean_shots": 57.9, ...}}}
+
+Chaque disposition donne l'origine de chaque navire dans l'ordre de la
+configuration de la flotte ; ``shot_turns`` est le tour moyen auquel le
+tireur vise chaque case d'une flotte aléatoire et ``random_mean_shots`` le
+nombre moyen de tirs dont il a besoin contre ces flottes.
+"""
+
+import os
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .board import Board
+from .placement import place_random_fleet
+from .ship import Ship
+
+# Fichier des réserves fourni avec le jeu
+DEFAULT_LAYOUTS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                    "data", "layouts.json")
+
+LAYOUTS_VERSION = 1
+
+# Placement uniforme, sans réserve
+RANDOM_PLACEMENT = "random"
+
+Layout = Tuple[Tuple[int, int, bool], ...]
+
+# Signature commune des fonctions de placement (celle de ``place_random_fleet``)
+Placer = Callable[[Board, Dict[str, int], random.Random], List[Ship]]
+
+_pools_cache: Dict[str, Dict[str, dict]] = {}
+
+
+def pool_key(shooter: str, size: int, ships_config: Dict[str, int]) -> str:
+    """Clé d'une réserve : tireur, taille et longueurs dans l'ordre de la flotte."""
+    lengths = ",".join(str(length) for length in ships_config.values())
+    return f"{shooter}:{size}:{lengths}"
+
+
+def apply_layout(board: Board, ships_config: Dict[str, int],
+                 layout: Layout) -> List[Ship]:
+    """
+    Place une flotte selon une disposition.
+
+    Raises:
+        ValueError: Si la disposition ne convient pas au plateau ou à la flotte
+    """
+    if len(layout) != len(ships_config):
+        raise ValueError("La disposition ne correspond pas à la flotte")
+    ships = []
+    for (name, length), (x, y, horizontal) in zip(ships_config.items(), layout):
+        ship = Ship(name, length)
+        if not board.place_ship(ship, x, y, horizontal):
+            raise ValueError(f"Disposition invalide pour {name} en ({x}, {y})")
+        ships.append(ship)
+    return ships
+
+
+class LayoutPool:
+    """
+    Dispositions précalculées contre un tireur.
+
+    Attributes:
+        layouts (Tuple[Layout, ...]): Dispositions, de la plus résistante à
+            la moins résistante
+    """
+
+    def __init__(self, layouts: Sequence[Layout]):
+        if not layouts:
+            raise ValueError("Réserve de dispositions vide")
+        self.layouts = tuple(tuple(tuple(origin) for origin in layout)
+                             for layout in layouts)
+
+    def choose(self, rng=random) -> Layout:
+        """Tire une disposition uniformément."""
+        return self.layouts[rng.randrange(len(self.layouts))]
+
+    def place(self, board: Board, ships_config: Dict[str, int],
+              rng=random) -> List[Ship]:
+        """Place une disposition tirée au hasard (même signature que
+        ``place_random_fleet``)."""
+        return apply_layout(board, ships_config, self.choose(rng))
+
+
+def read_pools(path: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Lit un fichier de réserves (mis en cache par chemin).
+
+    Raises:
+        ValueError: Si le fichier n'est pas un fichier de réserves valide
+    """
+    path = path or DEFAULT_LAYOUTS_PATH
+    if path not in _pools_cache:
+        if not os.path.exists(path):
+            return {}
+        import json
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != LAYOUTS_VERSION:
+            raise ValueError(f"{path} : version de réserves non prise en charge")
+        _pools_cache[path] = data["pools"]
+    return _pools_cache[path]
+
+
+def load_pool(shooter: str, size: int, ships_config: Dict[str, int],
+              path: Optional[str] = None) -> Optional[LayoutPool]:
+    """Réserve enregistrée pour ce tireur et cette configuration, s'il y en a une."""
+    entry = read_pools(path).get(pool_key(shooter, size, ships_config))
+    return LayoutPool(entry["layouts"]) if entry else None
+
+
+def load_stats(shooter: str, size: int, ships_config: Dict[str, int],
+               path: Optional[str] = None) -> Optional[Tuple[List[float], float]]:
+    """
+    Statistiques enregistrées avec une réserve : tour moyen de tir par case
+    et tirs moyens contre des flottes aléatoires.
+    """
+    entry = read_pools(path).get(pool_key(shooter, size, ships_config))
+    if not entry or "shot_turns" not in entry:
+        return None
+    return entry["shot_turns"], entry["random_mean_shots"]
+
+
+def save_pool(shooter: str, size: int, ships_config: Dict[str, int],
+              layouts: Sequence[Layout], shot_turns: Sequence[float],
+              random_mean_shots: float, path: Optional[str] = None, **metrics):
+    """Ajoute ou remplace une réserve ; les autres réserves sont conservées."""
+    import json
+    path = path or DEFAULT_LAYOUTS_PATH
+    _pools_cache.pop(path, None)
+    pools = dict(read_pools(path))
+    pools[pool_key(shooter, size, ships_config)] = {
+        "layouts": [[list(origin) for origin in layout] for layout in layouts],
+        "shot_turns": [round(turn, 3) for turn in shot_turns],
+        "random_mean_shots": round(random_mean_shots, 3),
+        **metrics,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"version": LAYOUTS_VERSION, "pools": pools}, file,
+                  ensure_ascii=False, sort_keys=True)
+        file.write("\n")
+    _pools_cache.pop(path, None)
+
+
+def fleet_placer(placement: str, size: int, ships_config: Dict[str, int],
+                 path: Optional[str] = None) -> Placer:
+    """
+    Fonction de placement d'une flotte.
+
+    Args:
+        placement (str): ``"random"`` pour un placement uniforme, sinon le
+            nom du tireur (difficulté ou profil) auquel la flotte doit résister
+        size (int): Taille du plateau
+        ships_config (Dict[str, int]): Flotte placée
+        path (Optional[str]): Fichier des réserves
+
+    Raises:
+        ValueError: Si aucune réserve n'existe pour ce tireur et cette
+            configuration
+    """
+    if placement == RANDOM_PLACEMENT:
+        return place_random_fleet
+    pool = load_pool(placement, size, ships_config, path)
+    if pool is None:
+        raise ValueError(f"Aucune réserve de flottes contre '{placement}' pour "
+                         f"ce plateau et cette flotte "
+                         f"(python -m battleship.layout_generator --ai {placement})")
+    return pool.place
@@ -0,0 +1,134 @@
+"""
+Livre d'ouvertures de l'IA 'density'.
+
+La stratégie 'density' est déterministe : sa décision ne dépend que de l'état
+observé du plateau visé, résumé par son empreinte de Zobrist
+(``Board.zobrist``). Le livre enregistre, par (taille, flotte, empreinte),
+les décisions des premiers tirs ; il est généré hors ligne (``python -m
+battleship.book_generator``) et chargé à la première consultation. Les
+décisions calculées en cours de partie sont conservées par la table de
+transposition (voir ``transposition``).
+
+Format du livre (petit-boutiste) : MAGIC, VERSION (1 octet), puis des
+sections ``taille (u16), nombre de navires (u16), longueurs (u16 chacune),
+nombre d'entrées (u32), empreintes (u64 chacune), cases (u16 chacune)``.
+La version 2 indexe les positions par l'empreinte de Zobrist du plateau.
+"""
+
+import os
+import struct
+import threading
+from array import array
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+MAGIC = b"BSOB"
+VERSION = 2
+
+# Livre fourni avec le jeu
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                 "data", "opening_book.bin")
+
+FleetKey = Tuple[int, ...]
+
+
+def fleet_key(lengths: Iterable[int]) -> FleetKey:
+    """
+    Signature d'une flotte.
+
+    Les noms n'influent pas sur les décisions, mais l'ordre des longueurs
+    départage les cases de même score : il est conservé.
+    """
+    return tuple(lengths)
+
+
+class OpeningBook:
+    """
+    Décisions précalculées par (taille, flotte, empreinte).
+
+    Le fichier n'est lu qu'à la première consultation.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._sections: Optional[Dict[Tuple[int, FleetKey], Dict[int, int]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def sections(self) -> Dict[Tuple[int, FleetKey], Dict[int, int]]:
+        if self._sections is None:
+            with self._lock:
+                if self._sections is None:
+                    self._sections = self._load() if self.path else {}
+        return self._sections
+
+    def lookup(self, size: int, fleet: FleetKey, key: int) -> Optional[int]:
+        """Case (``y * size + x``) enregistrée pour une position, ou None."""
+        section = self.sections.get((size, fleet))
+        return None if section is None else section.get(key)
+
+    def add(self, size: int, fleet: FleetKey, key: int, cell: int):
+        """Enregistre une décision."""
+        self.sections.setdefault((size, fleet), {})[key] = cell
+
+    def __len__(self) -> int:
+        return sum(len(section) for section in self.sections.values())
+
+    def save(self, path: str):
+        """Écrit le livre au format binaire."""
+        with open(path, "wb") as file:
+            file.write(MAGIC + bytes((VERSION,)))
+            for (size, fleet), section in sorted(self.sections.items()):
+                file.write(struct.pack(f"<HH{len(fleet)}HI", size, len(fleet),
+                                       *fleet, len(section)))
+                file.write(array("Q", section.keys()).tobytes())
+                file.write(array("H", section.values()).tobytes())
+
+    def _load(self) -> Dict[Tuple[int, FleetKey], Dict[int, int]]:
+        """
+        Lit le fichier du livre.
+
+        Raises:
+            ValueError: Si le fichier n'est pas un livre de cette version
+        """
+        with open(self.path, "rb") as file:
+            header = file.read(len(MAGIC) + 1)
+            if header != MAGIC + bytes((VERSION,)):
+                raise ValueError(f"{self.path} n'est pas un livre d'ouvertures "
+                                 f"(version {VERSION})")
+            sections = {}
+            while True:
+                head = file.read(4)
+                if not head:
+                    return sections
+                size, ships = struct.unpack("<HH", head)
+                fleet = struct.unpack(f"<{ships}H", _read(file, 2 * ships))
+                count, = struct.unpack("<I", _read(file, 4))
+                keys, cells = array("Q"), array("H")
+                keys.frombytes(_read(file, 8 * count))
+                cells.frombytes(_read(file, 2 * count))
+                sections[(size, fleet)] = dict(zip(keys, cells))
+
+
+def _read(file: BinaryIO, length: int) -> bytes:
+    data = file.read(length)
+    if len(data) != length:
+        raise ValueError("Livre d'ouvertures tronqué")
+    return data
+
+
+_default_book: Optional[OpeningBook] = None
+
+
+def default_book() -> OpeningBook:
+    """Livre fourni avec le jeu (vide si le fichier est absent)."""
+    global _default_book
+    if _default_book is None:
+        path = DEFAULT_BOOK_PATH if os.path.exists(DEFAULT_BOOK_PATH) else None
+        _default_book = OpeningBook(path)
+    return _default_book
+
+
+def set_default_book(book: Optional[OpeningBook]):
+    """Remplace le livre consulté par les IA (None : livre fourni)."""
+    global _default_book
+    _default_book = book
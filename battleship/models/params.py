@@ -0,0 +1,148 @@
+"""
+Paramètres numériques des stratégies et profils nommés.
+
+Un profil associe un nom à une difficulté de base et à des paramètres ; il
+est produit par la recherche de paramètres (``python -m battleship.tuning``)
+et chargé par ``ComputerAI`` lorsque sa difficulté n'est pas une stratégie
+de base.
+
+Fichier des profils (JSON) :
+
+    {"version": 1,
+     "profiles": {"nom": {"difficulty": "hard", "params": {...},
+                          "mean_shots": 52.3, "games": 8000, ...}}}
+"""
+
+import os
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Stratégies de base de ComputerAI
+DIFFICULTIES = ("easy", "hard", "density", "solver")
+
+# Fichier des profils fourni avec le jeu
+DEFAULT_PROFILES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                     "data", "profiles.json")
+
+PROFILES_VERSION = 1
+
+
+class StrategyParams(NamedTuple):
+    """
+    Réglages des stratégies ; les valeurs par défaut redonnent le
+    comportement d'origine.
+
+    Attributes:
+        parity (int): 1 pour chasser sur un damier dont le pas est la plus
+            petite longueur de navire restante ('easy', 'hard'), 0 sinon
+        space_weight (float): Poids de l'espace libre dans l'ordre des cases
+            essayées autour d'une touche ('hard') ; 0 garde l'ordre fixe
+        target_weight (float): Poids d'une touche couverte par un placement
+            en mode cible ('density')
+        smoothing (float): Part de la densité des cases voisines ajoutée à
+            celle d'une case en chasse ('density')
+    """
+    parity: int = 0
+    space_weight: float = 0.0
+    target_weight: float = 16.0
+    smoothing: float = 0.0
+
+
+DEFAULT_PARAMS = StrategyParams()
+
+# Paramètres influents par difficulté
+TUNABLE = {
+    "easy": ("parity",),
+    "hard": ("parity", "space_weight"),
+    "density": ("target_weight", "smoothing"),
+    "solver": (),
+}
+
+# Bornes de la recherche : (minimum, maximum, échelle logarithmique)
+SEARCH_SPACE = {
+    "parity": (0, 1, False),
+    "space_weight": (0.0, 4.0, False),
+    "target_weight": (2.0, 64.0, True),
+    "smoothing": (0.0, 0.5, False),
+}
+
+_profiles_cache: Dict[str, Dict[str, dict]] = {}
+
+
+def params_from_dict(values: Dict[str, float]) -> StrategyParams:
+    """
+    Construit des paramètres à partir d'un dictionnaire (clés manquantes :
+    valeurs par défaut).
+
+    Raises:
+        ValueError: Si une clé est inconnue
+    """
+    unknown = set(values) - set(StrategyParams._fields)
+    if unknown:
+        raise ValueError(f"Paramètres inconnus : {', '.join(sorted(unknown))}")
+    return DEFAULT_PARAMS._replace(**{
+        name: type(getattr(DEFAULT_PARAMS, name))(value)
+        for name, value in values.items()
+    })
+
+
+def read_profiles(path: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Lit un fichier de profils (mis en cache par chemin).
+
+    Raises:
+        ValueError: Si le fichier n'est pas un fichier de profils valide
+    """
+    path = path or DEFAULT_PROFILES_PATH
+    if path not in _profiles_cache:
+        if not os.path.exists(path):
+            return {}
+        import json
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != PROFILES_VERSION:
+            raise ValueError(f"{path} : version de profils non prise en charge")
+        _profiles_cache[path] = data["profiles"]
+    return _profiles_cache[path]
+
+
+def load_profile(name: str, path: Optional[str] = None) -> Tuple[str, StrategyParams]:
+    """
+    Retourne la difficulté de base et les paramètres d'un profil.
+
+    Raises:
+        ValueError: Si le profil n'existe pas
+    """
+    profile = read_profiles(path).get(name)
+    if profile is None or profile.get("difficulty") not in DIFFICULTIES:
+        raise ValueError(f"Difficulté ou profil inconnu : {name}")
+    return profile["difficulty"], params_from_dict(profile.get("params", {}))
+
+
+def is_known_difficulty(name: str, path: Optional[str] = None) -> bool:
+    """Vrai pour une stratégie de base ou un profil existant."""
+    if name in DIFFICULTIES:
+        return True
+    try:
+        load_profile(name, path)
+    except ValueError:
+        return False
+    return True
+
+
+def save_profile(name: str, difficulty: str, params: StrategyParams,
+                 path: Optional[str] = None, **metrics):
+    """Ajoute ou remplace un profil ; les autres profils sont conservés."""
+    import json
+    path = path or DEFAULT_PROFILES_PATH
+    _profiles_cache.pop(path, None)
+    profiles = dict(read_profiles(path))
+    profiles[name] = {"difficulty": difficulty, "params": params._asdict(),
+                      **metrics}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"version": PROFILES_VERSION, "profiles": profiles}, file,
+                  indent=2, ensure_ascii=False, sort_keys=True)
+        file.write("\n")
+    _profiles_cache.pop(path, None)
@@ -0,0 +1,171 @@
+"""
+Module de placement des navires.
+
+L'index de placements énumère une fois pour toutes, pour chaque couple
+(taille de plateau, longueur de navire), tous les segments légaux sous forme
+de masques binaires. Il est partagé par le placement aléatoire des flottes et
+par les stratégies de l'IA.
+"""
+
+import random
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+from .board import Board
+from .ship import Ship
+
+# Au-delà de ce nombre de cases, l'index n'est plus construit : les placements
+# sont tirés directement sur le plateau (flottes clairsemées des grands plateaux)
+INDEX_MAX_CELLS = 64 * 64
+
+# Index gardés en cache (couples taille, longueur) ; les plus anciens sont
+# reconstruits à la demande
+INDEX_CACHE_SIZE = 16
+
+# Tirages directs tentés avant de filtrer tous les placements compatibles
+_QUICK_TRIES = 8
+
+
+def uses_index(size: int) -> bool:
+    """Indique si l'index de placements est utilisé pour cette taille."""
+    return size * size <= INDEX_MAX_CELLS
+
+
+class PlacementIndex(NamedTuple):
+    """
+    Placements légaux d'un navire sur un plateau vide.
+
+    Attributes:
+        masks (Tuple[int, ...]): Masque binaire de chaque placement
+        cells (Tuple[Tuple[int, ...], ...]): Indices des cases de chaque placement
+        by_cell (Tuple[Tuple[int, ...], ...]): Placements couvrant chaque case
+        origins (Tuple[Tuple[int, int, bool], ...]): (x, y, horizontal) de chaque placement
+    """
+    masks: Tuple[int, ...]
+    cells: Tuple[Tuple[int, ...], ...]
+    by_cell: Tuple[Tuple[int, ...], ...]
+    origins: Tuple[Tuple[int, int, bool], ...]
+
+
+def placement_count(size: int, length: int) -> int:
+    """Nombre de placements d'un navire de ``length`` cases (taille de l'index)."""
+    if length > size:
+        return 0
+    if length == 1:
+        return size * size
+    return 2 * size * (size - length + 1)
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def placement_index(size: int, length: int) -> PlacementIndex:
+    """
+    Énumère tous les placements d'un navire de ``length`` cases.
+
+    Le résultat est mis en cache au niveau du module (``INDEX_CACHE_SIZE``
+    index au plus).
+    """
+    masks = []
+    cells = []
+    origins = []
+    by_cell: List[List[int]] = [[] for _ in range(size * size)]
+    orientations = (True,) if length == 1 else (True, False)
+    for horizontal in orientations:
+        step = 1 if horizontal else size
+        for y in range(size - (0 if horizontal else length - 1)):
+            for x in range(size - (length - 1 if horizontal else 0)):
+                start = y * size + x
+                indices = tuple(start + i * step for i in range(length))
+                mask = 0
+                for index in indices:
+                    mask |= 1 << index
+                    by_cell[index].append(len(masks))
+                masks.append(mask)
+                cells.append(indices)
+                origins.append((x, y, horizontal))
+    return PlacementIndex(tuple(masks), tuple(cells),
+                          tuple(tuple(ids) for ids in by_cell), tuple(origins))
+
+
+def pick_placement(size: int, length: int, occupied: int, rng=random) -> int:
+    """
+    Choisit uniformément un placement qui ne chevauche pas ``occupied``.
+
+    Returns:
+        int: Indice du placement dans ``placement_index(size, length)``,
+        ou -1 si aucun placement n'est possible
+    """
+    masks = placement_index(size, length).masks
+    if not masks:
+        return -1
+    for _ in range(_QUICK_TRIES):
+        placement = rng.randrange(len(masks))
+        if not masks[placement] & occupied:
+            return placement
+    candidates = [placement for placement, mask in enumerate(masks)
+                  if not mask & occupied]
+    return rng.choice(candidates) if candidates else -1
+
+
+def place_random_fleet(board: Board, ships_config: Dict[str, int],
+                       rng=random, max_attempts: int = 100) -> List[Ship]:
+    """
+    Place aléatoirement une flotte complète sur un plateau.
+
+    Les navires sont tirés du plus long au plus court parmi les placements
+    libres de l'index ; en cas d'impasse, la flotte est retirée entièrement,
+    au plus ``max_attempts`` fois.
+
+    Args:
+        board (Board): Plateau à remplir
+        ships_config (Dict[str, int]): Nom et taille de chaque navire
+        rng: Générateur aléatoire (module ``random`` par défaut)
+        max_attempts (int): Nombre maximal de tirages de la flotte
+
+    Returns:
+        List[Ship]: Navires placés, dans l'ordre de la configuration
+
+    Raises:
+        ValueError: Si la flotte ne tient pas sur le plateau
+    """
+    size = board.size
+    if not uses_index(size):
+        return _place_fleet_directly(board, ships_config, rng, max_attempts)
+
+    order = sorted(ships_config.items(), key=lambda item: -item[1])
+    placed = board.ship_mask
+    for _ in range(max_attempts):
+        occupied = placed
+        chosen = {}
+        for name, length in order:
+            placement = pick_placement(size, length, occupied, rng)
+            if placement < 0:
+                break
+            occupied |= placement_index(size, length).masks[placement]
+            chosen[name] = placement_index(size, length).origins[placement]
+        else:
+            ships = []
+            for name, length in ships_config.items():
+                ship = Ship(name, length)
+                x, y, horizontal = chosen[name]
+                board.place_ship(ship, x, y, horizontal)
+                ships.append(ship)
+            return ships
+
+    raise ValueError("Impossible de placer la flotte sur le plateau")
+
+
+def _place_fleet_directly(board: Board, ships_config: Dict[str, int],
+                          rng, max_attempts: int) -> List[Ship]:
+    """Placement par tirages directs, sans index (grands plateaux)."""
+    size = board.size
+    tries = max_attempts * size
+    ships = []
+    for name, length in ships_config.items():
+        ship = Ship(name, length)
+        for _ in range(tries):
+            if board.place_ship(ship, rng.randrange(size), rng.randrange(size),
+                                rng.random() < 0.5):
+                break
+        else:
+            raise ValueError("Impossible de placer la flotte sur le plateau")
+        ships.append(ship)
+    return ships
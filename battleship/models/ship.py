@@ -1,27 +1,82 @@
-﻿"""
+"""
 Module représentant un navire dans le jeu.
+
+Un navire placé est décrit par son origine, sa longueur et son orientation ;
+les touches sont un masque de bits (bit ``i`` pour la ``i``-ème case depuis
+l'origine) accompagné d'un compteur, ce qui rend ``hit`` et ``is_sunk`` O(1).
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 class Ship:
+    """
+    Navire de la flotte.
+
+    Attributes:
+        name (str): Nom du navire
+        size (int): Longueur en cases
+        x (Optional[int]): Colonne de l'origine (None tant que non placé)
+        y (Optional[int]): Ligne de l'origine (None tant que non placé)
+        horizontal (bool): Orientation
+        hit_mask (int): Cases touchées, bit ``i`` pour la ``i``-ème case
+        hit_count (int): Nombre de cases touchées
+    """
+
+    __slots__ = ("name", "size", "x", "y", "horizontal", "hit_mask", "hit_count")
+
     def __init__(self, name: str, size: int):
         self.name = name
         self.size = size
-        self.positions: List[Tuple[int, int]] = []
-        self.hits: List[Tuple[int, int]] = []
-    
-    def add_position(self, x: int, y: int):
-        """Ajoute une position au navire"""
-        self.positions.append((x, y))
-    
+        self.x: Optional[int] = None
+        self.y: Optional[int] = None
+        self.horizontal = True
+        self.hit_mask = 0
+        self.hit_count = 0
+
+    def place(self, x: int, y: int, horizontal: bool):
+        """Fixe l'origine et l'orientation du navire"""
+        self.x = x
+        self.y = y
+        self.horizontal = horizontal
+
+    @property
+    def positions(self) -> List[Tuple[int, int]]:
+        """Cases occupées, depuis l'origine (vide si non placé)"""
+        if self.x is None:
+            return []
+        x, y = self.x, self.y
+        if self.horizontal:
+            return [(x + i, y) for i in range(self.size)]
+        return [(x, y + i) for i in range(self.size)]
+
+    @property
+    def hits(self) -> List[Tuple[int, int]]:
+        """Cases touchées, depuis l'origine"""
+        mask = self.hit_mask
+        return [pos for i, pos in enumerate(self.positions) if mask >> i & 1]
+
+    def _offset(self, x: int, y: int) -> int:
+        """Rang de la case (x, y) dans le navire, -1 si hors du navire"""
+        if self.x is None:
+            return -1
+        if self.horizontal:
+            offset = x - self.x if y == self.y else -1
+        else:
+            offset = y - self.y if x == self.x else -1
+        return offset if 0 <= offset < self.size else -1
+
     def hit(self, x: int, y: int) -> bool:
         """Enregistre un tir sur le navire"""
-        if (x, y) in self.positions and (x, y) not in self.hits:
-            self.hits.append((x, y))
-            return True
-        return False
-    
+        offset = self._offset(x, y)
+        if offset < 0:
+            return False
+        bit = 1 << offset
+        if self.hit_mask & bit:
+            return False
+        self.hit_mask |= bit
+        self.hit_count += 1
+        return True
+
     def is_sunk(self) -> bool:
         """Vérifie si le navire est coulé"""
-        return len(self.hits) == self.size
+        return self.hit_count == self.size
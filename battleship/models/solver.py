@@ -0,0 +1,276 @@
+"""
+Solveur Monte Carlo / énumération exacte pour le ciblage.
+
+Le solveur tire des flottes complètes compatibles avec les observations
+(tirs manqués, touches en cours, navires coulés) et vise la case la plus
+souvent occupée. Les tirages se font directement parmi les placements encore
+vivants de l'index partagé : aucun tirage n'est rejeté à cause d'un tir
+manqué. Quand il reste peu de placements, les flottes sont énumérées
+exactement et le résultat est mémorisé par état du plateau.
+"""
+
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from .board import Board
+from .density import DensityTargeting
+from .placement import placement_index
+
+# Nombre de flottes tirées par coup (si aucun budget de temps n'est donné)
+DEFAULT_SAMPLES = 2000
+
+# Nombre maximal de flottes (majorant) pour basculer en énumération exacte
+EXACT_LIMIT = 20000
+
+# Essais de tirage d'un navire avant d'abandonner la flotte en cours
+_DRAW_TRIES = 16
+
+
+@lru_cache(maxsize=4096)
+def exact_occupancy(size: int, lengths: Tuple[int, ...], blocked_mask: int,
+                    open_hits: int) -> Tuple[int, Tuple[int, ...]]:
+    """
+    Énumère toutes les flottes compatibles avec un état du plateau.
+
+    Les navires de même longueur sont interchangeables : chaque flotte n'est
+    comptée qu'une fois. Le résultat est mémorisé par état.
+
+    Args:
+        size (int): Taille du plateau
+        lengths (Tuple[int, ...]): Longueurs des navires restants (décroissantes)
+        blocked_mask (int): Cases interdites (manqués et navires coulés)
+        open_hits (int): Touches qui doivent être couvertes
+
+    Returns:
+        Tuple[int, Tuple[int, ...]]: Nombre de flottes et occupation par case
+    """
+    indexes = {length: placement_index(size, length) for length in set(lengths)}
+    candidates = {
+        length: [placement for placement, mask in enumerate(index.masks)
+                 if not mask & blocked_mask]
+        for length, index in indexes.items()
+    }
+    placement_counts = {length: [0] * len(index.masks)
+                        for length, index in indexes.items()}
+    cells_left = [sum(lengths[i:]) for i in range(len(lengths) + 1)]
+    picks: List[Tuple[int, int]] = []
+    total = 0
+
+    def explore(depth: int, occupied: int, uncovered: int, first: int):
+        nonlocal total
+        if depth == len(lengths):
+            if not uncovered:
+                total += 1
+                for length, placement in picks:
+                    placement_counts[length][placement] += 1
+            return
+        if bin(uncovered).count("1") > cells_left[depth]:
+            return
+
+        length = lengths[depth]
+        masks = indexes[length].masks
+        options = candidates[length]
+        start = first if depth and lengths[depth - 1] == length else 0
+        for position in range(start, len(options)):
+            placement = options[position]
+            mask = masks[placement]
+            if mask & occupied:
+                continue
+            picks.append((length, placement))
+            explore(depth + 1, occupied | mask, uncovered & ~mask, position + 1)
+            picks.pop()
+
+    explore(0, 0, open_hits, 0)
+
+    counts = [0] * (size * size)
+    for length, per_placement in placement_counts.items():
+        cells = indexes[length].cells
+        for placement, count in enumerate(per_placement):
+            if count:
+                for index in cells[placement]:
+                    counts[index] += count
+    return total, tuple(counts)
+
+
+class MonteCarloTargeting(DensityTargeting):
+    """
+    Ciblage par échantillonnage de flottes complètes.
+
+    Reprend le suivi incrémental de ``DensityTargeting`` (placements vivants,
+    navires restants, cases bloquées) et remplace le choix de la case.
+
+    Attributes:
+        samples (int): Nombre de flottes tirées par coup
+        time_budget (Optional[float]): Durée maximale d'un coup en secondes
+        exact_limit (int): Seuil de bascule vers l'énumération exacte
+        last_samples (int): Flottes valides tirées au dernier coup
+        last_exact (bool): Vrai si le dernier coup a été énuméré exactement
+        cancel (Optional[threading.Event]): Interrompt le tirage en cours
+            lorsqu'il est levé (coup abandonné)
+    """
+
+    def __init__(self, size: int, ships_config: Dict[str, int],
+                 rng: Optional[random.Random] = None,
+                 samples: int = DEFAULT_SAMPLES,
+                 time_budget: Optional[float] = None,
+                 exact_limit: int = EXACT_LIMIT):
+        super().__init__(size, ships_config)
+        self.rng = rng if rng is not None else random.Random()
+        self.samples = samples
+        self.time_budget = time_budget
+        self.exact_limit = exact_limit
+        self.last_samples = 0
+        self.last_exact = False
+        self.cancel: Optional[threading.Event] = None
+
+    def best_cell(self, board: Board) -> Optional[Tuple[int, int]]:
+        """Retourne la case la plus souvent occupée par les flottes compatibles."""
+        self.observe(board)
+        counts = self.occupancy()
+        if counts is None:
+            return None
+
+        shot_mask = self.shot_mask
+        best_index = None
+        best = 0
+        for index, count in enumerate(counts):
+            if count > best and not shot_mask >> index & 1:
+                best, best_index = count, index
+        if best_index is None:
+            return None
+        return best_index % self.size, best_index // self.size
+
+    def occupancy(self) -> Optional[List[int]]:
+        """
+        Estime l'occupation de chaque case par les flottes compatibles.
+
+        Returns:
+            Optional[List[int]]: Occupation par case, ou None si aucune flotte
+            compatible n'a été trouvée
+        """
+        lengths = tuple(sorted(self.remaining.elements(), reverse=True))
+        if not lengths:
+            return None
+        open_hits = self.hit_mask & ~self.sunk_mask
+
+        estimate = 1
+        for length in lengths:
+            estimate *= max(1, sum(self._alive[length]))
+            if estimate > self.exact_limit:
+                break
+        if estimate <= self.exact_limit:
+            self.last_exact = True
+            total, counts = exact_occupancy(self.size, lengths,
+                                            self.blocked_mask, open_hits)
+            self.last_samples = total
+            return list(counts) if total else None
+
+        self.last_exact = False
+        return self._sample_occupancy(lengths, open_hits)
+
+    def _sample_occupancy(self, lengths: Tuple[int, ...],
+                          open_hits: int) -> Optional[List[int]]:
+        """Tire des flottes compatibles et compte l'occupation des cases."""
+        size = self.size
+        indexes = {length: placement_index(size, length) for length in set(lengths)}
+        candidates = {
+            length: [placement for placement, flag in enumerate(self._alive[length])
+                     if flag]
+            for length in indexes
+        }
+        placement_counts = {length: [0] * len(indexes[length].masks)
+                            for length in indexes}
+
+        # Placements vivants couvrant chaque touche en cours
+        covering: Dict[int, List[Tuple[int, int]]] = {}
+        pending = open_hits
+        while pending:
+            low = pending & -pending
+            hit = low.bit_length() - 1
+            pending ^= low
+            covering[hit] = [
+                (length, placement)
+                for length in indexes
+                for placement in indexes[length].by_cell[hit]
+                if self._alive[length][placement]
+            ]
+
+        masks = {length: index.masks for length, index in indexes.items()}
+        random_value = self.rng.random
+        deadline = (time.perf_counter() + self.time_budget
+                    if self.time_budget is not None else None)
+        limit = self.samples if deadline is None else float("inf")
+        cancel = self.cancel
+        drawn = 0
+        attempts = 0
+
+        while drawn < limit:
+            attempts += 1
+            if cancel is not None and not attempts & 63 and cancel.is_set():
+                break
+            if deadline is not None:
+                if not attempts & 63 and time.perf_counter() >= deadline:
+                    break
+            elif attempts > 20 * self.samples:
+                break
+
+            occupied = 0
+            pool = list(lengths)
+            picks = []
+            uncovered = open_hits
+            valid = True
+
+            # Couvre d'abord chaque touche en cours par un navire restant
+            while uncovered and valid:
+                hit = (uncovered & -uncovered).bit_length() - 1
+                options = covering[hit]
+                valid = False
+                for _ in range(_DRAW_TRIES if options else 0):
+                    length, placement = options[int(random_value() * len(options))]
+                    mask = masks[length][placement]
+                    if length in pool and not mask & occupied:
+                        valid = True
+                        break
+                if valid:
+                    pool.remove(length)
+                    occupied |= mask
+                    uncovered &= ~mask
+                    picks.append((length, placement))
+
+            # Place ensuite librement les navires restants
+            for length in pool:
+                if not valid:
+                    break
+                options = candidates[length]
+                length_masks = masks[length]
+                valid = False
+                for _ in range(_DRAW_TRIES if options else 0):
+                    placement = options[int(random_value() * len(options))]
+                    mask = length_masks[placement]
+                    if not mask & occupied:
+                        valid = True
+                        break
+                if valid:
+                    occupied |= mask
+                    picks.append((length, placement))
+            if not valid:
+                continue
+
+            for length, placement in picks:
+                placement_counts[length][placement] += 1
+            drawn += 1
+
+        self.last_samples = drawn
+        if not drawn:
+            return None
+
+        counts = [0] * (size * size)
+        for length, per_placement in placement_counts.items():
+            cells = indexes[length].cells
+            for placement, count in enumerate(per_placement):
+                if count:
+                    for index in cells[placement]:
+                        counts[index] += count
+        return counts
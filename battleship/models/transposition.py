@@ -0,0 +1,291 @@
+"""
+Table de transposition des décisions déterministes de l'IA.
+
+Une stratégie déterministe ('density') prend toujours la même décision dans
+le même état observé ; la table mémorise ces décisions, indexées par une clé
+64 bits qui combine la stratégie (taille, flotte, réglages) et l'empreinte de
+Zobrist du plateau (``Board.zobrist``). Deux parties qui se rejoignent dans
+le même état, quel que soit l'ordre des tirs, partagent donc leurs décisions.
+
+Deux niveaux :
+
+    TranspositionCache  table bornée (éviction LRU ou FIFO) d'un processus,
+                        partagée par toutes les IA et les parties successives
+                        (``SHARED_CACHE``)
+    SharedTable         copie figée d'une table, en lecture seule dans un
+                        segment de mémoire partagée, consultée par les
+                        processus de calcul après leur propre table
+
+Exemple :
+    configure_cache(1 << 18, "fifo")
+    table = SharedTable.publish(SHARED_CACHE)
+    pool = ProcessPoolExecutor(initializer=attach_shared_table,
+                               initargs=(table.name,))
+"""
+
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
+from .params import StrategyParams
+from .zobrist import mix
+
+# Nombre de décisions conservées par défaut
+CACHE_SIZE = 1 << 16
+
+# Politiques d'éviction
+POLICIES = ("lru", "fifo")
+
+# En-tête d'une table partagée : MAGIC, capacité (u32), entrées (u32)
+_TABLE_MAGIC = b"BSTT"
+_TABLE_HEADER = struct.Struct("<4sII")
+
+
+def strategy_key(size: int, lengths: Tuple[int, ...], params: StrategyParams) -> int:
+    """Clé 64 bits d'une stratégie : taille, flotte (dans l'ordre) et réglages."""
+    key = mix(0, size)
+    for length in lengths:
+        key = mix(key, length)
+    for value in params:
+        key = mix(key, struct.unpack("<Q", struct.pack("<d", value))[0])
+    return key
+
+
+def position_key(strategy: int, zobrist: int) -> int:
+    """Clé d'un état pour une stratégie (jamais nulle)."""
+    return mix(strategy, zobrist) or 1
+
+
+class TranspositionCache:
+    """
+    Table bornée des décisions calculées, partageable entre threads.
+
+    Attributes:
+        max_size (int): Nombre maximal d'entrées
+        policy (str): Politique d'éviction ('lru' ou 'fifo')
+        shared (Optional[SharedTable]): Table en lecture seule consultée
+            après les entrées locales
+        hits (int): Consultations fructueuses (table partagée comprise)
+        shared_hits (int): Consultations satisfaites par la table partagée
+        misses (int): Consultations infructueuses
+        evictions (int): Entrées évincées
+    """
+
+    def __init__(self, max_size: int = CACHE_SIZE, policy: str = "lru"):
+        self.shared: Optional[SharedTable] = None
+        self._entries: "OrderedDict[int, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.shared_hits = self.misses = self.evictions = 0
+        self.configure(max_size, policy)
+
+    def configure(self, max_size: Optional[int] = None,
+                  policy: Optional[str] = None):
+        """
+        Change la taille ou la politique ; les entrées en trop sont évincées.
+
+        Raises:
+            ValueError: Si la taille est négative ou la politique inconnue
+        """
+        if max_size is not None and max_size < 0:
+            raise ValueError(f"Taille de table invalide : {max_size}")
+        if policy is not None and policy not in POLICIES:
+            raise ValueError(f"Politique d'éviction inconnue : '{policy}' "
+                             f"(choix : {', '.join(POLICIES)})")
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if policy is not None:
+                self.policy = policy
+            self._evict()
+
+    @property
+    def active(self) -> bool:
+        """Faux si la table est désactivée (taille nulle, sans table partagée)."""
+        return self.max_size > 0 or self.shared is not None
+
+    @property
+    def hit_rate(self) -> float:
+        """Proportion de consultations fructueuses (0 sans consultation)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: int) -> Optional[int]:
+        """Décision enregistrée pour une clé, ou None (table désactivée : sans
+        verrou ni compteur)."""
+        if not self.active:
+            return None
+        with self._lock:
+            cell = self._entries.get(key)
+            if cell is not None:
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+                self.hits += 1
+                return cell
+            cell = self.shared.get(key) if self.shared is not None else None
+            if cell is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.shared_hits += 1
+            return cell
+
+    def put(self, key: int, cell: int):
+        """Enregistre une décision (ignorée si la table est désactivée)."""
+        if not self.max_size:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = cell
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+                return
+            self._entries[key] = cell
+            self._evict()
+
+    def _evict(self):
+        entries = self._entries
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        """Copie des entrées locales (clé, case)."""
+        with self._lock:
+            return iter(list(self._entries.items()))
+
+    def reset_stats(self):
+        """Remet les compteurs à zéro."""
+        self.hits = self.shared_hits = self.misses = self.evictions = 0
+
+    def clear(self):
+        """Vide la table et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.reset_stats()
+
+    def stats(self) -> dict:
+        """Compteurs de la table, pour les rapports."""
+        return {"entries": len(self._entries), "max_size": self.max_size,
+                "policy": self.policy, "hits": self.hits,
+                "shared_hits": self.shared_hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hit_rate}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedTable:
+    """
+    Table de décisions figée en mémoire partagée, en lecture seule.
+
+    Adressage ouvert à sondage linéaire : capacité en puissance de deux,
+    remplie au plus à moitié ; une clé nulle marque une case vide (les clés
+    de ``position_key`` ne sont jamais nulles). Seul le processus qui publie
+    la table la détruit (``unlink``).
+
+    Attributes:
+        name (str): Nom du segment de mémoire partagée
+        capacity (int): Nombre de cases de la table
+    """
+
+    def __init__(self, memory, owner: bool):
+        self._memory = memory
+        self._owner = owner
+        magic, capacity, self.count = _TABLE_HEADER.unpack_from(memory.buf)
+        if magic != _TABLE_MAGIC:
+            raise ValueError(f"{memory.name} n'est pas une table de transposition")
+        self.name = memory.name
+        self.capacity = capacity
+        start = _TABLE_HEADER.size
+        self._keys = memory.buf[start:start + 8 * capacity].cast("Q")
+        start += 8 * capacity
+        self._cells = memory.buf[start:start + 2 * capacity].cast("H")
+
+    @classmethod
+    def publish(cls, cache: TranspositionCache) -> "SharedTable":
+        """Copie les entrées d'une table dans un nouveau segment partagé."""
+        from multiprocessing import shared_memory
+        entries = list(cache.items())
+        capacity = 8
+        while capacity < 2 * len(entries):
+            capacity <<= 1
+        keys, cells = array("Q", bytes(8 * capacity)), array("H", bytes(2 * capacity))
+        mask = capacity - 1
+        for key, cell in entries:
+            slot = key & mask
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            keys[slot], cells[slot] = key, cell
+        size = _TABLE_HEADER.size + 10 * capacity
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        _TABLE_HEADER.pack_into(memory.buf, 0, _TABLE_MAGIC, capacity, len(entries))
+        start = _TABLE_HEADER.size
+        memory.buf[start:start + 8 * capacity] = keys.tobytes()
+        memory.buf[start + 8 * capacity:size] = cells.tobytes()
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedTable":
+        """
+        Ouvre en lecture un segment publié par le processus parent (qui
+        partage son suivi des ressources avec ses processus de calcul).
+        """
+        from multiprocessing import shared_memory
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def get(self, key: int) -> Optional[int]:
+        """Décision enregistrée pour une clé, ou None."""
+        keys = self._keys
+        mask = self.capacity - 1
+        slot = key & mask
+        while True:
+            found = keys[slot]
+            if found == key:
+                return self._cells[slot]
+            if not found:
+                return None
+            slot = (slot + 1) & mask
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        """Libère la vue du segment ; le propriétaire le détruit aussi."""
+        self._keys.release()
+        self._cells.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+SHARED_CACHE = TranspositionCache()
+
+
+def configure_cache(max_size: Optional[int] = None,
+                    policy: Optional[str] = None) -> TranspositionCache:
+    """Règle la table partagée du processus et la retourne."""
+    SHARED_CACHE.configure(max_size, policy)
+    return SHARED_CACHE
+
+
+def attach_shared_table(name: str):
+    """
+    Branche une table publiée sur la table du processus (initialiseur des
+    processus de calcul).
+    """
+    SHARED_CACHE.shared = SharedTable.attach(name)
+
+
+def format_stats(cache: Optional[TranspositionCache] = None) -> str:
+    """Résumé lisible des compteurs d'une table (par défaut celle du processus)."""
+    cache = cache if cache is not None else SHARED_CACHE
+    lookups = cache.hits + cache.misses
+    line = (f"Table de transposition : {len(cache)}/{cache.max_size} entrées "
+            f"({cache.policy}), {cache.hits}/{lookups} consultations "
+            f"fructueuses ({100 * cache.hit_rate:.1f} %), "
+            f"{cache.evictions} évictions")
+    if cache.shared is not None:
+        line += (f", dont {cache.shared_hits} dans la table partagée "
+                 f"({len(cache.shared)} entrées)")
+    return line
@@ -0,0 +1,57 @@
+"""
+Empreintes de Zobrist de l'état observé d'un plateau.
+
+Chaque fait observable par le tireur (case manquée, case touchée, navire
+coulé à une position donnée) reçoit une clé 64 bits pseudo-aléatoire fixe ;
+l'empreinte d'un plateau est le XOR des clés de ses faits. Elle ne dépend
+donc que de l'ensemble des faits, pas de l'ordre des tirs, et se met à jour
+en O(1) à chaque nouveau tir (voir ``Board.receive_shot``).
+
+Les clés sont dérivées de l'indice du fait par un mélange de type
+splitmix64 : elles sont identiques d'un processus et d'une version à
+l'autre, ce qui permet de les enregistrer (livre d'ouvertures).
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Optional
+from .ship import Ship
+
+_MASK64 = (1 << 64) - 1
+
+# Graines des deux familles de clés
+_SHOT_SEED = 0x5A0B_1C7D_2E3F_4051
+_SUNK_SEED = 0x6B1C_2D8E_3F40_5162
+
+# Au-delà, les clés de tir sont calculées à la volée plutôt que tabulées
+TABLE_MAX_CELLS = 64 * 64
+
+
+def mix(key: int, value: int) -> int:
+    """Ajoute une valeur à une empreinte (mélange de type splitmix64)."""
+    z = (key ^ (value + 0x9E3779B97F4A7C15)) * 0xBF58476D1CE4E5B9 & _MASK64
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EB & _MASK64
+    return z ^ (z >> 31)
+
+
+def shot_key(index: int, hit: bool) -> int:
+    """Clé d'un tir sur la case ``index`` (touché ou manqué)."""
+    return mix(_SHOT_SEED, index << 1 | hit)
+
+
+def sunk_key(ship: Ship) -> int:
+    """Clé d'un navire coulé (position exacte comprise)."""
+    horizontal = ship.horizontal or ship.size < 2
+    return mix(_SUNK_SEED, ship.y << 40 | ship.x << 20 | ship.size << 1 | horizontal)
+
+
+@lru_cache(maxsize=None)
+def shot_table(cells: int) -> Optional[array]:
+    """
+    Clés de tir tabulées d'un plateau : ``table[index << 1 | hit]``.
+
+    None au-delà de ``TABLE_MAX_CELLS`` cases.
+    """
+    if cells > TABLE_MAX_CELLS:
+        return None
+    return array("Q", (shot_key(value >> 1, value & 1) for value in range(2 * cells)))
@@ -0,0 +1,309 @@
+"""
+Journal binaire compact des parties et relecture.
+
+Format (entiers codés en varint LEB128, non signés) :
+
+    fichier : MAGIC, VERSION, puis une suite de parties
+    partie  : graine, taille, nombre de navires,
+              pour chaque navire : longueur du nom, nom UTF-8, longueur,
+              pour chaque camp puis chaque navire : (case << 1) | horizontal,
+              tirs : ((case << 3) | coulé << 2 | touché << 1 | tireur) + 1,
+              0 (fin des tirs), vainqueur + 1 (0 si aucun)
+
+Le fichier est ouvert en ajout : plusieurs simulations peuvent alimenter le
+même journal. La lecture est un générateur qui parcourt le fichier par blocs
+sans jamais le charger entièrement.
+
+Exemple :
+    python -m battleship.replay parties.bslog --game 12
+"""
+
+import argparse
+import os
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from .models.board import Board
+from .models.ship import Ship
+
+MAGIC = b"BSLG"
+VERSION = 1
+
+# Taille des blocs lus sur le disque
+_CHUNK_SIZE = 1 << 20
+
+
+class LoggedShot(NamedTuple):
+    """Tir enregistré dans le journal."""
+    shooter: int
+    x: int
+    y: int
+    hit: bool
+    sunk: bool
+
+
+class GameRecord(NamedTuple):
+    """
+    Partie complète telle qu'enregistrée dans le journal.
+
+    Attributes:
+        seed (int): Graine de la partie
+        size (int): Taille des plateaux
+        fleet (Tuple[Tuple[str, int], ...]): Nom et longueur de chaque navire
+        placements (Tuple[Tuple[Tuple[int, int, bool], ...], ...]): Pour
+            chaque camp, (x, y, horizontal) de chaque navire
+        shots (Tuple[LoggedShot, ...]): Tirs dans l'ordre de la partie
+        winner (Optional[int]): Camp gagnant
+    """
+    seed: int
+    size: int
+    fleet: Tuple[Tuple[str, int], ...]
+    placements: Tuple[Tuple[Tuple[int, int, bool], ...], ...]
+    shots: Tuple[LoggedShot, ...]
+    winner: Optional[int]
+
+
+def ship_origin(ship: Ship) -> Tuple[int, int, bool]:
+    """Retourne (x, y, horizontal) d'un navire placé."""
+    return ship.x, ship.y, ship.horizontal or ship.size < 2
+
+
+def record_game(engine, seed: int) -> GameRecord:
+    """
+    Construit l'enregistrement d'une partie jouée par un ``GameEngine``.
+
+    Le moteur doit avoir été créé avec ``record=True``.
+    """
+    boards = engine.boards
+    fleet = tuple((ship.name, ship.size) for ship in boards[0].ships)
+    placements = tuple(
+        tuple(ship_origin(ship) for ship in board.ships) for board in boards
+    )
+    shots = tuple(
+        LoggedShot(shot.shooter, shot.x, shot.y, shot.hit, shot.sunk is not None)
+        for shot in engine.history
+    )
+    return GameRecord(seed, boards[0].size, fleet, placements, shots,
+                      engine.winner)
+
+
+def _put_varint(out: bytearray, value: int):
+    """Ajoute un entier non signé codé en varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_game(record: GameRecord) -> bytes:
+    """Encode une partie au format du journal."""
+    out = bytearray()
+    size = record.size
+    _put_varint(out, record.seed)
+    _put_varint(out, size)
+    _put_varint(out, len(record.fleet))
+    for name, length in record.fleet:
+        encoded = name.encode("utf-8")
+        _put_varint(out, len(encoded))
+        out += encoded
+        _put_varint(out, length)
+    for side in record.placements:
+        for x, y, horizontal in side:
+            _put_varint(out, ((y * size + x) << 1) | horizontal)
+    for shot in record.shots:
+        index = shot.y * size + shot.x
+        _put_varint(out, ((index << 3) | shot.sunk << 2 | shot.hit << 1
+                          | shot.shooter) + 1)
+    out.append(0)
+    _put_varint(out, 0 if record.winner is None else record.winner + 1)
+    return bytes(out)
+
+
+class GameLogWriter:
+    """
+    Écrit des parties à la fin d'un journal binaire.
+
+    Utilisable comme gestionnaire de contexte.
+    """
+
+    def __init__(self, path: str):
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC + bytes((VERSION,)))
+
+    def write(self, record: GameRecord):
+        """Ajoute une partie au journal."""
+        self._file.write(encode_game(record))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "GameLogWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _ChunkedStream:
+    """Lecture de varints dans un fichier, bloc par bloc."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._buffer = b""
+        self._pos = 0
+
+    def _byte(self) -> int:
+        if self._pos >= len(self._buffer):
+            self._buffer = self._file.read(_CHUNK_SIZE)
+            self._pos = 0
+            if not self._buffer:
+                raise EOFError
+        value = self._buffer[self._pos]
+        self._pos += 1
+        return value
+
+    def at_end(self) -> bool:
+        if self._pos < len(self._buffer):
+            return False
+        self._buffer = self._file.read(_CHUNK_SIZE)
+        self._pos = 0
+        return not self._buffer
+
+    def varint(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            byte = self._byte()
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def raw(self, length: int) -> bytes:
+        return bytes(self._byte() for _ in range(length))
+
+
+def read_games(path: str) -> Iterator[GameRecord]:
+    """
+    Parcourt les parties d'un journal sans le charger en mémoire.
+
+    Raises:
+        ValueError: Si le fichier n'est pas un journal valide ou est tronqué
+    """
+    with open(path, "rb") as file:
+        header = file.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC or header[len(MAGIC):] != bytes((VERSION,)):
+            raise ValueError(f"{path} n'est pas un journal de parties valide")
+        stream = _ChunkedStream(file)
+        while not stream.at_end():
+            try:
+                yield _decode_game(stream)
+            except EOFError:
+                raise ValueError(f"{path} : partie tronquée") from None
+
+
+def _decode_game(stream: _ChunkedStream) -> GameRecord:
+    """Décode une partie à la position courante du flux."""
+    seed = stream.varint()
+    size = stream.varint()
+    fleet = []
+    for _ in range(stream.varint()):
+        name = stream.raw(stream.varint()).decode("utf-8")
+        fleet.append((name, stream.varint()))
+
+    placements = []
+    for _ in range(2):
+        side = []
+        for _ in fleet:
+            value = stream.varint()
+            index = value >> 1
+            side.append((index % size, index // size, bool(value & 1)))
+        placements.append(tuple(side))
+
+    shots: List[LoggedShot] = []
+    while True:
+        value = stream.varint()
+        if not value:
+            break
+        value -= 1
+        index = value >> 3
+        shots.append(LoggedShot(value & 1, index % size, index // size,
+                                bool(value & 2), bool(value & 4)))
+
+    winner = stream.varint()
+    return GameRecord(seed, size, tuple(fleet), tuple(placements),
+                      tuple(shots), winner - 1 if winner else None)
+
+
+def replay_game(record: GameRecord,
+                upto: Optional[int] = None) -> Tuple[Board, Board]:
+    """
+    Rejoue une partie enregistrée sur deux plateaux neufs.
+
+    Args:
+        record (GameRecord): Partie à rejouer
+        upto (Optional[int]): Nombre de tirs à rejouer (tous par défaut)
+
+    Returns:
+        Tuple[Board, Board]: Plateaux des deux camps après les tirs rejoués
+
+    Raises:
+        ValueError: Si un placement ou un résultat diffère du journal
+    """
+    boards = (Board(record.size), Board(record.size))
+    for board, side in zip(boards, record.placements):
+        for (name, length), (x, y, horizontal) in zip(record.fleet, side):
+            if not board.place_ship(Ship(name, length), x, y, horizontal):
+                raise ValueError(f"Placement invalide pour {name} en ({x}, {y})")
+
+    shots = record.shots if upto is None else record.shots[:upto]
+    for turn, shot in enumerate(shots):
+        hit, sunk = boards[1 - shot.shooter].receive_shot(shot.x, shot.y)
+        if hit != shot.hit or (sunk is not None) != shot.sunk:
+            raise ValueError(f"Tir {turn} en ({shot.x}, {shot.y}) : résultat "
+                             f"différent du journal")
+    return boards
+
+
+def format_board(board: Board) -> str:
+    """Représentation texte d'un plateau (navires, touches, manqués)."""
+    symbols = {(True, True): "X", (True, False): "#",
+               (False, True): "o", (False, False): "."}
+    lines = []
+    for y in range(board.size):
+        lines.append("".join(
+            symbols[(board.grid[y][x] is not None, board.is_shot(x, y))]
+            for x in range(board.size)
+        ))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Parcourt un journal de parties et rejoue une partie."
+    )
+    parser.add_argument("log", help="fichier journal")
+    parser.add_argument("--game", type=int, default=None,
+                        help="indice de la partie à rejouer et afficher")
+    parser.add_argument("--upto", type=int, default=None,
+                        help="nombre de tirs à rejouer")
+    args = parser.parse_args(argv)
+
+    games = 0
+    total_shots = 0
+    for index, record in enumerate(read_games(args.log)):
+        games += 1
+        total_shots += len(record.shots)
+        if index == args.game:
+            boards = replay_game(record, args.upto)
+            print(f"Partie {index} : graine {record.seed}, "
+                  f"vainqueur {record.winner}, {len(record.shots)} tirs")
+            for side, board in enumerate(boards):
+                print(f"\nPlateau {side + 1}\n{format_board(board)}")
+            return
+    size = os.path.getsize(args.log)
+    print(f"{games} parties, {total_shots} tirs, {size} octets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""
+Serveur de parties en réseau (asyncio).
+
+Un processus héberge de nombreuses parties simultanées : joueur contre
+joueur, joueur contre IA et IA contre IA (retransmise à un spectateur). Les
+plateaux du serveur (``Board``) font foi ; les coups des IA et les
+placements aléatoires sont calculés dans un pool de threads pour ne jamais
+bloquer la boucle d'événements.
+
+Protocole texte, une commande par ligne, mots séparés par des espaces :
+
+    client -> serveur
+        AI <difficulté> [taille [flotte [placement]]]
+                                             partie contre une IA
+        HOST [taille [flotte]]               partie entre joueurs (attend JOIN)
+        JOIN <partie>                        rejoint une partie créée par HOST
+        WATCH <IA1> <IA2> [taille [flotte [placement1 [placement2]]]]
+                                             regarde une partie entre IA
+        PLACE <x> <y> <H|V>                  place le prochain navire de la flotte
+        AUTO                                 place aléatoirement les navires restants
+        FIRE <x> <y>                         tire sur le plateau adverse
+        QUIT                                 quitte la partie et ferme la connexion
+
+    serveur -> client
+        WELCOME <version>
+        GAME <partie> <camp> <taille> <longueurs>   ex. GAME 7 0 10 5,4,3,3,2,2
+        WAIT | START | TURN
+        RESULT <x> <y> <MISS|HIT|SUNK> [longueur]   résultat de son tir
+        INCOMING <x> <y> <MISS|HIT|SUNK> [longueur] tir adverse
+        SHOT <camp> <x> <y> <MISS|HIT|SUNK> [longueur]  (spectateur)
+        WIN | LOSE | OVER <camp> | ABANDON
+        OK <navires restants à placer> | ERR <message> | BYE
+
+La flotte ``standard`` est celle du jeu ; le placement d'une flotte d'IA est
+``random`` (défaut) ou le nom du tireur auquel elle doit résister (réserve
+précalculée, voir ``models.layouts``).
+
+Exemple :
+    python server.py --port 5050 --workers 4
+    (puis, par ex.) nc localhost 5050
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .engine import GameEngine, ShotResult
+from .models.board import Board
+from .models.computer_ai import ComputerAI
+from .models.layouts import RANDOM_PLACEMENT, fleet_placer
+from .models.params import is_known_difficulty
+from .models.placement import place_random_fleet, placement_count, uses_index
+from .models.ship import Ship
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+PROTOCOL_VERSION = 1
+
+# Limites imposées aux clients
+MAX_SIZE = 100
+MAX_SHIPS = 500
+MAX_LINE = 1024
+# Longueurs de navires distinctes et placements indexés par partie : bornent
+# la mémoire des index de placements construits pour la flotte d'un client
+MAX_LENGTHS = 6
+MAX_PLACEMENTS = 32768
+
+class RemoteShooter:
+    """Tireur distant : joue le tir reçu du client (``pending``)."""
+
+    __slots__ = ("pending",)
+
+    def __init__(self):
+        self.pending: Optional[Tuple[int, int]] = None
+
+    def get_shot(self, board: Board) -> Tuple[int, int]:
+        shot, self.pending = self.pending, None
+        if shot is None:
+            raise ValueError("Aucun tir en attente")
+        return shot
+
+    def notify_hit(self, x: int, y: int, sunk: bool, ship=None):
+        """Le client reçoit les résultats par le protocole."""
+
+
+class _Client:
+    """Connexion d'un joueur ou d'un spectateur."""
+
+    __slots__ = ("writer", "session", "side")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.session: Optional["GameSession"] = None
+        self.side = 0
+
+    def send(self, *words):
+        if not self.writer.is_closing():
+            self.writer.write((" ".join(map(str, words)) + "\n").encode())
+
+
+class GameSession:
+    """
+    Partie hébergée par le serveur.
+
+    Attributes:
+        id (int): Identifiant de la partie
+        boards (Tuple[Board, Board]): Plateaux des deux camps
+        shooters (List): ``RemoteShooter`` ou ``ComputerAI`` de chaque camp
+        clients (List[Optional[_Client]]): Joueur de chaque camp (None pour une IA)
+        watcher (Optional[_Client]): Spectateur d'une partie entre IA
+        engine (Optional[GameEngine]): Moteur, créé lorsque les flottes sont prêtes
+        busy (bool): Vrai pendant le calcul d'un coup d'IA
+    """
+
+    __slots__ = ("id", "ships_config", "boards", "shooters", "clients",
+                 "watcher", "first", "engine", "busy")
+
+    def __init__(self, game_id: int, size: int, ships_config: Dict[str, int],
+                 shooters: List, first: int):
+        self.id = game_id
+        self.ships_config = ships_config
+        self.boards = (Board(size), Board(size))
+        self.shooters = shooters
+        self.clients: List[Optional[_Client]] = [None, None]
+        self.watcher: Optional[_Client] = None
+        self.first = first
+        self.engine: Optional[GameEngine] = None
+        self.busy = False
+
+    def ships_left(self, side: int) -> int:
+        """Nombre de navires restant à placer pour un camp."""
+        return len(self.ships_config) - len(self.boards[side].ships)
+
+    def greet(self, client: _Client):
+        """Envoie au client la description de la partie."""
+        lengths = ",".join(map(str, self.ships_config.values()))
+        client.send("GAME", self.id, client.side, self.boards[0].size, lengths)
+
+
+def _outcome(result: ShotResult) -> Tuple:
+    """Mots décrivant le résultat d'un tir."""
+    if result.sunk is not None:
+        return "SUNK", result.sunk.size
+    return ("HIT",) if result.hit else ("MISS",)
+
+
+class GameServer:
+    """
+    Serveur hébergeant les parties.
+
+    Attributes:
+        games (Dict[int, GameSession]): Parties en cours
+        executor (Executor): Pool où sont calculés les coups des IA
+        time_budget (Optional[float]): Durée maximale d'un coup d'IA ('solver')
+    """
+
+    def __init__(self, executor: Optional[Executor] = None,
+                 time_budget: Optional[float] = None,
+                 rng: Optional[random.Random] = None):
+        self.games: Dict[int, GameSession] = {}
+        self.executor = executor or ThreadPoolExecutor()
+        self.time_budget = time_budget
+        self.rng = rng or random.Random()
+        self._ids = itertools.count(1)
+        self._commands = {
+            "AI": self._cmd_ai, "HOST": self._cmd_host, "JOIN": self._cmd_join,
+            "WATCH": self._cmd_watch, "PLACE": self._cmd_place,
+            "AUTO": self._cmd_auto, "FIRE": self._cmd_fire,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """Ouvre le port d'écoute (``port=0`` : port libre choisi par le système)."""
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter):
+        """Dialogue avec un client jusqu'à sa déconnexion."""
+        client = _Client(writer)
+        client.send("WELCOME", PROTOCOL_VERSION)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode("utf-8", "replace").split()
+                if not words:
+                    continue
+                command = words[0].upper()
+                if command == "QUIT":
+                    client.send("BYE")
+                    break
+                handler = self._commands.get(command)
+                if handler is None:
+                    client.send("ERR", f"Commande inconnue : {command}")
+                else:
+                    try:
+                        await handler(client, words[1:])
+                    except ValueError as error:
+                        client.send("ERR", error)
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self._leave(client)
+            writer.close()
+
+    # Création des parties
+
+    def _new_session(self, shooters: List, args: List[str]) -> GameSession:
+        """Crée une partie à partir des arguments ``[taille [flotte]]``."""
+        size = int(args[0]) if args else GRID_SIZE
+        if not 1 <= size <= MAX_SIZE:
+            raise ValueError("Taille de plateau hors limites")
+        ships_config = (parse_fleet(args[1], MAX_SHIPS, size) if len(args) > 1
+                        else SHIPS_CONFIG)
+        if sum(ships_config.values()) > size * size:
+            raise ValueError("La flotte ne tient pas sur le plateau")
+        lengths = set(ships_config.values())
+        if len(lengths) > MAX_LENGTHS:
+            raise ValueError(f"Trop de longueurs de navires différentes "
+                             f"(maximum {MAX_LENGTHS})")
+        if (uses_index(size) and sum(placement_count(size, length)
+                                     for length in lengths) > MAX_PLACEMENTS):
+            raise ValueError("Flotte trop coûteuse pour ce plateau")
+        session = GameSession(next(self._ids), size, ships_config, shooters,
+                              self.rng.randrange(2))
+        self.games[session.id] = session
+        return session
+
+    def _new_ai(self, difficulty: str, ships_config: Dict[str, int]) -> ComputerAI:
+        if not is_known_difficulty(difficulty):
+            raise ValueError(f"Difficulté inconnue : {difficulty}")
+        return ComputerAI(difficulty, random.Random(self.rng.getrandbits(63)),
+                          ships_config, self.time_budget)
+
+    async def _place_randomly(self, session: GameSession, side: int,
+                              placement: str = RANDOM_PLACEMENT):
+        """
+        Complète la flotte d'un camp, dans le pool de calcul.
+
+        Raises:
+            ValueError: Si aucune réserve ne correspond à ``placement``
+        """
+        board = session.boards[side]
+        if placement == RANDOM_PLACEMENT:
+            placed = {ship.name for ship in board.ships}
+            placer = place_random_fleet
+            fleet = {name: length for name, length in session.ships_config.items()
+                     if name not in placed}
+        else:
+            placer = fleet_placer(placement, board.size, session.ships_config)
+            fleet = session.ships_config
+        rng = random.Random(self.rng.getrandbits(63))
+        await asyncio.get_running_loop().run_in_executor(
+            self.executor, placer, board, fleet, rng
+        )
+
+    def _check_free(self, client: _Client):
+        if client.session is not None:
+            raise ValueError("Déjà dans une partie")
+
+    async def _cmd_ai(self, client: _Client, args: List[str]):
+        self._check_free(client)
+        if not args:
+            raise ValueError("Usage : AI <difficulté> [taille [flotte [placement]]]")
+        session = self._new_session([RemoteShooter(), None], args[1:3])
+        try:
+            session.shooters[1] = self._new_ai(args[0], session.ships_config)
+            await self._place_randomly(session, 1, *args[3:4])
+        except ValueError:
+            self.games.pop(session.id, None)
+            raise
+        self._seat(session, client, 0)
+
+    async def _cmd_host(self, client: _Client, args: List[str]):
+        self._check_free(client)
+        session = self._new_session([RemoteShooter(), RemoteShooter()], args)
+        self._seat(session, client, 0)
+        client.send("WAIT")
+
+    async def _cmd_join(self, client: _Client, args: List[str]):
+        self._check_free(client)
+        session = self.games.get(int(args[0])) if args else None
+        if (session is None or session.clients[1] is not None
+                or not isinstance(session.shooters[1], RemoteShooter)):
+            raise ValueError("Partie introuvable ou complète")
+        self._seat(session, client, 1)
+
+    async def _cmd_watch(self, client: _Client, args: List[str]):
+        self._check_free(client)
+        if len(args) < 2:
+            raise ValueError("Usage : WATCH <IA1> <IA2> "
+                             "[taille [flotte [placement1 [placement2]]]]")
+        session = self._new_session([None, None], args[2:4])
+        try:
+            for side in range(2):
+                session.shooters[side] = self._new_ai(args[side], session.ships_config)
+                await self._place_randomly(session, side, *args[4 + side:5 + side])
+        except ValueError:
+            self.games.pop(session.id, None)
+            raise
+        session.watcher = client
+        client.session = session
+        session.greet(client)
+        await self._start(session)
+
+    def _seat(self, session: GameSession, client: _Client, side: int):
+        session.clients[side] = client
+        client.session = session
+        client.side = side
+        session.greet(client)
+
+    # Déroulement
+
+    def _session_of(self, client: _Client) -> GameSession:
+        if client.session is None or client.session.watcher is client:
+            raise ValueError("Aucune partie en cours")
+        return client.session
+
+    async def _cmd_place(self, client: _Client, args: List[str]):
+        session = self._session_of(client)
+        side = client.side
+        if session.engine is not None or not session.ships_left(side):
+            raise ValueError("Placement terminé")
+        if len(args) != 3 or args[2].upper() not in ("H", "V"):
+            raise ValueError("Usage : PLACE <x> <y> <H|V>")
+        board = session.boards[side]
+        name, length = list(session.ships_config.items())[len(board.ships)]
+        if not board.place_ship(Ship(name, length), int(args[0]), int(args[1]),
+                                args[2].upper() == "H"):
+            raise ValueError("Placement impossible")
+        await self._placed(session, client)
+
+    async def _cmd_auto(self, client: _Client, args: List[str]):
+        session = self._session_of(client)
+        if session.engine is not None or not session.ships_left(client.side):
+            raise ValueError("Placement terminé")
+        await self._place_randomly(session, client.side)
+        if client.session is not session:
+            return
+        await self._placed(session, client)
+
+    async def _placed(self, session: GameSession, client: _Client):
+        client.send("OK", session.ships_left(client.side))
+        if not any(session.ships_left(side) for side in range(2)):
+            if all(session.clients[side] is not None or
+                   not isinstance(session.shooters[side], RemoteShooter)
+                   for side in range(2)):
+                await self._start(session)
+
+    async def _start(self, session: GameSession):
+        session.engine = GameEngine(session.boards, session.shooters, session.first)
+        for client in session.clients:
+            if client is not None:
+                client.send("START")
+        await self._advance(session)
+
+    async def _cmd_fire(self, client: _Client, args: List[str]):
+        session = self._session_of(client)
+        engine = session.engine
+        if engine is None or session.busy or engine.current != client.side:
+            raise ValueError("Ce n'est pas votre tour")
+        if len(args) != 2:
+            raise ValueError("Usage : FIRE <x> <y>")
+        engine.shooters[client.side].pending = (int(args[0]), int(args[1]))
+        self._announce(session, engine.step())
+        await self._advance(session)
+
+    async def _advance(self, session: GameSession):
+        """Joue les coups des IA puis donne la main au joueur suivant."""
+        engine = session.engine
+        loop = asyncio.get_running_loop()
+        while not engine.is_over and session.clients[engine.current] is None:
+            session.busy = True
+            try:
+                result = await loop.run_in_executor(self.executor, engine.step)
+            finally:
+                session.busy = False
+            if session.engine is None:
+                return
+            self._announce(session, result)
+            if session.watcher is not None:
+                await session.watcher.writer.drain()
+        if engine.is_over:
+            self._finish(session)
+        else:
+            session.clients[engine.current].send("TURN")
+
+    def _announce(self, session: GameSession, result: ShotResult):
+        outcome = _outcome(result)
+        shooter, target = session.clients[result.shooter], session.clients[1 - result.shooter]
+        if shooter is not None:
+            shooter.send("RESULT", result.x, result.y, *outcome)
+        if target is not None:
+            target.send("INCOMING", result.x, result.y, *outcome)
+        if session.watcher is not None:
+            session.watcher.send("SHOT", result.shooter, result.x, result.y, *outcome)
+
+    def _finish(self, session: GameSession):
+        winner = session.engine.winner
+        for side, client in enumerate(session.clients):
+            if client is not None:
+                client.send("WIN" if side == winner else "LOSE")
+                client.session = None
+        if session.watcher is not None:
+            session.watcher.send("OVER", winner)
+            session.watcher.session = None
+        self.games.pop(session.id, None)
+
+    def _leave(self, client: _Client):
+        """Retire un client de sa partie ; l'adversaire est prévenu."""
+        session = client.session
+        if session is None:
+            return
+        client.session = None
+        for other in session.clients:
+            if other is not None and other is not client:
+                other.send("ABANDON")
+                other.session = None
+        session.engine = None
+        self.games.pop(session.id, None)
+
+
+async def serve(host: str, port: int, workers: Optional[int] = None,
+                time_budget: Optional[float] = None):
+    """Lance le serveur jusqu'à interruption."""
+    server = GameServer(ThreadPoolExecutor(workers), time_budget)
+    listener = await server.start(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Serveur à l'écoute sur {addresses}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description="Serveur de bataille navale en réseau.")
+    parser.add_argument("--host", default="127.0.0.1", help="adresse d'écoute")
+    parser.add_argument("--port", type=int, default=5050, help="port d'écoute")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="threads de calcul des coups des IA")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="durée maximale d'un coup d'IA 'solver' en secondes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.time_budget))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Simulation en masse de parties sans interface graphique.
+
+Exemple :
+    python simulate.py --games 10000 --ai hard easy --seed 42
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import List, Optional, Sequence
+from . import instrumentation
+from .engine import GameEngine
+from .models.computer_ai import ComputerAI
+from .models.layouts import RANDOM_PLACEMENT, fleet_placer
+from .models.params import is_known_difficulty
+from .models.transposition import (POLICIES, SHARED_CACHE, configure_cache,
+                                   format_stats as format_cache_stats)
+from .replay import GameLogWriter, record_game
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+
+class SimulationReport:
+    """
+    Statistiques agrégées d'une série de parties.
+
+    Attributes:
+        games (int): Nombre de parties jouées
+        wins (List[int]): Victoires de chaque camp
+        winning_shots (List[int]): Somme des tirs des parties gagnées, par camp
+        winning_shots_sq (List[int]): Somme des carrés de ces tirs, par camp
+        unfinished (int): Parties interrompues sans vainqueur
+        elapsed (float): Durée totale en secondes
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.winning_shots = [0, 0]
+        self.winning_shots_sq = [0, 0]
+        self.unfinished = 0
+        self.elapsed = 0.0
+
+    def add(self, result):
+        """Ajoute le résultat d'une partie."""
+        self.games += 1
+        if result.winner is None:
+            self.unfinished += 1
+            return
+        self.wins[result.winner] += 1
+        self.winning_shots[result.winner] += result.winner_shots
+        self.winning_shots_sq[result.winner] += result.winner_shots ** 2
+
+    def merge(self, other: "SimulationReport"):
+        """Ajoute les statistiques d'un autre rapport (ex. d'un autre processus)."""
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.elapsed += other.elapsed
+        for side in range(2):
+            self.wins[side] += other.wins[side]
+            self.winning_shots[side] += other.winning_shots[side]
+            self.winning_shots_sq[side] += other.winning_shots_sq[side]
+
+    def win_rate(self, side: int) -> float:
+        """Proportion de parties gagnées par un camp."""
+        return self.wins[side] / self.games if self.games else 0.0
+
+    def mean_shots_to_win(self, side: int) -> Optional[float]:
+        """Nombre moyen de tirs du camp lorsqu'il gagne."""
+        if not self.wins[side]:
+            return None
+        return self.winning_shots[side] / self.wins[side]
+
+    def shots_to_win_stdev(self, side: int) -> Optional[float]:
+        """Écart-type (échantillon) des tirs du camp lorsqu'il gagne."""
+        wins = self.wins[side]
+        if wins < 2:
+            return None
+        mean = self.winning_shots[side] / wins
+        variance = (self.winning_shots_sq[side] - wins * mean * mean) / (wins - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+
+def play_games(games: int, difficulties: Sequence[str], rng: random.Random,
+               size: int = GRID_SIZE, ships_config=SHIPS_CONFIG,
+               first_offset: int = 0,
+               log: Optional[GameLogWriter] = None,
+               placement: Sequence[str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+               ) -> SimulationReport:
+    """
+    Joue une série de parties avec un générateur aléatoire explicite.
+
+    Chaque partie reçoit sa propre graine, tirée de ``rng`` ; toute la part
+    aléatoire (placement des flottes et tirs des IA) en dépend : la même
+    graine redonne exactement les mêmes parties.
+
+    Args:
+        games (int): Nombre de parties
+        difficulties (Sequence[str]): Difficulté de chaque IA
+        rng (random.Random): Générateur aléatoire de la série
+        size (int): Taille des plateaux
+        ships_config: Flotte utilisée par les deux camps
+        first_offset (int): Décalage pour l'alternance du premier joueur
+        log (Optional[GameLogWriter]): Destination des parties jouées (tout
+            objet exposant ``write(record)``, ex. ``DatasetWriter``)
+        placement (Sequence[str]): Placement de la flotte de chaque camp
+            (``"random"`` ou tireur auquel résister, voir ``fleet_placer``)
+
+    Returns:
+        SimulationReport: Statistiques de la série
+
+    Raises:
+        ValueError: Si aucune réserve de flottes ne correspond à ``placement``
+    """
+    placers = None
+    if any(name != RANDOM_PLACEMENT for name in placement):
+        placers = [fleet_placer(name, size, ships_config) for name in placement]
+    report = SimulationReport()
+    start = time.perf_counter()
+    for game in range(games):
+        seed = rng.getrandbits(63)
+        game_rng = random.Random(seed)
+        shooters = [ComputerAI(difficulty, game_rng, ships_config)
+                    for difficulty in difficulties]
+        engine = GameEngine.new_game(shooters, size, ships_config, game_rng,
+                                     first=(first_offset + game) % 2,
+                                     record=log is not None, placers=placers)
+        report.add(engine.play())
+        if log is not None:
+            log.write(record_game(engine, seed))
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def simulate(games: int, difficulties: Sequence[str] = ("hard", "hard"),
+             size: int = GRID_SIZE, ships_config=SHIPS_CONFIG,
+             seed: Optional[int] = None,
+             log_path: Optional[str] = None,
+             placement: Sequence[str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+             ) -> SimulationReport:
+    """
+    Simule une série de parties entre deux IA.
+
+    Les camps commencent à tour de rôle pour ne pas favoriser le premier.
+
+    Args:
+        games (int): Nombre de parties
+        difficulties (Sequence[str]): Difficulté de chaque IA
+        size (int): Taille des plateaux
+        ships_config: Flotte utilisée par les deux camps
+        seed (Optional[int]): Graine du générateur aléatoire
+        log_path (Optional[str]): Journal binaire où ajouter les parties
+        placement (Sequence[str]): Placement de la flotte de chaque camp
+
+    Returns:
+        SimulationReport: Statistiques agrégées
+    """
+    rng = random.Random(seed)
+    if log_path is None:
+        return play_games(games, difficulties, rng, size, ships_config,
+                          placement=placement)
+    with GameLogWriter(log_path) as log:
+        return play_games(games, difficulties, rng, size, ships_config,
+                          log=log, placement=placement)
+
+
+def format_report(report: SimulationReport, labels: Sequence[str]) -> str:
+    """Met en forme un rapport de simulation."""
+    lines = [f"Parties jouées : {report.games}"]
+    for side, label in enumerate(labels):
+        mean = report.mean_shots_to_win(side)
+        mean_text = f"{mean:.2f}" if mean is not None else "-"
+        lines.append(
+            f"IA {side + 1} ({label}) - Victoires: {report.wins[side]} "
+            f"({report.win_rate(side) * 100:.1f}%), "
+            f"Tirs moyens pour gagner: {mean_text}"
+        )
+    if report.unfinished:
+        lines.append(f"Parties interrompues : {report.unfinished}")
+    lines.append(f"Vitesse : {report.games_per_second:.1f} parties/s")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Simule des parties de bataille navale entre deux IA."
+    )
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="nombre de parties à simuler")
+    parser.add_argument("--ai", nargs=2, default=["hard", "hard"],
+                        metavar=("IA1", "IA2"),
+                        help="difficulté ou profil réglé de chaque IA")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille des plateaux")
+    parser.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="graine du générateur aléatoire")
+    parser.add_argument("--log", default=None,
+                        help="journal binaire où ajouter les parties jouées")
+    parser.add_argument("--placement", nargs=2,
+                        default=[RANDOM_PLACEMENT, RANDOM_PLACEMENT],
+                        metavar=("FLOTTE1", "FLOTTE2"),
+                        help="placement de la flotte de chaque IA : 'random' "
+                             "ou IA dont elle doit déjouer les tirs (réserve "
+                             "précalculée, ex. --ai hard density --placement "
+                             "density hard)")
+    parser.add_argument("--batch", action="store_true",
+                        help="moteur vectorisé par lots (NumPy requis, IA "
+                             "'easy' et 'hard' seulement)")
+    parser.add_argument("--cache-size", type=int, default=None,
+                        help="nombre de décisions gardées par la table de "
+                             "transposition de l'IA 'density' (0 : désactivée)")
+    parser.add_argument("--cache-policy", choices=POLICIES, default=None,
+                        help="politique d'éviction de la table de transposition")
+    parser.add_argument("--stats", action="store_true",
+                        help="mesure les chemins critiques et affiche les statistiques")
+    parser.add_argument("--stats-interval", type=float, default=None,
+                        help="écrit les statistiques sur stderr toutes les N secondes")
+    args = parser.parse_args(argv)
+    for difficulty in args.ai:
+        if not is_known_difficulty(difficulty):
+            parser.error(f"Difficulté ou profil inconnu : {difficulty}")
+
+    try:
+        for name in args.placement:
+            fleet_placer(name, args.size, args.fleet)
+    except ValueError as error:
+        parser.error(str(error))
+
+    try:
+        configure_cache(args.cache_size, args.cache_policy)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.stats or args.stats_interval:
+        instrumentation.enable(dump_interval=args.stats_interval)
+    if args.batch:
+        if args.log:
+            parser.error("--batch ne peut pas être combiné avec --log")
+        if args.placement != [RANDOM_PLACEMENT, RANDOM_PLACEMENT]:
+            parser.error("--batch ne peut pas être combiné avec --placement")
+        from .batch import BATCH_DIFFICULTIES, play_batch
+        if not set(args.ai) <= set(BATCH_DIFFICULTIES):
+            parser.error("--batch n'accepte que les IA "
+                         + ", ".join(BATCH_DIFFICULTIES))
+        report = play_batch(args.games, args.ai, args.size, args.fleet,
+                            seed=args.seed)
+    else:
+        report = simulate(args.games, args.ai, args.size, args.fleet,
+                          seed=args.seed, log_path=args.log,
+                          placement=args.placement)
+    print(format_report(report, args.ai))
+    if instrumentation.enabled:
+        instrumentation.disable()
+        print(instrumentation.format_stats())
+        if SHARED_CACHE.hits or SHARED_CACHE.misses:
+            print(format_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
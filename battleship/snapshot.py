@@ -0,0 +1,376 @@
+"""
+Instantanés binaires compacts d'une partie en cours.
+
+Un instantané contient les plateaux (navires et tirs dans l'ordre), l'état
+des IA et, au choix, l'état de leurs générateurs aléatoires ; la restauration
+rejoue les tirs sur des plateaux neufs et redonne exactement la même partie.
+Les structures internes des stratégies ('density', 'solver') ne sont pas
+stockées : elles sont reconstruites à partir des plateaux au coup suivant.
+
+Format (entiers codés en varint LEB128, non signés) :
+
+    MAGIC, VERSION, taille,
+    générateurs : nombre, puis 625 mots de 32 bits et ``gauss_next``,
+    plateaux    : nombre, puis pour chacun
+                  navires : nombre, puis nom, longueur, (case << 1) | horizontal
+                  tirs    : nombre, puis les cases en entiers petit-boutistes
+                            de largeur fixe (1, 2 ou 4 octets selon la taille)
+    IA          : nombre, puis pour chacune
+                  plateau visé, générateur + 1 (0 si non stocké),
+                  difficulté, budget de temps, livre, profil, réglages
+                  différents du défaut (nombre, puis nom et valeur en
+                  double), flotte, dernière
+                  touche + 1 (0 si aucune), cibles potentielles, touches en
+                  cours, navires coulés (indices sur le plateau visé)
+    compteurs   : nombre, puis les valeurs (propres à l'appelant)
+
+Exemple :
+    data = snapshot_engine(engine)
+    engine = restore_engine(data)
+"""
+
+import random
+import struct
+import sys
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .engine import GameEngine, ShotResult
+from .models.board import Board
+from .models.computer_ai import ComputerAI
+from .models.params import DEFAULT_PARAMS, params_from_dict
+from .models.ship import Ship
+from .replay import ship_origin
+
+MAGIC = b"BSSN"
+VERSION = 3
+
+# Versions lisibles (la version 1 ne stockait ni profil ni réglages ; les
+# versions 1 et 2 stockaient l'empreinte des tirs de chaque IA, désormais
+# tenue par les plateaux)
+_READABLE_VERSIONS = (1, 2, 3)
+
+# Mots de l'état interne d'un Mersenne Twister (624 + position)
+_RNG_WORDS = 625
+
+
+def _cell_typecode(size: int) -> str:
+    """Type ``array`` des cases d'un plateau : le plus étroit possible."""
+    cells = size * size
+    if cells <= 1 << 8:
+        return "B"
+    return "H" if cells <= 1 << 16 else "I"
+
+
+class Snapshot(NamedTuple):
+    """
+    Contenu décodé d'un instantané.
+
+    Attributes:
+        boards (Tuple[Board, ...]): Plateaux restaurés
+        ais (Tuple[Tuple[ComputerAI, int], ...]): IA et indice du plateau visé
+        counters (Tuple[int, ...]): Compteurs propres à l'appelant
+    """
+    boards: Tuple[Board, ...]
+    ais: Tuple[Tuple[ComputerAI, int], ...]
+    counters: Tuple[int, ...]
+
+
+def _put_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_text(out: bytearray, text: str):
+    encoded = text.encode("utf-8")
+    _put_varint(out, len(encoded))
+    out += encoded
+
+
+def _put_cells(out: bytearray, cells: Sequence[Tuple[int, int]], size: int):
+    _put_varint(out, len(cells))
+    for x, y in cells:
+        _put_varint(out, y * size + x)
+
+
+def encode_snapshot(boards: Sequence[Board],
+                    ais: Sequence[Tuple[ComputerAI, int]] = (),
+                    counters: Sequence[int] = (),
+                    include_rng: bool = True) -> bytes:
+    """
+    Encode une partie en cours.
+
+    Args:
+        boards (Sequence[Board]): Plateaux (de même taille)
+        ais (Sequence[Tuple[ComputerAI, int]]): IA et indice du plateau visé
+        counters (Sequence[int]): Entiers positifs propres à l'appelant
+        include_rng (bool): Stocke l'état des générateurs des IA (2,5 Ko
+            chacun) pour que la suite de la partie soit identique
+
+    Raises:
+        ValueError: Si un tir est hors du plateau
+    """
+    size = boards[0].size
+    typecode = _cell_typecode(size)
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    _put_varint(out, size)
+
+    rngs: List[random.Random] = []
+    if include_rng:
+        for ai, _ in ais:
+            if all(ai.rng is not rng for rng in rngs):
+                rngs.append(ai.rng)
+    _put_varint(out, len(rngs))
+    for rng in rngs:
+        _, words, gauss_next = rng.getstate()
+        out += struct.pack(f"<{_RNG_WORDS}I", *words)
+        if gauss_next is None:
+            out.append(0)
+        else:
+            out.append(1)
+            out += struct.pack("<d", gauss_next)
+
+    _put_varint(out, len(boards))
+    for board in boards:
+        _put_varint(out, len(board.ships))
+        for ship in board.ships:
+            x, y, horizontal = ship_origin(ship)
+            _put_text(out, ship.name)
+            _put_varint(out, ship.size)
+            _put_varint(out, (y * size + x) << 1 | horizontal)
+        shots = array(typecode, board.shot_indices())
+        if sys.byteorder == "big":
+            shots.byteswap()
+        _put_varint(out, len(shots))
+        out += shots.tobytes()
+
+    _put_varint(out, len(ais))
+    for ai, target in ais:
+        target_board = boards[target]
+        _put_varint(out, target)
+        rng_index = next((i for i, rng in enumerate(rngs) if rng is ai.rng), None)
+        _put_varint(out, 0 if rng_index is None else rng_index + 1)
+        _put_text(out, ai.difficulty)
+        if ai.time_budget is None:
+            out.append(0)
+        else:
+            out.append(1)
+            out += struct.pack("<d", ai.time_budget)
+        out.append(ai.use_book)
+        _put_text(out, ai.profile or "")
+        changed = [(name, value) for name, value in ai.params._asdict().items()
+                   if value != getattr(DEFAULT_PARAMS, name)]
+        _put_varint(out, len(changed))
+        for name, value in changed:
+            _put_text(out, name)
+            out += struct.pack("<d", value)
+        _put_varint(out, len(ai.ships_config))
+        for name, length in ai.ships_config.items():
+            _put_text(out, name)
+            _put_varint(out, length)
+        last_hit = ai.last_hit
+        _put_varint(out, 0 if last_hit is None else last_hit[1] * size + last_hit[0] + 1)
+        _put_cells(out, ai.potential_targets, size)
+        _put_cells(out, ai.successful_hits, size)
+        _put_varint(out, len(ai.sunk_ships))
+        for ship in ai.sunk_ships:
+            _put_varint(out, target_board.ships.index(ship))
+
+    _put_varint(out, len(counters))
+    for value in counters:
+        _put_varint(out, value)
+    return bytes(out)
+
+
+class _Reader:
+    """Lecture séquentielle d'un instantané en mémoire."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def varint(self) -> int:
+        data = self.data
+        value = 0
+        shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def raw(self, length: int) -> bytes:
+        start = self.pos
+        self.pos += length
+        if self.pos > len(self.data):
+            raise IndexError(self.pos)
+        return self.data[start:self.pos]
+
+    def text(self) -> str:
+        return self.raw(self.varint()).decode("utf-8")
+
+    def double(self) -> Optional[float]:
+        if not self.raw(1)[0]:
+            return None
+        return struct.unpack("<d", self.raw(8))[0]
+
+    def cells(self, size: int) -> List[Tuple[int, int]]:
+        cells = []
+        for _ in range(self.varint()):
+            index = self.varint()
+            cells.append((index % size, index // size))
+        return cells
+
+
+def decode_snapshot(data: bytes) -> Snapshot:
+    """
+    Restaure une partie encodée par ``encode_snapshot``.
+
+    Raises:
+        ValueError: Si les données ne sont pas un instantané valide
+    """
+    if data[:len(MAGIC)] != MAGIC or len(data) <= len(MAGIC):
+        raise ValueError("Instantané de partie invalide")
+    version = data[len(MAGIC)]
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Version d'instantané non prise en charge : {version}")
+    reader = _Reader(data)
+    reader.pos = len(MAGIC) + 1
+    try:
+        return _decode(reader, version)
+    except (IndexError, struct.error, UnicodeDecodeError):
+        raise ValueError("Instantané de partie tronqué") from None
+
+
+def _decode(reader: _Reader, version: int) -> Snapshot:
+    size = reader.varint()
+    typecode = _cell_typecode(size)
+
+    rngs = []
+    for _ in range(reader.varint()):
+        words = struct.unpack(f"<{_RNG_WORDS}I", reader.raw(4 * _RNG_WORDS))
+        rng = random.Random()
+        rng.setstate((3, words, reader.double()))
+        rngs.append(rng)
+
+    boards = []
+    for _ in range(reader.varint()):
+        board = Board(size)
+        for _ in range(reader.varint()):
+            name = reader.text()
+            length = reader.varint()
+            value = reader.varint()
+            index = value >> 1
+            x, y, horizontal = index % size, index // size, bool(value & 1)
+            if not board.place_ship(Ship(name, length), x, y, horizontal):
+                raise ValueError(f"Placement invalide pour {name} en ({x}, {y})")
+        shots = array(typecode)
+        shots.frombytes(reader.raw(shots.itemsize * reader.varint()))
+        if sys.byteorder == "big":
+            shots.byteswap()
+        board.receive_shots(shots)
+        boards.append(board)
+
+    ais = []
+    for _ in range(reader.varint()):
+        target = reader.varint()
+        rng_index = reader.varint()
+        rng = rngs[rng_index - 1] if rng_index else None
+        difficulty = reader.text()
+        time_budget = reader.double()
+        use_book = bool(reader.raw(1)[0])
+        profile, values = None, {}
+        if version >= 2:
+            profile = reader.text() or None
+            for _ in range(reader.varint()):
+                name = reader.text()
+                values[name] = struct.unpack("<d", reader.raw(8))[0]
+        ships_config: Dict[str, int] = {}
+        for _ in range(reader.varint()):
+            name = reader.text()
+            ships_config[name] = reader.varint()
+        ai = ComputerAI(difficulty, rng, ships_config, time_budget, use_book,
+                        params_from_dict(values))
+        ai.use_book = use_book
+        ai.profile = profile
+        last_hit = reader.varint()
+        if last_hit:
+            ai.last_hit = ((last_hit - 1) % size, (last_hit - 1) // size)
+        ai.potential_targets = reader.cells(size)
+        ai.successful_hits = reader.cells(size)
+        target_ships = boards[target].ships
+        for _ in range(reader.varint()):
+            ai._count_sunk(target_ships[reader.varint()])
+        if version < 3:
+            reader.raw(8)
+            reader.varint()
+        ais.append((ai, target))
+
+    counters = tuple(reader.varint() for _ in range(reader.varint()))
+    return Snapshot(tuple(boards), tuple(ais), counters)
+
+
+def snapshot_engine(engine: GameEngine, include_rng: bool = True) -> bytes:
+    """
+    Encode l'état d'un ``GameEngine`` dont les tireurs sont des ``ComputerAI``.
+
+    Raises:
+        ValueError: Si un tireur n'est pas une ``ComputerAI``
+    """
+    for shooter in engine.shooters:
+        if not isinstance(shooter, ComputerAI):
+            raise ValueError(f"Tireur non sérialisable : {type(shooter).__name__}")
+    ais = [(shooter, 1 - side) for side, shooter in enumerate(engine.shooters)]
+    counters = (engine.current, engine.history is not None)
+    return encode_snapshot(engine.boards, ais, counters, include_rng)
+
+
+def restore_engine(data: bytes) -> GameEngine:
+    """
+    Restaure un ``GameEngine`` encodé par ``snapshot_engine``.
+
+    Les statistiques, le vainqueur et l'historique (si la partie était
+    enregistrée) sont reconstruits à partir des tirs : les camps jouent
+    à tour de rôle.
+    """
+    snapshot = decode_snapshot(data)
+    current, record = snapshot.counters
+    shooters = [ai for ai, _ in snapshot.ais]
+    engine = GameEngine(snapshot.boards, shooters, current, bool(record))
+
+    for side in range(2):
+        target = snapshot.boards[1 - side]
+        engine.stats['shots'][side] = len(target.shots)
+        engine.stats['hits'][side] = (sum(ship.size for ship in target.ships)
+                                      - target.hit_points_left)
+        if target.all_ships_sunk() and target.ships:
+            engine.winner = side
+
+    if engine.history is not None:
+        # Résultat de chaque tir ; un navire est coulé par sa dernière touche
+        results = []
+        for board in snapshot.boards:
+            hits = [board.grid[y][x] for x, y in board.shots]
+            sinking = {ship: turn for turn, ship in enumerate(hits)
+                       if ship is not None and ship.is_sunk()}
+            results.append([
+                (x, y, ship is not None,
+                 ship if sinking.get(ship) == turn else None)
+                for turn, ((x, y), ship) in enumerate(zip(board.shots, hits))
+            ])
+        total = len(results[0]) + len(results[1])
+        shooter = current if total % 2 == 0 else 1 - current
+        turns = [0, 0]
+        for _ in range(total):
+            engine.history.append(
+                ShotResult(shooter, *results[1 - shooter][turns[shooter]])
+            )
+            turns[shooter] += 1
+            shooter = 1 - shooter
+    return engine
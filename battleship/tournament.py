@@ -0,0 +1,272 @@
+"""
+Tournoi multi-processus entre configurations d'IA.
+
+Chaque confrontation est découpée en lots de parties. Chaque lot a sa propre
+graine, dérivée de la graine maîtresse et de son indice : le résultat ne
+dépend donc ni du nombre de processus ni de l'ordre d'arrivée des lots.
+
+Avec ``--shared-cache N``, N parties d'échauffement par confrontation sont
+jouées dans le processus principal ; les décisions apprises par sa table de
+transposition sont publiées en mémoire partagée, en lecture seule, et
+consultées par tous les processus de calcul (les résultats sont inchangés :
+seules les décisions déterministes sont mises en commun). Avec
+``--workers 1``, elles restent dans la table du processus qui joue les lots.
+
+Exemple :
+    python tournament.py --ai easy hard --games 100000 --seed 42 --workers 32
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from .models.layouts import RANDOM_PLACEMENT, fleet_placer
+from .models.params import is_known_difficulty
+from .models.transposition import POLICIES, configure_cache
+from .simulation import SimulationReport, play_games
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.959964
+
+
+class ChunkTask(NamedTuple):
+    """Lot de parties confié à un processus."""
+    pairing: Tuple[str, str]
+    chunk_index: int
+    games: int
+    master_seed: int
+    size: int
+    ships_config: Dict[str, int]
+    placement: Tuple[str, str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+
+
+def chunk_seed(master_seed: int, pairing: Tuple[str, str],
+               chunk_index: int) -> str:
+    """Graine déterministe d'un lot (indépendante du processus qui le joue)."""
+    return f"{master_seed}:{pairing[0]}:{pairing[1]}:{chunk_index}"
+
+
+def play_chunk(task: ChunkTask) -> Tuple[Tuple[str, str], SimulationReport]:
+    """Joue un lot de parties (exécuté dans un processus du pool)."""
+    rng = random.Random(chunk_seed(task.master_seed, task.pairing,
+                                   task.chunk_index))
+    report = play_games(task.games, task.pairing, rng, task.size,
+                        task.ships_config,
+                        first_offset=task.chunk_index * task.games,
+                        placement=task.placement)
+    return task.pairing, report
+
+
+def init_worker(cache_size: Optional[int], cache_policy: Optional[str],
+                table_name: Optional[str]):
+    """
+    Initialise un processus de calcul : réglage de la table de transposition
+    et, le cas échéant, branchement de la table partagée (les entrées
+    héritées du processus principal sont alors abandonnées).
+    """
+    from .models import transposition
+    cache = transposition.configure_cache(cache_size, cache_policy)
+    if table_name is not None:
+        cache.clear()
+        transposition.attach_shared_table(table_name)
+
+
+def make_tasks(strategies: Sequence[str], games: int, chunk_size: int,
+               master_seed: int, size: int = GRID_SIZE,
+               ships_config: Dict[str, int] = SHIPS_CONFIG,
+               placement: Tuple[str, str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+               ) -> List[ChunkTask]:
+    """Découpe toutes les confrontations du tournoi en lots."""
+    tasks = []
+    for pairing in itertools.combinations(strategies, 2):
+        for chunk_index, start in enumerate(range(0, games, chunk_size)):
+            count = min(chunk_size, games - start)
+            tasks.append(ChunkTask(pairing, chunk_index, count, master_seed,
+                                   size, ships_config, tuple(placement)))
+    return tasks
+
+
+def run_tournament(strategies: Sequence[str], games: int,
+                   master_seed: int = 0, chunk_size: int = 500,
+                   workers: Optional[int] = None, size: int = GRID_SIZE,
+                   ships_config: Dict[str, int] = SHIPS_CONFIG,
+                   cache_size: Optional[int] = None,
+                   cache_policy: Optional[str] = None,
+                   warmup_games: int = 0,
+                   placement: Tuple[str, str] = (RANDOM_PLACEMENT, RANDOM_PLACEMENT)
+                   ) -> Iterator[Tuple[Tuple[str, str], SimulationReport]]:
+    """
+    Lance le tournoi et renvoie les lots au fur et à mesure qu'ils finissent.
+
+    Args:
+        strategies (Sequence[str]): Difficultés de ``ComputerAI`` à opposer
+        games (int): Nombre de parties par confrontation
+        master_seed (int): Graine maîtresse du tournoi
+        chunk_size (int): Nombre de parties par lot
+        workers (Optional[int]): Nombre de processus (tous les cœurs par défaut)
+        size (int): Taille des plateaux
+        ships_config (Dict[str, int]): Flotte utilisée par les deux camps
+        cache_size (Optional[int]): Entrées de la table de transposition de
+            chaque processus (défaut : ``transposition.CACHE_SIZE``)
+        cache_policy (Optional[str]): Politique d'éviction de cette table
+        warmup_games (int): Parties d'échauffement par confrontation, dont
+            les décisions sont partagées en lecture seule entre processus ;
+            avec ``workers=1``, elles restent dans la table du processus,
+            qui joue ensuite les lots (et peut les évincer)
+        placement (Tuple[str, str]): Placement de la flotte du premier et du
+            second camp de chaque confrontation (voir ``fleet_placer``)
+
+    Yields:
+        Tuple[Tuple[str, str], SimulationReport]: Confrontation et rapport du lot
+    """
+    tasks = make_tasks(strategies, games, chunk_size, master_seed, size,
+                       ships_config, placement)
+    configure_cache(cache_size, cache_policy)
+    if warmup_games:
+        for pairing in itertools.combinations(strategies, 2):
+            play_games(warmup_games, pairing,
+                       random.Random(f"{master_seed}:warmup:{pairing}"),
+                       size, ships_config, placement=placement)
+    if workers == 1:
+        for task in tasks:
+            yield play_chunk(task)
+        return
+
+    table = None
+    if warmup_games:
+        from .models.transposition import SHARED_CACHE, SharedTable
+        table = SharedTable.publish(SHARED_CACHE)
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker,
+            initargs=(cache_size, cache_policy,
+                      table.name if table is not None else None)
+        ) as executor:
+            futures = [executor.submit(play_chunk, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        if table is not None:
+            table.close()
+
+
+def wilson_interval(successes: int, total: int,
+                    z: float = Z_95) -> Tuple[float, float]:
+    """Intervalle de confiance de Wilson pour une proportion."""
+    if not total:
+        return 0.0, 1.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total))
+    return max(0.0, centre - margin / denominator), min(1.0, centre + margin / denominator)
+
+
+def mean_interval(report: SimulationReport, side: int,
+                  z: float = Z_95) -> Optional[Tuple[float, float, float]]:
+    """Moyenne des tirs pour gagner et son intervalle de confiance."""
+    mean = report.mean_shots_to_win(side)
+    stdev = report.shots_to_win_stdev(side)
+    if mean is None or stdev is None:
+        return None
+    margin = z * stdev / math.sqrt(report.wins[side])
+    return mean, mean - margin, mean + margin
+
+
+def format_table(results: Dict[Tuple[str, str], SimulationReport]) -> str:
+    """Met en forme le tableau des résultats (IC à 95 %)."""
+    lines = [
+        f"{'IA 1':<10} {'IA 2':<10} {'Parties':>8} "
+        f"{'Victoires IA 1':>22} {'Tirs IA 1':>22} {'Tirs IA 2':>22}"
+    ]
+    for (first, second), report in sorted(results.items()):
+        low, high = wilson_interval(report.wins[0], report.games)
+        win_text = (f"{report.win_rate(0) * 100:5.1f}% "
+                    f"[{low * 100:.1f}-{high * 100:.1f}]")
+        shot_texts = []
+        for side in range(2):
+            interval = mean_interval(report, side)
+            shot_texts.append(
+                f"{interval[0]:6.2f} [{interval[1]:.2f}-{interval[2]:.2f}]"
+                if interval else "-"
+            )
+        lines.append(
+            f"{first:<10} {second:<10} {report.games:>8} "
+            f"{win_text:>22} {shot_texts[0]:>22} {shot_texts[1]:>22}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Tournoi entre configurations d'IA sur plusieurs processus."
+    )
+    parser.add_argument("--ai", nargs="+", default=["easy", "hard"],
+                        help="difficultés de ComputerAI ou profils réglés à opposer")
+    parser.add_argument("-n", "--games", type=int, default=10000,
+                        help="nombre de parties par confrontation")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="graine maîtresse du tournoi")
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="nombre de parties par lot")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille des plateaux")
+    parser.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    parser.add_argument("--cache-size", type=int, default=None,
+                        help="décisions gardées par la table de transposition "
+                             "de chaque processus (0 : désactivée)")
+    parser.add_argument("--cache-policy", choices=POLICIES, default=None,
+                        help="politique d'éviction de la table de transposition")
+    parser.add_argument("--shared-cache", type=int, default=0, metavar="N",
+                        help="joue N parties d'échauffement par confrontation "
+                             "et partage leurs décisions entre processus "
+                             "(mémoire partagée, lecture seule)")
+    parser.add_argument("--placement", nargs=2,
+                        default=[RANDOM_PLACEMENT, RANDOM_PLACEMENT],
+                        metavar=("FLOTTE1", "FLOTTE2"),
+                        help="placement de la flotte du premier et du second "
+                             "camp : 'random' ou IA dont elle doit déjouer les "
+                             "tirs (réserve précalculée)")
+    args = parser.parse_args(argv)
+    if args.cache_size is not None and args.cache_size < 0:
+        parser.error(f"Taille de table invalide : {args.cache_size}")
+    for difficulty in args.ai:
+        if not is_known_difficulty(difficulty):
+            parser.error(f"Difficulté ou profil inconnu : {difficulty}")
+    try:
+        for name in args.placement:
+            fleet_placer(name, args.size, args.fleet)
+    except ValueError as error:
+        parser.error(str(error))
+
+    results: Dict[Tuple[str, str], SimulationReport] = {}
+    start = time.perf_counter()
+    for pairing, report in run_tournament(args.ai, args.games, args.seed,
+                                          args.chunk_size, args.workers,
+                                          args.size, args.fleet,
+                                          args.cache_size, args.cache_policy,
+                                          args.shared_cache,
+                                          tuple(args.placement)):
+        results.setdefault(pairing, SimulationReport()).merge(report)
+    elapsed = time.perf_counter() - start
+
+    print(format_table(results))
+    total = sum(report.games for report in results.values())
+    workers = args.workers or os.cpu_count()
+    print(f"{total} parties en {elapsed:.1f}s "
+          f"({total / elapsed:.0f} parties/s, {workers} processus)")
+
+
+if __name__ == "__main__":
+    main()
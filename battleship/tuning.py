@@ -0,0 +1,272 @@
+"""
+Recherche parallèle des paramètres d'une stratégie par parties sans interface.
+
+Chaque configuration candidate joue des parties contre des flottes aléatoires
+et est jugée sur le nombre moyen de tirs pour couler toute la flotte. La
+recherche procède par divisions successives (« successive halving ») : à
+chaque tour, les survivants jouent ``eta`` fois plus de parties et seul le
+meilleur ``1 / eta`` est conservé. Les parties sont découpées en lots joués
+sur un pool de processus ; la partie ``i`` utilise la même flotte pour tous
+les candidats, ce qui réduit la variance des comparaisons.
+
+La configuration par défaut fait toujours partie des candidats et sert de
+point de comparaison.
+
+Exemple :
+    python -m battleship.tuning --ai hard --candidates 32 --games 500 --name hard-tuned
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from .models.board import Board
+from .models.computer_ai import ComputerAI
+from .models.params import (DEFAULT_PARAMS, DEFAULT_PROFILES_PATH, DIFFICULTIES,
+                            SEARCH_SPACE, TUNABLE, StrategyParams, save_profile)
+from .models.placement import place_random_fleet
+from .tournament import Z_95
+from .utils.config import parse_fleet
+from .utils.constants import GRID_SIZE, SHIPS_CONFIG
+
+
+class EvalTask(NamedTuple):
+    """Lot de parties d'un candidat confié à un processus."""
+    candidate: int
+    difficulty: str
+    params: StrategyParams
+    first_game: int
+    games: int
+    seed: int
+    size: int
+    ships_config: Dict[str, int]
+
+
+class Candidate:
+    """
+    Configuration évaluée et ses statistiques cumulées.
+
+    Attributes:
+        params (StrategyParams): Réglages évalués
+        games (int): Parties jouées
+        shots (int): Somme des tirs nécessaires
+        shots_sq (int): Somme des carrés de ces tirs
+    """
+
+    def __init__(self, params: StrategyParams):
+        self.params = params
+        self.games = 0
+        self.shots = 0
+        self.shots_sq = 0
+
+    @property
+    def mean_shots(self) -> float:
+        return self.shots / self.games if self.games else math.inf
+
+    @property
+    def margin(self) -> float:
+        """Demi-largeur de l'intervalle de confiance à 95 % de la moyenne."""
+        if self.games < 2:
+            return math.inf
+        mean = self.mean_shots
+        variance = (self.shots_sq - self.games * mean * mean) / (self.games - 1)
+        return Z_95 * math.sqrt(max(variance, 0.0) / self.games)
+
+
+def shots_to_win(difficulty: str, params: StrategyParams, rng: random.Random,
+                 size: int = GRID_SIZE,
+                 ships_config: Dict[str, int] = SHIPS_CONFIG) -> int:
+    """Nombre de tirs nécessaires à une IA pour couler une flotte aléatoire."""
+    board = Board(size)
+    place_random_fleet(board, ships_config, rng)
+    ai = ComputerAI(difficulty, rng, ships_config, params=params)
+    shots = 0
+    while not board.all_ships_sunk():
+        x, y = ai.get_shot(board)
+        hit, ship = board.receive_shot(x, y)
+        shots += 1
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    return shots
+
+
+def evaluate(task: EvalTask) -> Tuple[int, int, int, int]:
+    """
+    Joue un lot (exécuté dans un processus du pool).
+
+    Returns:
+        Tuple[int, int, int, int]: Candidat, parties, somme des tirs et
+        somme de leurs carrés
+    """
+    total = total_sq = 0
+    for game in range(task.first_game, task.first_game + task.games):
+        rng = random.Random(f"{task.seed}:{game}")
+        shots = shots_to_win(task.difficulty, task.params, rng, task.size,
+                             task.ships_config)
+        total += shots
+        total_sq += shots * shots
+    return task.candidate, task.games, total, total_sq
+
+
+def sample_params(difficulty: str, rng: random.Random) -> StrategyParams:
+    """Tire des réglages au hasard dans l'espace de recherche de la difficulté."""
+    values = {}
+    for name in TUNABLE[difficulty]:
+        low, high, logarithmic = SEARCH_SPACE[name]
+        if isinstance(low, int):
+            values[name] = rng.randint(low, high)
+        elif logarithmic:
+            values[name] = round(math.exp(rng.uniform(math.log(low), math.log(high))), 3)
+        else:
+            values[name] = round(rng.uniform(low, high), 3)
+    return DEFAULT_PARAMS._replace(**values)
+
+
+def successive_halving(difficulty: str, candidates: int, games: int,
+                       eta: int = 2, seed: int = 0,
+                       workers: Optional[int] = None, size: int = GRID_SIZE,
+                       ships_config: Dict[str, int] = SHIPS_CONFIG,
+                       chunk_size: int = 250,
+                       progress: Optional[Callable[[int, List[Candidate]], None]] = None
+                       ) -> List[Candidate]:
+    """
+    Cherche les meilleurs réglages d'une difficulté.
+
+    Args:
+        difficulty (str): Stratégie de base réglée
+        candidates (int): Nombre de configurations tirées (défaut compris)
+        games (int): Parties jouées par chaque candidat au premier tour
+        eta (int): Facteur de réduction entre deux tours
+        seed (int): Graine des candidats et des parties
+        workers (Optional[int]): Nombre de processus (tous les cœurs par défaut)
+        size (int): Taille des plateaux
+        ships_config (Dict[str, int]): Flotte visée
+        chunk_size (int): Nombre de parties par lot
+        progress: Fonction appelée après chaque tour avec le numéro du tour
+            et les survivants classés
+
+    Returns:
+        List[Candidate]: Candidats classés (le vainqueur en premier)
+    """
+    rng = random.Random(f"{seed}:candidats")
+    pool = [Candidate(DEFAULT_PARAMS)]
+    seen = {DEFAULT_PARAMS}
+    for _ in range(candidates * 10):
+        if len(pool) >= candidates:
+            break
+        params = sample_params(difficulty, rng)
+        if params not in seen:
+            seen.add(params)
+            pool.append(Candidate(params))
+
+    def ranking(group: List[Candidate]) -> List[Candidate]:
+        return sorted(group, key=lambda candidate: candidate.mean_shots)
+
+    executor = None
+    if workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        survivors = pool
+        target = games
+        round_number = 0
+        while True:
+            round_number += 1
+            tasks = []
+            for index, candidate in enumerate(pool):
+                if candidate not in survivors:
+                    continue
+                for start in range(candidate.games, target, chunk_size):
+                    tasks.append(EvalTask(index, difficulty, candidate.params,
+                                          start, min(chunk_size, target - start),
+                                          seed, size, ships_config))
+            results = (executor.map(evaluate, tasks) if executor is not None
+                       else map(evaluate, tasks))
+            for index, played, shots, shots_sq in results:
+                pool[index].games += played
+                pool[index].shots += shots
+                pool[index].shots_sq += shots_sq
+
+            survivors = ranking(survivors)
+            if progress:
+                progress(round_number, survivors)
+            if len(survivors) == 1:
+                break
+            survivors = survivors[:max(1, len(survivors) // eta)]
+            target *= eta
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Les survivants des derniers tours ont joué le plus de parties
+    return sorted(pool, key=lambda candidate: (-candidate.games, candidate.mean_shots))
+
+
+def format_candidate(candidate: Candidate, difficulty: str) -> str:
+    """Résumé d'un candidat (réglages influents, moyenne et IC à 95 %)."""
+    settings = ", ".join(f"{name}={getattr(candidate.params, name)}"
+                         for name in TUNABLE[difficulty]) or "-"
+    return (f"{candidate.mean_shots:7.2f} ± {candidate.margin:.2f} tirs "
+            f"({candidate.games} parties) {settings}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Règle les paramètres d'une IA par parties sans interface."
+    )
+    parser.add_argument("--ai", default="hard", choices=DIFFICULTIES,
+                        help="stratégie de base à régler")
+    parser.add_argument("--candidates", type=int, default=32,
+                        help="nombre de configurations évaluées")
+    parser.add_argument("-n", "--games", type=int, default=500,
+                        help="parties par candidat au premier tour")
+    parser.add_argument("--eta", type=int, default=2,
+                        help="facteur de réduction entre deux tours")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="graine des candidats et des parties")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("--chunk-size", type=int, default=250,
+                        help="nombre de parties par lot")
+    parser.add_argument("--size", type=int, default=GRID_SIZE,
+                        help="taille des plateaux")
+    parser.add_argument("--fleet", type=parse_fleet, default=SHIPS_CONFIG,
+                        help="flotte, ex. '5,4,3x2,2x2' (défaut : standard)")
+    parser.add_argument("--name", default=None,
+                        help="nom du profil enregistré (défaut : <ia>-tuned)")
+    parser.add_argument("-o", "--output", default=DEFAULT_PROFILES_PATH,
+                        help="fichier des profils")
+    args = parser.parse_args(argv)
+    if args.eta < 2:
+        parser.error("--eta doit être au moins 2")
+    if not TUNABLE[args.ai]:
+        parser.error(f"L'IA '{args.ai}' n'a pas de paramètre réglable")
+
+    def report_round(round_number: int, survivors: List[Candidate]):
+        print(f"Tour {round_number} : {len(survivors)} candidats, "
+              f"meilleur {format_candidate(survivors[0], args.ai)}", flush=True)
+
+    start = time.perf_counter()
+    ranked = successive_halving(args.ai, args.candidates, args.games, args.eta,
+                                args.seed, args.workers, args.size, args.fleet,
+                                args.chunk_size, report_round)
+    elapsed = time.perf_counter() - start
+    best = ranked[0]
+    default = next(candidate for candidate in ranked
+                   if candidate.params == DEFAULT_PARAMS)
+
+    print(f"Meilleur : {format_candidate(best, args.ai)}")
+    print(f"Défaut   : {format_candidate(default, args.ai)}")
+    name = args.name or f"{args.ai}-tuned"
+    save_profile(name, args.ai, best.params, args.output,
+                 mean_shots=round(best.mean_shots, 3), games=best.games,
+                 size=args.size, fleet=sorted(args.fleet.values(), reverse=True))
+    total = sum(candidate.games for candidate in ranked)
+    print(f"Profil '{name}' enregistré dans {args.output} "
+          f"({total} parties en {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Configuration des parties à l'exécution (taille du plateau et flotte).
+"""
+
+from typing import Dict, Optional, Sequence
+from .constants import SHIPS_CONFIG
+
+
+def make_fleet(lengths: Sequence[int]) -> Dict[str, int]:
+    """
+    Construit une flotte anonyme à partir d'une liste de longueurs.
+
+    Args:
+        lengths (Sequence[int]): Longueur de chaque navire
+
+    Returns:
+        Dict[str, int]: Flotte au format de ``SHIPS_CONFIG``
+    """
+    return {f"Navire {number}": length
+            for number, length in enumerate(lengths, start=1)}
+
+
+def parse_fleet(spec: str, max_ships: Optional[int] = None,
+                max_length: Optional[int] = None) -> Dict[str, int]:
+    """
+    Analyse une description textuelle de flotte.
+
+    La description est une liste de longueurs séparées par des virgules ;
+    ``LxN`` désigne N navires de longueur L. La valeur ``standard`` redonne
+    ``SHIPS_CONFIG``.
+
+    Exemples :
+        "5,4,3,3,2,2"  -> six navires
+        "5x10,3x200"   -> dix navires de 5 cases et deux cents de 3 cases
+
+    Les bornes sont vérifiées avant de développer ``LxN`` : une description
+    reçue d'un client ne peut pas faire allouer une flotte démesurée.
+
+    Args:
+        spec (str): Description de la flotte
+        max_ships (Optional[int]): Nombre maximal de navires
+        max_length (Optional[int]): Longueur maximale d'un navire
+
+    Raises:
+        ValueError: Si la description est invalide ou hors des bornes
+    """
+    if spec.strip().lower() in ("", "standard"):
+        return dict(SHIPS_CONFIG)
+
+    lengths = []
+    for part in spec.split(","):
+        length, _, count = part.strip().partition("x")
+        length = int(length)
+        count = int(count) if count else 1
+        if length < 1 or count < 1:
+            raise ValueError(f"Navire invalide : {part!r}")
+        if max_length is not None and length > max_length:
+            raise ValueError(f"Navire trop long : {part!r} (maximum {max_length})")
+        if max_ships is not None and len(lengths) + count > max_ships:
+            raise ValueError(f"Trop de navires (maximum {max_ships})")
+        lengths.extend([length] * count)
+    return make_fleet(lengths)
@@ -23,7 +23,11 @@ SHIPS_CONFIG = {
 }
 
 # États du jeu
-GAME_PHASES = ["placement", "playing", "game_over"]
+GAME_PHASES = ["placement", "playing", "computer_turn", "game_over"]
+
+# Tour de l'ordinateur (en millisecondes)
+AI_DELAY = 500          # Délai minimal avant d'afficher le tir de l'IA
+AI_POLL_INTERVAL = 20   # Période de consultation du calcul en cours
 
 # Messages
 PLACEMENT_MSG = "Placez votre {} ({} cases)"
@@ -31,6 +35,7 @@ TURN_MSG = "À vous de jouer !"
 HIT_MSG = "Touché !"
 SUNK_MSG = "Coulé !"
 MISS_MSG = "Manqué !"
+THINKING_MSG = "L'ordinateur réfléchit..."
 
 # Symboles
 HIT_SYMBOL = "✗"  # Croix pour les touches
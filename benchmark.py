@@ -0,0 +1,8 @@
+"""
+Script du banc d'essai des performances.
+"""
+
+from battleship.benchmark import main
+
+if __name__ == "__main__":
+    main()
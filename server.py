@@ -0,0 +1,8 @@
+"""
+Script du serveur de parties en réseau.
+"""
+
+from battleship.server import main
+
+if __name__ == "__main__":
+    main()
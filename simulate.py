@@ -0,0 +1,8 @@
+"""
+Script de simulation de parties sans interface graphique.
+"""
+
+from battleship.simulation import main
+
+if __name__ == "__main__":
+    main()
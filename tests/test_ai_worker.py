@@ -0,0 +1,103 @@
+"""Tests du calcul des coups en arrière-plan et de son annulation."""
+
+import random
+import threading
+import time
+from battleship.ai_worker import AIWorker
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.solver import MonteCarloTargeting
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+def wait(worker: AIWorker, ticket: int, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done, value = worker.poll(ticket)
+        if done:
+            return value
+        time.sleep(0.005)
+    raise AssertionError("calcul non terminé")
+
+
+def test_results_come_back_in_order():
+    worker = AIWorker()
+    tickets = [worker.submit(pow, 2, n) for n in range(5)]
+    assert [wait(worker, ticket) for ticket in tickets] == [1, 2, 4, 8, 16]
+    worker.close()
+
+
+def test_errors_are_raised_by_poll():
+    worker = AIWorker()
+    ticket = worker.submit(int, "x")
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            done, _ = worker.poll(ticket)
+        except ValueError:
+            break
+        time.sleep(0.005)
+    else:
+        raise AssertionError("exception non transmise")
+    worker.close()
+
+
+def test_cancel_interrupts_running_task_and_frees_worker():
+    worker = AIWorker()
+    started = threading.Event()
+
+    def long_task(cancel):
+        started.set()
+        return cancel.wait(30)
+
+    stale = worker.submit(long_task, cancellable=True)
+    assert started.wait(5)
+    begin = time.monotonic()
+    worker.cancel()
+    ticket = worker.submit(str, 42)
+    assert wait(worker, ticket) == "42"
+    assert time.monotonic() - begin < 5
+    assert worker.poll(stale) == (False, None)
+    worker.close()
+
+
+def test_cancelled_solver_stops_sampling():
+    board = Board(10)
+    cancel = threading.Event()
+    cancel.set()
+    solver = MonteCarloTargeting(10, SHIPS_CONFIG, random.Random(0),
+                                 time_budget=30.0)
+    solver.cancel = cancel
+    begin = time.monotonic()
+    solver.best_cell(board)
+    assert time.monotonic() - begin < 5
+    assert solver.last_samples < 64
+
+
+def test_solver_ai_honours_cancel_event():
+    ai = ComputerAI("solver", random.Random(0), time_budget=30.0)
+    cancel = threading.Event()
+    cancel.set()
+    begin = time.monotonic()
+    x, y = ai.get_shot(Board(10), cancel)
+    assert 0 <= x < 10 and 0 <= y < 10
+    assert time.monotonic() - begin < 5
+
+
+def test_cancellable_shot_with_instrumentation_enabled():
+    from battleship import instrumentation
+
+    instrumentation.enable()
+    worker = AIWorker()
+    try:
+        board = Board(10)
+        ai = ComputerAI("density", random.Random(0))
+        ticket = worker.submit(ai.get_shot, board, cancellable=True)
+        x, y = wait(worker, ticket)
+        assert 0 <= x < 10 and 0 <= y < 10
+        assert any(name.startswith("ai.")
+                   for name in instrumentation.snapshot()["timings_ns"])
+    finally:
+        worker.close()
+        instrumentation.disable()
+        instrumentation.reset()
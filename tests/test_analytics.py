@@ -0,0 +1,140 @@
+"""Tests des statistiques agrégées en flux."""
+
+import json
+import random
+import pytest
+from battleship import analytics
+from battleship.analytics import (GameAnalytics, histogram_quantile,
+                                  histogram_summary, iter_tasks, run_analytics)
+from battleship.simulation import play_games
+from battleship.tournament import chunk_seed
+
+SMALL_FLEET = {"Croiseur": 3, "Sous-marin": 3, "Torpilleur": 2}
+PAIRING = ("hard", "density")
+
+
+class _Records(list):
+    def write(self, record):
+        self.append(record)
+
+
+def play_records(games, chunk_size, seed=4):
+    """Parties des lots d'une confrontation, dans l'ordre."""
+    records = _Records()
+    for task in iter_tasks(PAIRING, games, chunk_size, seed, 7, SMALL_FLEET):
+        rng = random.Random(chunk_seed(seed, PAIRING, task.chunk_index))
+        play_games(task.games, PAIRING, rng, 7, SMALL_FLEET,
+                   first_offset=task.chunk_index * task.games, log=records)
+    return records
+
+
+def aggregate(records):
+    result = GameAnalytics(7, SMALL_FLEET, PAIRING)
+    for record in records:
+        result.write(record)
+    return result
+
+
+def test_histogram_helpers():
+    histogram = [0, 2, 0, 1, 1]
+    assert histogram_quantile(histogram, 0.5) == 1
+    assert histogram_quantile(histogram, 0.9) == 4
+    assert histogram_quantile([0, 0], 0.5) is None
+    summary = histogram_summary(histogram)
+    assert summary["count"] == 4
+    assert summary["mean"] == pytest.approx(2.25)
+    assert (summary["min"], summary["max"]) == (1, 4)
+    assert histogram_summary([0, 0])["mean"] is None
+
+
+def test_write_counts_every_shot():
+    records = play_records(6, 6)
+    result = aggregate(records)
+    assert result.games == 6
+    assert sum(result.wins) + result.unfinished == 6
+    for side in range(2):
+        shots = sum(1 for record in records for shot in record.shots
+                    if shot.shooter == side)
+        hits = sum(1 for record in records for shot in record.shots
+                   if shot.shooter == side and shot.hit)
+        assert sum(result.shots[side]) == sum(result.turn_shots[side]) == shots
+        assert sum(result.hits[side]) == sum(result.turn_hits[side]) == hits
+        assert sum(result.shots_to_win[side]) == result.wins[side]
+        # Chaque navire coulé par le camp entre dans un histogramme
+        assert sum(map(sum, result.shots_to_sink[side])) == sum(
+            1 for record in records for shot in record.shots
+            if shot.shooter == side and shot.sunk)
+
+
+def test_write_rejects_other_configuration():
+    records = play_records(1, 1)
+    with pytest.raises(ValueError):
+        GameAnalytics(8, SMALL_FLEET, PAIRING).write(records[0])
+
+
+def test_merge_equals_sequential_aggregation():
+    records = play_records(9, 9)
+    merged = GameAnalytics(7, SMALL_FLEET, PAIRING)
+    for start in range(0, 9, 4):
+        merged.merge(aggregate(records[start:start + 4]))
+    assert merged.to_dict() == aggregate(records).to_dict()
+
+
+def test_merge_rejects_other_configuration():
+    with pytest.raises(ValueError, match="différentes"):
+        GameAnalytics(7, SMALL_FLEET, PAIRING).merge(
+            GameAnalytics(7, SMALL_FLEET, ("easy", "hard")))
+
+
+def test_run_analytics_aggregates_tournament_games():
+    expected = aggregate(play_records(10, 4)).to_dict()
+    assert run_analytics(PAIRING, 10, 4, chunk_size=4, workers=1, size=7,
+                         ships_config=SMALL_FLEET).to_dict() == expected
+
+
+def test_workers_do_not_change_result():
+    sequential = run_analytics(PAIRING, 10, 4, chunk_size=3, workers=1,
+                               size=7, ships_config=SMALL_FLEET)
+    parallel = run_analytics(PAIRING, 10, 4, chunk_size=3, workers=2,
+                             size=7, ships_config=SMALL_FLEET)
+    assert parallel.to_dict() == sequential.to_dict()
+
+
+def test_dict_and_json_round_trip(tmp_path):
+    result = aggregate(play_records(5, 5))
+    assert GameAnalytics.from_dict(result.to_dict()).to_dict() == result.to_dict()
+    path = str(tmp_path / "stats.json")
+    result.write_json(path)
+    assert GameAnalytics.read_json(path).to_dict() == result.to_dict()
+
+
+def test_from_dict_rejects_invalid_documents():
+    data = GameAnalytics(7, SMALL_FLEET, PAIRING).to_dict()
+    with pytest.raises(ValueError, match="Version"):
+        GameAnalytics.from_dict(dict(data, version=99))
+    truncated = json.loads(json.dumps(data))
+    truncated["sides"][0]["shots"] = [0]
+    with pytest.raises(ValueError, match="taille"):
+        GameAnalytics.from_dict(truncated)
+    with pytest.raises(ValueError, match="invalides"):
+        GameAnalytics.from_dict({"version": data["version"]})
+
+
+def test_csv_export(tmp_path):
+    result = aggregate(play_records(3, 3))
+    result.write_csv(str(tmp_path))
+    heatmap = (tmp_path / "heatmap.csv").read_text(encoding="utf-8").splitlines()
+    assert heatmap[0] == "camp,x,y,tirs,touches"
+    assert len(heatmap) == 1 + 2 * 7 * 7
+    for name in ("shots_to_win.csv", "shots_to_sink.csv", "accuracy.csv"):
+        assert (tmp_path / name).exists()
+
+
+def test_main_merges_previous_export(tmp_path, capsys):
+    path = str(tmp_path / "stats.json")
+    arguments = ["--ai", *PAIRING, "-n", "4", "--chunk-size", "2",
+                 "--workers", "1", "--size", "7", "--fleet", "3x2,2"]
+    analytics.main(arguments + ["--json", path])
+    analytics.main(arguments + ["--seed", "1", "--merge", path, "--json", path])
+    assert GameAnalytics.read_json(path).games == 8
+    assert "Parties agrégées : 8" in capsys.readouterr().out
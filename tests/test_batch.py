@@ -0,0 +1,61 @@
+"""Tests du moteur de parties par lots (NumPy)."""
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from battleship.batch import BatchGames, placement_cells, play_batch
+from battleship.simulation import play_games
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+def test_placement_cells_lists_every_segment():
+    table = placement_cells(10, 3)
+    assert table.shape == (2 * 8 * 10, 3)
+    assert tuple(table[0]) == (0, 1, 2)
+    assert tuple(table[80]) == (0, 10, 20)
+    assert placement_cells(5, 1).shape == (25, 1)
+
+
+def test_fleets_are_valid():
+    batch = BatchGames(50, ("easy", "easy"), seed=1)
+    lengths = list(SHIPS_CONFIG.values())
+    for board in batch.ship_ids:
+        for number, length in enumerate(lengths, start=1):
+            cells = np.flatnonzero(board == number)
+            assert len(cells) == length
+            rows = placement_cells(10, length)
+            assert (rows == cells).all(axis=1).any()
+
+
+def test_games_finish_with_consistent_counters():
+    batch = BatchGames(200, ("hard", "easy"), seed=2, first_offset=1)
+    batch.play()
+    assert not batch.active.any()
+    fleet = sum(SHIPS_CONFIG.values())
+    for game, side in enumerate(batch.winner.tolist()):
+        shooter = 2 * game + side
+        assert batch.hits[shooter] == fleet
+        assert fleet <= batch.shots_fired[shooter] <= 100
+        assert batch.shot[2 * game + 1 - side].sum() == batch.shots_fired[shooter]
+    report = batch.report()
+    assert report.games == 200 and sum(report.wins) == 200
+
+
+def test_same_seed_same_statistics():
+    first = play_batch(300, ("hard", "easy"), seed=5, batch_size=128)
+    second = play_batch(300, ("hard", "easy"), seed=5, batch_size=128)
+    assert (first.wins, first.winning_shots) == (second.wins, second.winning_shots)
+
+
+def test_batch_matches_scalar_engine_statistically():
+    batch = play_batch(3000, ("hard", "easy"), seed=0)
+    scalar = play_games(400, ("hard", "easy"), random.Random(0))
+    assert abs(batch.win_rate(0) - scalar.win_rate(0)) < 0.08
+    assert abs(batch.mean_shots_to_win(0) - scalar.mean_shots_to_win(0)) < 4
+
+
+def test_unsupported_difficulty():
+    with pytest.raises(ValueError):
+        BatchGames(1, ("density", "easy"))
@@ -0,0 +1,76 @@
+"""Tests du banc de performance (comparaison à la référence)."""
+
+import os
+import random
+import pytest
+from battleship import benchmark
+
+
+def test_default_baseline_is_committed():
+    assert os.path.exists(benchmark.DEFAULT_BASELINE)
+
+
+def test_missing_baseline_fails(tmp_path):
+    missing = str(tmp_path / "absente.json")
+    with pytest.raises(SystemExit) as error:
+        benchmark.main(["--baseline", missing, "--quick", "--sizes", "10"])
+    assert error.value.code != 0
+
+
+def test_compare_reports_slower_and_lower_throughput():
+    baseline = {"a": {"p50_us": 10.0, "ops_per_sec": 1000.0},
+                "b": {"p50_us": 10.0, "ops_per_sec": 1000.0}}
+    results = {"a": {"p50_us": 11.0, "ops_per_sec": 900.0},
+               "b": {"p50_us": 20.0, "ops_per_sec": 500.0}}
+    regressions = benchmark.compare(results, baseline, 0.25)
+    assert len(regressions) == 2
+    assert all(line.startswith("b:") for line in regressions)
+
+
+def test_import_budgets_scale_with_interpreter_startup():
+    imports = benchmark.check_imports({"battleship.engine": 2.0}, repeats=1,
+                                      startup_ms=1000.0)
+    result = imports["battleship.engine"]
+    assert result["budget_ms"] == 2000.0
+    assert result["forbidden"] == []
+    assert benchmark.import_problems(imports) == []
+
+
+def test_import_problems_reports_budget_and_forbidden_modules():
+    imports = {"a": {"import_ms": 30.0, "budget": 1.0, "budget_ms": 20.0,
+                     "forbidden": []},
+               "b": {"import_ms": 5.0, "budget": 1.0, "budget_ms": 20.0,
+                     "forbidden": ["numpy"]}}
+    problems = benchmark.import_problems(imports)
+    assert problems == ["a: import 30.0ms (budget 20.0ms)", "b: charge numpy"]
+
+
+def test_get_shot_bench_computes_every_move(monkeypatch):
+    from battleship.models import opening_book, transposition
+
+    def forbidden(*args):
+        raise AssertionError("coup lu dans le livre")
+
+    cache = transposition.SHARED_CACHE
+    saved = cache.max_size
+    monkeypatch.setattr(opening_book, "default_book", forbidden)
+    timings = benchmark.bench_get_shot("density", 10, 120, random.Random(0))
+    assert len(timings.samples) == 120
+    assert cache.max_size == saved and len(cache) == 0
+    assert cache.hits == cache.misses == 0
+
+
+def test_book_bench_uses_book_and_cache(monkeypatch):
+    from battleship.models import opening_book, transposition
+
+    calls = []
+    default_book = opening_book.default_book
+    monkeypatch.setattr(opening_book, "default_book",
+                        lambda: calls.append(1) or default_book())
+    timings = benchmark.bench_get_shot("density", 10, 120, random.Random(0),
+                                       use_book=True)
+    assert len(timings.samples) == 120
+    assert calls
+    assert len(transposition.SHARED_CACHE) == 0
+    names = benchmark.run_benchmarks(sizes=(10,), scale=0.001).keys()
+    assert "ai.get_shot.density.book[10]" in names
@@ -0,0 +1,165 @@
+"""Tests du plateau : tirs, touches et navires coulés."""
+
+import random
+
+from battleship.models.board import Board
+from battleship.models.placement import place_random_fleet
+from battleship.models.ship import Ship
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+def make_board(size=10):
+    board = Board(size)
+    destroyer = Ship("Destroyer", 2)
+    cruiser = Ship("Cruiser", 3)
+    assert board.place_ship(destroyer, 0, 0, True)
+    assert board.place_ship(cruiser, 5, 2, False)
+    return board, destroyer, cruiser
+
+
+def test_place_ship_rejects_overlap_and_overflow():
+    board, _, _ = make_board()
+    assert not board.place_ship(Ship("Sub", 3), 1, 0, False)
+    assert not board.place_ship(Ship("Sub", 3), 8, 0, True)
+    assert not board.place_ship(Ship("Sub", 3), 0, 8, False)
+    assert not board.can_place_ship(Ship("Sub", 3), -1, 0, True)
+    assert board.can_place_ship(Ship("Sub", 3), 7, 9, True)
+    assert len(board.ships) == 2
+
+
+def test_miss_hit_and_sunk():
+    board, destroyer, _ = make_board()
+    assert board.receive_shot(9, 9) == (False, None)
+    assert board.is_shot(9, 9) and not board.is_hit(9, 9)
+
+    assert board.receive_shot(0, 0) == (True, None)
+    assert board.is_hit(0, 0)
+    assert board.receive_shot(1, 0) == (True, destroyer)
+    assert destroyer.is_sunk()
+    assert board.sunk_ships == [destroyer]
+    assert not board.all_ships_sunk()
+
+
+def test_repeated_shot_is_logged_but_counted_once():
+    board, _, _ = make_board()
+    board.receive_shot(0, 0)
+    board.receive_shot(0, 0)
+    board.receive_shot(4, 4)
+    assert list(board.shots) == [(0, 0), (0, 0), (4, 4)]
+    assert board.shot_count == 2
+    assert board.hit_points_left == 4
+
+
+def test_out_of_board_shot_is_a_miss():
+    board, _, _ = make_board()
+    assert board.receive_shot(10, 0) == (False, None)
+    assert board.receive_shot(-1, 3) == (False, None)
+    assert board.shot_count == 0
+    assert not board.is_shot(10, 0)
+
+
+def test_masks_match_cell_queries():
+    board, _, _ = make_board()
+    for x, y in [(0, 0), (3, 3), (5, 3), (7, 7)]:
+        board.receive_shot(x, y)
+    size = board.size
+    for y in range(size):
+        for x in range(size):
+            bit = 1 << (y * size + x)
+            assert bool(board.shot_mask & bit) == board.is_shot(x, y)
+            assert bool(board.hit_mask & bit) == board.is_hit(x, y)
+            assert bool(board.ship_mask & bit) == (board.grid[y][x] is not None)
+    assert board.miss_mask == board.shot_mask & ~board.hit_mask
+
+
+def test_can_place_ship_matches_cell_by_cell_check():
+    board = Board(8)
+    place_random_fleet(board, {"A": 4, "B": 3, "C": 2}, random.Random(5))
+    for length in (1, 2, 3, 5):
+        for horizontal in (True, False):
+            for y in range(-1, 9):
+                for x in range(-1, 9):
+                    cells = [(x + i, y) if horizontal else (x, y + i)
+                             for i in range(length)]
+                    expected = all(0 <= cx < 8 and 0 <= cy < 8
+                                   and board.grid[cy][cx] is None
+                                   for cx, cy in cells)
+                    assert board.can_place_ship(Ship("X", length), x, y,
+                                                horizontal) == expected
+
+
+def test_masks_are_kept_up_to_date():
+    board, _, _ = make_board()
+    assert board.ship_mask == 0b11 | (1 << 25) | (1 << 35) | (1 << 45)
+    board.receive_shot(0, 0)
+    board.receive_shot(9, 9)
+    restored, _, _ = make_board()
+    restored.receive_shots([0, 99])
+    for copy in (board, restored):
+        assert copy.shot_mask == 1 | (1 << 99)
+        assert copy.hit_mask == 1
+        assert copy.miss_mask == 1 << 99
+
+
+def test_all_ships_sunk_and_unshot_cells():
+    board, destroyer, cruiser = make_board()
+    for ship in (destroyer, cruiser):
+        for x, y in ship.positions:
+            board.receive_shot(x, y)
+    assert board.all_ships_sunk()
+    assert board.ships_left == 0
+    assert len(board.unshot_cells()) == board.size ** 2 - 5
+
+
+def test_segment_mask():
+    board = Board(10)
+    assert board.segment_mask(2, 3, 3, True) == 0b111 << 32
+    assert board.segment_mask(2, 3, 2, False) == (1 << 32) | (1 << 42)
+    assert board.segment_mask(8, 0, 3, True) == 0
+    assert board.segment_mask(0, 8, 3, False) == 0
+
+
+def test_large_board_with_custom_fleet():
+    import random
+    from battleship.models.placement import place_random_fleet
+    from battleship.utils.config import parse_fleet
+
+    board = Board(1000)
+    fleet = parse_fleet("5x20,3x50,2x100")
+    ships = place_random_fleet(board, fleet, random.Random(3))
+    assert len(ships) == 170
+    assert board.hit_points_left == 5 * 20 + 3 * 50 + 2 * 100
+    ship = ships[0]
+    for x, y in ship.positions:
+        hit, sunk = board.receive_shot(x, y)
+        assert hit
+    assert sunk is ship
+    assert board.receive_shot(999, 999)[0] == (board.grid[999][999] is not None)
+
+
+def scanned_status(board):
+    """État de la flotte recalculé en parcourant tous les navires."""
+    sunk = [ship for ship in board.ships if ship.is_sunk()]
+    return (len(board.ships) - len(sunk), {id(ship) for ship in sunk},
+            sum(ship.size - ship.hit_count for ship in board.ships))
+
+
+def test_fleet_status_matches_full_scan():
+    rng = random.Random(5)
+    board, replayed = Board(10), Board(10)
+    place_random_fleet(board, SHIPS_CONFIG, random.Random(1))
+    place_random_fleet(replayed, SHIPS_CONFIG, random.Random(1))
+    assert board.ship_names == set(SHIPS_CONFIG)
+    cells = rng.sample(range(100), 100)
+    for turn, index in enumerate(cells):
+        board.receive_shot(index % 10, index // 10)
+        left, sunk, points = scanned_status(board)
+        assert board.ships_left == left
+        assert {id(ship) for ship in board.sunk_ships} == sunk
+        assert len(board.sunk_ships) == len(sunk)
+        assert board.hit_points_left == points
+        assert board.all_ships_sunk() == (points == 0)
+    replayed.receive_shots(cells)
+    assert replayed.ships_left == 0 and replayed.hit_points_left == 0
+    assert [ship.name for ship in replayed.sunk_ships] == \
+        [ship.name for ship in board.sunk_ships]
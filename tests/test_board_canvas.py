@@ -0,0 +1,60 @@
+"""Tests de l'affichage des plateaux (ignorés sans affichage graphique)."""
+
+import types
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from battleship.board_canvas import MAX_GRID_PIXELS, BoardCanvas
+from battleship.utils.constants import WATER_COLOR
+
+
+@pytest.fixture
+def root():
+    try:
+        window = tk.Tk()
+    except tk.TclError:
+        pytest.skip("aucun affichage graphique")
+    window.withdraw()
+    yield window
+    window.destroy()
+
+
+def test_changes_are_drawn_in_one_batch(root):
+    canvas = BoardCanvas(root, 10)
+    canvas.set_cell(1, 2, "red", "X")
+    canvas.set_cell(3, 4, "blue")
+    assert not canvas.find_withtag("cell")
+    root.update()
+    assert len(canvas.find_withtag("cell")) == 4
+    rectangle, text = canvas._items[(1, 2)]
+    assert canvas.itemcget(rectangle, "fill") == "red"
+    assert canvas.itemcget(text, "text") == "X"
+
+
+def test_unchanged_cells_are_not_redrawn(root):
+    canvas = BoardCanvas(root, 10)
+    canvas.set_cell(0, 0, WATER_COLOR)
+    assert not canvas._dirty
+    canvas.set_cell(0, 0, "red")
+    canvas.flush()
+    canvas.set_cell(0, 0, "red")
+    assert not canvas._dirty
+
+
+def test_reset_removes_cells(root):
+    canvas = BoardCanvas(root, 10)
+    canvas.set_cell(5, 5, "red")
+    canvas.flush()
+    canvas.reset()
+    assert not canvas.find_withtag("cell") and not canvas._items
+
+
+def test_large_boards_fit_and_clicks_map_to_cells(root):
+    clicks = []
+    canvas = BoardCanvas(root, 200, on_click=lambda x, y: clicks.append((x, y)))
+    assert canvas.size * canvas.cell_size <= max(MAX_GRID_PIXELS, 2 * 200)
+    cell = canvas.cell_size
+    canvas._clicked(types.SimpleNamespace(x=3 * cell + 1, y=7 * cell))
+    canvas._clicked(types.SimpleNamespace(x=200 * cell, y=0))
+    assert clicks == [(3, 7)]
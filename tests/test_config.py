@@ -0,0 +1,32 @@
+"""Tests de l'analyse des flottes."""
+
+import pytest
+from battleship.utils.config import parse_fleet
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+def test_parse_fleet_expands_counts():
+    fleet = parse_fleet("5,3x2, 2")
+    assert list(fleet.values()) == [5, 3, 3, 2]
+    assert len(set(fleet)) == 4
+
+
+def test_parse_fleet_standard():
+    assert parse_fleet("standard") == SHIPS_CONFIG
+    assert parse_fleet("") == SHIPS_CONFIG
+
+
+@pytest.mark.parametrize("spec", ["0", "3x0", "a", "2x-1"])
+def test_parse_fleet_rejects_invalid_ships(spec):
+    with pytest.raises(ValueError):
+        parse_fleet(spec)
+
+
+def test_parse_fleet_bounds_are_checked_before_expansion():
+    with pytest.raises(ValueError, match="Trop de navires"):
+        parse_fleet("2x1000000000000", max_ships=500)
+    with pytest.raises(ValueError, match="Trop de navires"):
+        parse_fleet("2x300,3x201", max_ships=500)
+    with pytest.raises(ValueError, match="trop long"):
+        parse_fleet("11", max_length=10)
+    assert len(parse_fleet("2x300,3x200", max_ships=500, max_length=10)) == 500
@@ -0,0 +1,104 @@
+"""Tests de l'export en tableaux NumPy et de son analyse."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from battleship import dataset
+from battleship.dataset import (DatasetWriter, cell_statistics,
+                                mean_shots_to_sink, open_dataset)
+from battleship.simulation import play_games
+from battleship.utils.config import parse_fleet
+
+
+class _Records:
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+def expected_shots_to_sink(records, fleet):
+    """Référence en Python pur : tour de la dernière touche de chaque navire."""
+    totals = [0] * len(fleet)
+    counts = [0] * len(fleet)
+    for record in records:
+        for side in range(2):
+            turn = 0
+            for shot in record.shots:
+                if shot.shooter != 1 - side:
+                    continue
+                turn += 1
+                if shot.sunk:
+                    for number, ((_, length), (x, y, horizontal)) in enumerate(
+                            zip(record.fleet, record.placements[side])):
+                        cells = [(x + i, y) if horizontal else (x, y + i)
+                                 for i in range(length)]
+                        if (shot.x, shot.y) in cells:
+                            totals[number] += turn
+                            counts[number] += 1
+    return {name: totals[number] / counts[number]
+            for number, (name, _) in enumerate(fleet)}
+
+
+@pytest.fixture
+def exported(tmp_path):
+    fleet = parse_fleet("4,3x2,2x2")
+    log = _Records()
+    play_games(40, ("hard", "easy"), random.Random(5), 8, fleet, log=log)
+    with DatasetWriter(str(tmp_path), 8, fleet) as writer:
+        for record in log.records:
+            writer.write(record)
+    return open_dataset(str(tmp_path)), log.records, list(fleet.items())
+
+
+def test_export_shapes(exported):
+    data, records, _ = exported
+    assert data["meta"]["rows"] == 2 * len(records)
+    assert data["shots"].shape == (80, 64)
+    assert (data["layout"] > 0).sum(axis=1).tolist() == [14] * 80
+
+
+@pytest.mark.parametrize("budget", [dataset.ANALYSIS_BYTES, 64 * 8 * 3])
+def test_mean_shots_to_sink_matches_reference(exported, monkeypatch, budget):
+    monkeypatch.setattr(dataset, "ANALYSIS_BYTES", budget)
+    data, records, fleet = exported
+    expected = expected_shots_to_sink(records, fleet)
+    assert mean_shots_to_sink(data) == pytest.approx(expected)
+
+
+def test_cell_statistics_independent_of_block_size(exported, monkeypatch):
+    data, _, _ = exported
+    occupancy, hit_rate = cell_statistics(data)
+    monkeypatch.setattr(dataset, "ANALYSIS_BYTES", 64 * 8)
+    small_occupancy, small_hit_rate = cell_statistics(data)
+    assert occupancy.sum() == pytest.approx(14)
+    np.testing.assert_allclose(small_occupancy, occupancy)
+    np.testing.assert_allclose(small_hit_rate, hit_rate)
+
+
+def test_writer_rejects_records_outside_the_dataset(tmp_path):
+    fleet = parse_fleet("4,3,2")
+    log = _Records()
+    play_games(1, ("hard", "easy"), random.Random(2), 8, fleet, log=log)
+    record = log.records[0]
+    shots = list(record.shots)
+    placements = [list(side) for side in record.placements]
+    placements[0][0] = (6, 0, True)
+    bad_records = [
+        record._replace(size=9),
+        record._replace(fleet=(("A", 4), ("B", 3), ("C", 3))),
+        record._replace(shots=tuple([shots[0]._replace(x=8)] + shots[1:])),
+        record._replace(shots=tuple([shots[0]._replace(y=-1)] + shots[1:])),
+        record._replace(placements=tuple(map(tuple, placements))),
+    ]
+    with DatasetWriter(str(tmp_path), 8, fleet) as writer:
+        for bad in bad_records:
+            with pytest.raises(ValueError):
+                writer.write(bad)
+        assert writer.rows == 0
+        writer.write(record)
+    assert open_dataset(str(tmp_path))["shots"].shape == (2, 64)
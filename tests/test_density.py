@@ -0,0 +1,110 @@
+"""Tests de la stratégie par densité de probabilité."""
+
+import random
+
+import pytest
+
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.placement import place_random_fleet
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+def play(ai, board):
+    """Joue une partie complète ; retourne la suite des tirs."""
+    shots = []
+    while not board.all_ships_sunk():
+        x, y = ai.get_shot(board)
+        assert not board.is_shot(x, y)
+        shots.append((x, y))
+        hit, ship = board.receive_shot(x, y)
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    return shots
+
+
+@pytest.mark.parametrize("size", [10, 16])
+def test_density_beats_random_shooting(size):
+    rng = random.Random(size)
+    total = 0
+    for _ in range(5):
+        board = Board(size)
+        place_random_fleet(board, SHIPS_CONFIG, rng)
+        total += len(play(ComputerAI("density", rng, use_book=False), board))
+    assert total / 5 < 0.6 * size * size
+
+
+def play_targeting(targeting, board):
+    shots = []
+    while not board.all_ships_sunk():
+        cell = targeting.best_cell(board)
+        shots.append(cell)
+        _, ship = board.receive_shot(*cell)
+        if ship is not None:
+            targeting.notify_sunk(ship)
+    return shots
+
+
+@pytest.mark.parametrize("size, smoothing", [(10, 0.0), (14, 0.5), (40, 0.0)])
+def test_vector_density_matches_pure_python(size, smoothing):
+    pytest.importorskip("numpy")
+    from battleship.models.density import DensityTargeting, VectorDensityTargeting
+
+    for seed in range(2):
+        boards = []
+        for _ in range(2):
+            board = Board(size)
+            place_random_fleet(board, SHIPS_CONFIG, random.Random(seed))
+            boards.append(board)
+        expected = play_targeting(
+            DensityTargeting(size, SHIPS_CONFIG, 16.0, smoothing), boards[0])
+        vector = play_targeting(
+            VectorDensityTargeting(size, SHIPS_CONFIG, 16.0, smoothing), boards[1])
+        assert vector == expected
+
+
+def test_make_density_targeting_picks_vector_path_on_large_boards():
+    pytest.importorskip("numpy")
+    from battleship.models.density import (VECTOR_MIN_SIZE, DensityTargeting,
+                                           VectorDensityTargeting,
+                                           make_density_targeting)
+
+    assert type(make_density_targeting(10, SHIPS_CONFIG)) is DensityTargeting
+    assert isinstance(make_density_targeting(VECTOR_MIN_SIZE, SHIPS_CONFIG),
+                      VectorDensityTargeting)
+
+
+def play_local(size, seed, **params):
+    from battleship.models.density import LocalDensityTargeting
+
+    board = Board(size)
+    place_random_fleet(board, SHIPS_CONFIG, random.Random(seed))
+    targeting = LocalDensityTargeting(size, SHIPS_CONFIG, random.Random(seed),
+                                      **params)
+    return play_targeting(targeting, board)
+
+
+def test_local_density_uses_target_weight_and_smoothing():
+    default = play_local(20, 4)
+    assert play_local(20, 4, target_weight=16, smoothing=0.0) == default
+    assert any(play_local(20, seed, target_weight=1.0) != play_local(20, seed)
+               for seed in range(5))
+    smoothed = play_local(20, 4, smoothing=0.5)
+    assert smoothed != default
+    assert len(set(smoothed)) == len(smoothed)
+
+
+def test_tuned_density_params_reach_large_boards():
+    from battleship.models.density import LocalDensityTargeting
+    from battleship.models.params import StrategyParams
+    from battleship.models.placement import uses_index
+
+    size = 80
+    assert not uses_index(size)
+    params = StrategyParams(target_weight=4.0, smoothing=0.25)
+    board = Board(size)
+    place_random_fleet(board, SHIPS_CONFIG, random.Random(0))
+    ai = ComputerAI("density", random.Random(0), params=params)
+    ai.get_shot(board)
+    assert isinstance(ai.density, LocalDensityTargeting)
+    assert (ai.density.target_weight, ai.density.smoothing) == (4.0, 0.25)
@@ -0,0 +1,86 @@
+"""Tests du moteur sans interface et de la simulation en masse."""
+
+import random
+import pytest
+from battleship.engine import GameEngine, ScriptedShooter
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.ship import Ship
+from battleship.simulation import SimulationReport, format_report, play_games, simulate
+
+
+def small_boards():
+    boards = []
+    for _ in range(2):
+        board = Board(3)
+        board.place_ship(Ship("a", 2), 0, 0, True)
+        boards.append(board)
+    return boards
+
+
+def test_scripted_game_is_won_by_first_to_sink():
+    shooters = [ScriptedShooter([(2, 2), (0, 0), (1, 0)]),
+                ScriptedShooter([(0, 0), (1, 1), (2, 1)])]
+    engine = GameEngine(small_boards(), shooters, record=True)
+    result = engine.play()
+    assert result.winner == 0
+    assert result.shots == (3, 2) and result.hits == (2, 1)
+    assert result.winner_shots == 3
+    assert [(shot.shooter, shot.x, shot.y) for shot in engine.history][:2] == \
+        [(0, 2, 2), (1, 0, 0)]
+    assert engine.history[-1].sunk is not None
+    with pytest.raises(RuntimeError):
+        engine.step()
+
+
+def test_repeated_shot_is_rejected():
+    engine = GameEngine(small_boards(), [ScriptedShooter([(1, 1), (1, 1)]),
+                                         ScriptedShooter([(2, 2)])])
+    engine.step()
+    engine.step()
+    with pytest.raises(ValueError):
+        engine.step()
+
+
+def test_exhausted_script_raises():
+    engine = GameEngine(small_boards(), [ScriptedShooter([]), ScriptedShooter([])])
+    with pytest.raises(ValueError):
+        engine.step()
+
+
+def test_new_game_places_both_fleets():
+    shooters = [ComputerAI("easy", random.Random(1)) for _ in range(2)]
+    engine = GameEngine.new_game(shooters, rng=random.Random(1), first=1)
+    assert engine.current == 1
+    assert all(len(board.ships) == 6 for board in engine.boards)
+    result = engine.play()
+    assert result.winner in (0, 1)
+    assert engine.boards[1 - result.winner].all_ships_sunk()
+
+
+def test_play_games_is_reproducible():
+    first = play_games(20, ("hard", "easy"), random.Random(7))
+    second = play_games(20, ("hard", "easy"), random.Random(7))
+    assert first.games == 20 and sum(first.wins) + first.unfinished == 20
+    assert (first.wins, first.winning_shots, first.winning_shots_sq) == \
+        (second.wins, second.winning_shots, second.winning_shots_sq)
+    assert first.win_rate(0) > first.win_rate(1)
+
+
+def test_report_merge_matches_single_series():
+    whole = simulate(20, ("hard", "easy"), seed=3)
+    rng = random.Random(3)
+    merged = SimulationReport()
+    merged.merge(play_games(10, ("hard", "easy"), rng))
+    merged.merge(play_games(10, ("hard", "easy"), rng, first_offset=10))
+    assert (merged.games, merged.wins, merged.winning_shots) == \
+        (whole.games, whole.wins, whole.winning_shots)
+    assert merged.mean_shots_to_win(0) == whole.mean_shots_to_win(0)
+    assert "IA 1 (hard)" in format_report(whole, ("hard", "easy"))
+
+
+def test_empty_report():
+    report = SimulationReport()
+    assert report.win_rate(0) == 0.0
+    assert report.mean_shots_to_win(0) is None
+    assert report.shots_to_win_stdev(1) is None
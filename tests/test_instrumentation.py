@@ -0,0 +1,73 @@
+"""Tests de l'instrumentation optionnelle."""
+
+import json
+import random
+import pytest
+from battleship import instrumentation
+from battleship.instrumentation import Histogram
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.simulation import play_games
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_histogram_buckets_and_merge():
+    first, second = Histogram(), Histogram()
+    for value in (1, 2, 3, 100):
+        first.add(value)
+    second.add(5000)
+    first.merge(second)
+    summary = first.as_dict()
+    assert summary["count"] == 5 and summary["min"] == 1 and summary["max"] == 5000
+    assert summary["p50"] == 3 and summary["p99"] == 5000
+    assert summary["buckets"] == {"<2": 1, "<4": 2, "<128": 1, "<8192": 1}
+    assert Histogram().percentile(0.5) == 0
+
+
+def test_disabled_instrumentation_leaves_methods_untouched():
+    original = Board.__dict__["receive_shot"]
+    instrumentation.enable()
+    assert Board.__dict__["receive_shot"] is not original
+    instrumentation.disable()
+    assert Board.__dict__["receive_shot"] is original
+    assert not instrumentation.enabled
+
+
+def test_games_are_measured(instrumented):
+    report = play_games(3, ("hard", "easy"), random.Random(2))
+    stats = instrumentation.snapshot()
+    shots = stats["timings_ns"]["board.receive_shot"]["count"]
+    counters = stats["counters"]
+    assert shots == counters["board.hits"] + counters["board.misses"]
+    assert counters["board.sunk"] >= 6 * sum(report.wins)
+    assert "ai.get_shot.hard" in stats["timings_ns"]
+    assert stats["sizes"]["ai.potential_targets"]["count"] > 0
+    assert "board.receive_shot" in instrumentation.format_stats()
+    json.dumps(stats)
+
+
+def test_fallback_counter(instrumented):
+    ai = ComputerAI("hard", random.Random(0))
+    board = Board(10)
+    ai.last_hit = (0, 0)
+    ai.potential_targets = [(5, 5)]
+    board.receive_shot(5, 5)
+    ai.get_shot(board)
+    assert instrumentation.snapshot()["counters"]["ai.fallback.stale_target"] == 1
+
+
+def test_dump_appends_json_lines(tmp_path, instrumented):
+    path = str(tmp_path / "stats.jsonl")
+    instrumentation.count("essai", 2)
+    instrumentation.dump(path)
+    instrumentation.dump(path)
+    lines = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert len(lines) == 2 and lines[0]["counters"] == {"essai": 2}
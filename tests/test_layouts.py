@@ -0,0 +1,124 @@
+"""Tests des réserves de flottes et de leur usage dans les parties sans interface."""
+
+import asyncio
+import random
+import pytest
+from battleship.analytics import run_analytics
+from battleship.models.board import Board
+from battleship.models.layouts import (LayoutPool, apply_layout, fleet_placer,
+                                       load_pool, pool_key)
+from battleship.models.placement import place_random_fleet
+from battleship.server import GameServer
+from battleship.simulation import play_games
+from battleship.tournament import make_tasks, play_chunk
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+class _Records(list):
+    def write(self, record):
+        self.append(record)
+
+
+def test_pool_key_uses_fleet_order():
+    assert pool_key("hard", 10, {"a": 5, "b": 2}) == "hard:10:5,2"
+
+
+def test_apply_layout_places_fleet_and_rejects_overlap():
+    fleet = {"a": 3, "b": 2}
+    board = Board(5)
+    ships = apply_layout(board, fleet, ((0, 0, True), (0, 1, False)))
+    assert [ship.name for ship in ships] == ["a", "b"]
+    with pytest.raises(ValueError):
+        apply_layout(Board(5), fleet, ((0, 0, True), (1, 0, False)))
+    with pytest.raises(ValueError):
+        apply_layout(Board(5), fleet, ((0, 0, True),))
+
+
+def test_layout_pool_draws_its_layouts():
+    layouts = [((0, 0, True), (0, 2, True)), ((1, 1, False), (3, 0, False))]
+    pool = LayoutPool(layouts)
+    rng = random.Random(0)
+    for _ in range(10):
+        board = Board(5)
+        ships = pool.place(board, {"a": 3, "b": 2}, rng)
+        origin = tuple((ship.x, ship.y, ship.horizontal) for ship in ships)
+        assert origin in pool.layouts
+    with pytest.raises(ValueError):
+        LayoutPool([])
+
+
+def test_fleet_placer_random_and_missing_pool():
+    assert fleet_placer("random", 10, SHIPS_CONFIG) is place_random_fleet
+    with pytest.raises(ValueError, match="Aucune réserve"):
+        fleet_placer("easy", 10, SHIPS_CONFIG)
+
+
+def test_headless_games_use_pools():
+    records = _Records()
+    play_games(6, ("hard", "density"), random.Random(1), log=records,
+               placement=("hard", "random"))
+    layouts = load_pool("hard", 10, SHIPS_CONFIG).layouts
+    assert all(record.placements[0] in layouts for record in records)
+    assert any(record.placements[1] not in layouts for record in records)
+
+
+def test_tournament_chunks_carry_placement():
+    tasks = make_tasks(["hard", "density"], 4, 2, 5,
+                       placement=("density", "hard"))
+    assert all(task.placement == ("density", "hard") for task in tasks)
+    _, report = play_chunk(tasks[1])
+    expected = play_games(2, ("hard", "density"),
+                          random.Random("5:hard:density:1"),
+                          first_offset=2, placement=("density", "hard"))
+    assert (report.wins, report.winning_shots) == (expected.wins,
+                                                    expected.winning_shots)
+    default = make_tasks(["hard", "easy"], 2, 2, 0)[0]
+    assert default.placement == ("random", "random")
+
+
+def test_analytics_uses_placement():
+    pooled = run_analytics(("hard", "hard"), 4, chunk_size=2, workers=1,
+                           placement=("hard", "hard"))
+    plain = run_analytics(("hard", "hard"), 4, chunk_size=2, workers=1)
+    assert pooled.games == plain.games == 4
+    assert pooled.to_dict() != plain.to_dict()
+
+
+def test_server_places_ai_fleet_from_pool():
+    async def scenario():
+        server = GameServer(rng=random.Random(2))
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        writer.write(b"AI easy 10 standard hard\n")
+        reply = (await reader.readline()).decode().split()
+        board = next(iter(server.games.values())).boards[1]
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return reply, board
+
+    reply, board = asyncio.run(scenario())
+    assert reply[0] == "GAME"
+    origin = tuple((ship.x, ship.y, ship.horizontal or ship.size < 2)
+                   for ship in board.ships)
+    assert origin in load_pool("hard", 10, SHIPS_CONFIG).layouts
+
+
+def test_server_rejects_unknown_pool():
+    async def scenario():
+        server = GameServer(rng=random.Random(2))
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await reader.readline()
+        writer.write(b"WATCH easy easy 10 standard random easy\n")
+        reply = (await reader.readline()).decode().split()
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return reply, server.games
+
+    reply, games = asyncio.run(scenario())
+    assert reply[0] == "ERR" and not games
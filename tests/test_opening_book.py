@@ -0,0 +1,93 @@
+"""Tests du livre d'ouvertures (format version 2)."""
+
+import random
+import pytest
+from battleship.book_generator import generate_book
+from battleship.models import opening_book, transposition
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.opening_book import OpeningBook, fleet_key
+from battleship.models.placement import place_random_fleet
+from battleship.utils.constants import SHIPS_CONFIG
+
+FLEET = {"a": 3, "b": 2, "c": 2}
+
+
+def play(ai, board):
+    shots = []
+    while not board.all_ships_sunk():
+        x, y = ai.get_shot(board)
+        shots.append((x, y))
+        hit, ship = board.receive_shot(x, y)
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    return shots
+
+
+@pytest.fixture
+def no_cache():
+    """Désactive la table de transposition pour isoler le livre."""
+    cache = transposition.SHARED_CACHE
+    saved = cache.max_size
+    cache.clear()
+    cache.configure(0)
+    yield
+    cache.configure(saved)
+    opening_book.set_default_book(None)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    book = generate_book(30, 6, 6, FLEET, seed=1, min_count=1)
+    path = str(tmp_path / "livre.bin")
+    book.save(path)
+    loaded = OpeningBook(path)
+    assert loaded.sections == book.sections
+    assert len(loaded) == len(book) > 0
+    with open(path, "rb") as file:
+        assert file.read(5) == opening_book.MAGIC + bytes((opening_book.VERSION,))
+
+
+def test_other_versions_and_truncated_files_are_rejected(tmp_path):
+    old = tmp_path / "ancien.bin"
+    old.write_bytes(opening_book.MAGIC + bytes((1,)))
+    with pytest.raises(ValueError, match="version"):
+        OpeningBook(str(old)).lookup(10, (5,), 0)
+    book = generate_book(10, 4, 6, FLEET, seed=2, min_count=1)
+    path = tmp_path / "livre.bin"
+    book.save(str(path))
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError, match="tronqué"):
+        OpeningBook(str(path)).sections
+
+
+def test_book_moves_match_density_decisions(no_cache):
+    book = generate_book(40, 8, 6, FLEET, seed=3, min_count=1)
+    opening_book.set_default_book(book)
+    for seed in range(5):
+        boards = [Board(6), Board(6)]
+        for board in boards:
+            place_random_fleet(board, FLEET, random.Random(seed))
+        with_book = play(ComputerAI("density", random.Random(seed), FLEET), boards[0])
+        without = play(ComputerAI("density", random.Random(seed), FLEET,
+                                  use_book=False), boards[1])
+        assert with_book == without
+
+
+def test_shipped_book_agrees_with_density(no_cache):
+    book = opening_book.default_book()
+    section = book.sections.get((10, fleet_key(SHIPS_CONFIG.values())))
+    assert section
+    board = Board(10)
+    place_random_fleet(board, SHIPS_CONFIG, random.Random(0))
+    ai = ComputerAI("density", random.Random(0), use_book=False)
+    checked = 0
+    for _ in range(10):
+        cell = section.get(board.zobrist)
+        x, y = ai.get_shot(board)
+        if cell is not None:
+            assert cell == y * 10 + x
+            checked += 1
+        hit, ship = board.receive_shot(x, y)
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    assert checked
@@ -0,0 +1,73 @@
+"""Tests de l'index de placements et du placement aléatoire des flottes."""
+
+import random
+import pytest
+from battleship.models.board import Board
+from battleship.models.placement import (pick_placement, place_random_fleet,
+                                         placement_count, placement_index,
+                                         uses_index)
+from battleship.models.ship import Ship
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+@pytest.mark.parametrize("size, length", [(10, 5), (10, 1), (7, 3), (4, 4)])
+def test_index_enumerates_every_segment(size, length):
+    index = placement_index(size, length)
+    per_row = size - length + 1
+    expected = per_row * size * (1 if length == 1 else 2)
+    assert len(index.masks) == len(index.cells) == len(index.origins) == expected
+    assert placement_count(size, length) == expected
+    for mask, cells, (x, y, horizontal) in zip(index.masks, index.cells,
+                                               index.origins):
+        assert mask == sum(1 << cell for cell in cells)
+        assert cells[0] == y * size + x
+        board = Board(size)
+        assert board.place_ship(Ship("s", length), x, y, horizontal)
+        assert board.ship_mask == mask
+
+
+def test_by_cell_lists_covering_placements():
+    index = placement_index(6, 3)
+    for cell, placements in enumerate(index.by_cell):
+        assert placements == tuple(p for p, cells in enumerate(index.cells)
+                                   if cell in cells)
+
+
+def test_pick_placement_avoids_occupied_cells():
+    size = 5
+    rng = random.Random(0)
+    free = {2, 7, 12}
+    occupied = sum(1 << cell for cell in range(size * size) if cell not in free)
+    for _ in range(20):
+        placement = pick_placement(size, 3, occupied, rng)
+        assert placement_index(size, 3).origins[placement] == (2, 0, False)
+    assert pick_placement(size, 4, occupied, rng) == -1
+    assert pick_placement(2, 3, 0, rng) == -1
+
+
+@pytest.mark.parametrize("size", [10, 80])
+def test_random_fleet_is_valid_and_reproducible(size):
+    boards = [Board(size), Board(size)]
+    for board in boards:
+        place_random_fleet(board, SHIPS_CONFIG, random.Random(9))
+    first, second = boards
+    assert [ship.name for ship in first.ships] == list(SHIPS_CONFIG)
+    assert first.ship_mask == second.ship_mask
+    assert bin(first.ship_mask).count("1") == sum(SHIPS_CONFIG.values())
+    assert uses_index(size) == (size == 10)
+
+
+def test_random_fleet_completes_partial_board():
+    board = Board(10)
+    board.place_ship(Ship("Porte-avions", 5), 0, 0, True)
+    rest = {name: length for name, length in SHIPS_CONFIG.items()
+            if name != "Porte-avions"}
+    place_random_fleet(board, rest, random.Random(2))
+    assert len(board.ships) == len(SHIPS_CONFIG)
+    assert bin(board.ship_mask).count("1") == sum(SHIPS_CONFIG.values())
+
+
+def test_impossible_fleet_raises():
+    with pytest.raises(ValueError):
+        place_random_fleet(Board(3), {"a": 3, "b": 3, "c": 3, "d": 2},
+                           random.Random(0), max_attempts=5)
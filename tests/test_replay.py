@@ -0,0 +1,81 @@
+"""Tests du journal binaire des parties (format BSLG)."""
+
+import random
+import pytest
+from battleship import replay
+from battleship.replay import (GameLogWriter, encode_game, read_games,
+                               replay_game)
+from battleship.simulation import play_games, simulate
+
+
+class _Records(list):
+    def write(self, record):
+        self.append(record)
+
+
+@pytest.fixture
+def records():
+    games = _Records()
+    play_games(5, ("hard", "easy"), random.Random(3), log=games)
+    play_games(2, ("density", "easy"), random.Random(4), size=12,
+               ships_config={"Grand": 6, "Navire 2": 3, "Petit": 1}, log=games)
+    return games
+
+
+def test_log_round_trip(tmp_path, records):
+    path = str(tmp_path / "parties.bslog")
+    with GameLogWriter(path) as log:
+        for record in records[:3]:
+            log.write(record)
+    with GameLogWriter(path) as log:
+        for record in records[3:]:
+            log.write(record)
+    assert list(read_games(path)) == list(records)
+    with open(path, "rb") as file:
+        assert file.read(5) == replay.MAGIC + bytes((replay.VERSION,))
+
+
+def test_reader_streams_across_chunks(tmp_path, records, monkeypatch):
+    monkeypatch.setattr(replay, "_CHUNK_SIZE", 7)
+    path = str(tmp_path / "parties.bslog")
+    with GameLogWriter(path) as log:
+        for record in records:
+            log.write(record)
+    assert list(read_games(path)) == list(records)
+
+
+def test_replay_reproduces_final_boards(records):
+    for record in records:
+        boards = replay_game(record)
+        assert boards[1 - record.winner].all_ships_sunk()
+        assert not boards[record.winner].all_ships_sunk()
+        partial = replay_game(record, upto=4)
+        assert sum(board.shot_count for board in partial) == 4
+
+
+def test_replay_detects_altered_results(records):
+    record = records[0]
+    shot = record.shots[0]
+    altered = record._replace(shots=(shot._replace(hit=not shot.hit),)
+                              + record.shots[1:])
+    with pytest.raises(ValueError):
+        replay_game(altered)
+
+
+def test_invalid_and_truncated_logs(tmp_path, records):
+    bad = tmp_path / "mauvais.bslog"
+    bad.write_bytes(b"NOPE\x01")
+    with pytest.raises(ValueError):
+        list(read_games(str(bad)))
+    truncated = tmp_path / "tronque.bslog"
+    data = encode_game(records[0])
+    truncated.write_bytes(replay.MAGIC + bytes((replay.VERSION,)) + data[:-3])
+    with pytest.raises(ValueError, match="tronquée"):
+        list(read_games(str(truncated)))
+
+
+def test_simulate_appends_to_log(tmp_path):
+    path = str(tmp_path / "parties.bslog")
+    simulate(3, ("easy", "easy"), seed=1, log_path=path)
+    simulate(2, ("easy", "easy"), seed=2, log_path=path)
+    assert len(list(read_games(path))) == 5
@@ -0,0 +1,111 @@
+"""Tests du serveur de parties sur une socket locale."""
+
+import asyncio
+import random
+from battleship.server import GameServer
+
+
+async def _session(server: GameServer, commands):
+    """Ouvre une connexion, envoie des commandes et rend les réponses."""
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return await commands(reader, writer)
+    finally:
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+
+
+async def _send(writer, line: str):
+    writer.write((line + "\n").encode())
+    await writer.drain()
+
+
+async def _read(reader) -> list:
+    return (await asyncio.wait_for(reader.readline(), 10)).decode().split()
+
+
+def test_game_against_ai_over_socket():
+    async def commands(reader, writer):
+        assert await _read(reader) == ["WELCOME", "1"]
+        await _send(writer, "AI easy 6 3,2")
+        game = await _read(reader)
+        assert game[0] == "GAME" and game[3:] == ["6", "3,2"]
+        await _send(writer, "AUTO")
+        assert await _read(reader) == ["OK", "0"]
+        cells = iter([(x, y) for y in range(6) for x in range(6)])
+        results = []
+        while True:
+            words = await _read(reader)
+            if words[0] == "TURN":
+                await _send(writer, "FIRE %d %d" % next(cells))
+            elif words[0] == "RESULT":
+                results.append(words[3])
+            elif words[0] in ("WIN", "LOSE"):
+                return words[0], results
+            else:
+                assert words[0] in ("START", "INCOMING"), words
+
+    server = GameServer(rng=random.Random(3))
+    outcome, results = asyncio.run(_session(server, commands))
+    assert outcome in ("WIN", "LOSE")
+    if outcome == "WIN":
+        assert results.count("SUNK") == 2 and results.count("HIT") == 3
+    assert not server.games
+
+
+def test_oversized_fleet_is_rejected_without_allocation():
+    async def commands(reader, writer):
+        await _read(reader)
+        replies = []
+        for line in ("AI easy 10 2x1000000000", "AI easy 10 11",
+                     "AI easy 101", "AI easy 4 4x5", "AI unknown 10"):
+            await _send(writer, line)
+            replies.append(await _read(reader))
+        return replies
+
+    server = GameServer(rng=random.Random(0))
+    replies = asyncio.run(_session(server, commands))
+    assert all(reply[0] == "ERR" for reply in replies)
+    assert not server.games
+
+
+def test_costly_fleets_are_rejected_before_indexing():
+    from battleship.models.placement import placement_index
+
+    async def commands(reader, writer):
+        await _read(reader)
+        replies = []
+        every_length = ",".join(str(length) for length in range(1, 65))
+        for line in ("AI hard 64 " + every_length, "AI hard 64 1,2,3,4,5,6,7",
+                     "AI hard 64 1,2,3,4,5",
+                     "AI hard 64 standard"):
+            await _send(writer, line)
+            replies.append(await _read(reader))
+        await _send(writer, "QUIT")
+        return replies
+
+    placement_index.cache_clear()
+    server = GameServer(rng=random.Random(0))
+    replies = asyncio.run(_session(server, commands))
+    assert [reply[0] for reply in replies] == ["ERR", "ERR", "ERR", "GAME"]
+    assert placement_index.cache_info().currsize <= 4
+
+
+def test_watch_streams_an_ai_game():
+    async def commands(reader, writer):
+        await _read(reader)
+        await _send(writer, "WATCH easy hard 5 2,2")
+        shots = 0
+        while True:
+            words = await _read(reader)
+            if words[0] == "SHOT":
+                shots += 1
+            elif words[0] == "OVER":
+                return shots, int(words[1])
+
+    server = GameServer(rng=random.Random(1))
+    shots, winner = asyncio.run(_session(server, commands))
+    assert winner in (0, 1) and 4 <= shots <= 50
@@ -0,0 +1,37 @@
+"""Tests de la représentation compacte des navires."""
+
+import pytest
+from battleship.models.ship import Ship
+
+
+def test_unplaced_ship():
+    ship = Ship("Sous-marin", 3)
+    assert ship.positions == [] and ship.hits == []
+    assert not ship.hit(0, 0)
+    assert not ship.is_sunk()
+
+
+@pytest.mark.parametrize("horizontal, cells", [
+    (True, [(2, 4), (3, 4), (4, 4)]),
+    (False, [(2, 4), (2, 5), (2, 6)]),
+])
+def test_positions_follow_orientation(horizontal, cells):
+    ship = Ship("Croiseur", 3)
+    ship.place(2, 4, horizontal)
+    assert ship.positions == cells
+
+
+def test_hits_are_counted_once_and_sink():
+    ship = Ship("Croiseur", 3)
+    ship.place(1, 1, False)
+    assert ship.hit(1, 2)
+    assert not ship.hit(1, 2)
+    assert not ship.hit(2, 2) and not ship.hit(1, 4) and not ship.hit(1, 0)
+    assert ship.hits == [(1, 2)] and ship.hit_mask == 0b010
+    assert ship.hit(1, 1) and ship.hit(1, 3)
+    assert ship.hit_count == 3 and ship.is_sunk()
+    assert ship.hits == ship.positions
+
+
+def test_ships_have_no_instance_dict():
+    assert not hasattr(Ship("a", 1), "__dict__")
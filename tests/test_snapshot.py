@@ -0,0 +1,130 @@
+"""Tests des instantanés de partie (versions 1 à 3)."""
+
+import random
+import struct
+import pytest
+from battleship import snapshot
+from battleship.engine import GameEngine
+from battleship.models.computer_ai import ComputerAI
+from battleship.snapshot import (decode_snapshot, encode_snapshot,
+                                 restore_engine, snapshot_engine)
+
+
+def new_engine(difficulties=("hard", "easy"), seed=6, record=True):
+    rng = random.Random(seed)
+    shooters = [ComputerAI(difficulty, random.Random(seed + side))
+                for side, difficulty in enumerate(difficulties)]
+    return GameEngine.new_game(shooters, rng=rng, first=1, record=record)
+
+
+def remaining_shots(engine):
+    shots = []
+    while not engine.is_over:
+        result = engine.step()
+        shots.append((result.shooter, result.x, result.y, result.hit))
+    return shots
+
+
+@pytest.mark.parametrize("record", [True, False])
+def test_engine_round_trip_continues_identically(record):
+    engine = new_engine(record=record)
+    for _ in range(37):
+        engine.step()
+    data = snapshot_engine(engine)
+    restored = restore_engine(data)
+    assert restored.current == engine.current
+    assert restored.stats == engine.stats
+    if record:
+        assert [tuple(shot[:4]) for shot in restored.history] == \
+            [tuple(shot[:4]) for shot in engine.history]
+    assert remaining_shots(restored) == remaining_shots(engine)
+    assert restored.winner == engine.winner
+
+
+def test_snapshot_without_rng_is_smaller():
+    engine = new_engine()
+    for _ in range(10):
+        engine.step()
+    assert len(snapshot_engine(engine, include_rng=False)) < 500 < \
+        len(snapshot_engine(engine))
+
+
+def test_profile_and_params_survive():
+    engine = new_engine(("density", "hard"))
+    engine.shooters[1].params = engine.shooters[1].params._replace(space_weight=0.25)
+    for _ in range(20):
+        engine.step()
+    restored = restore_engine(snapshot_engine(engine))
+    assert restored.shooters[1].params.space_weight == 0.25
+    assert restored.shooters[0].difficulty == "density"
+    assert remaining_shots(restored) == remaining_shots(engine)
+
+
+def _text(text):
+    encoded = text.encode("utf-8")
+    return bytes((len(encoded),)) + encoded
+
+
+def _varint(value):
+    out = bytearray()
+    snapshot._put_varint(out, value)
+    return bytes(out)
+
+
+def legacy_snapshot(engine, version):
+    """Instantané aux formats 1 ou 2 (IA sans générateur stocké)."""
+    size = engine.boards[0].size
+    data = bytearray(encode_snapshot(engine.boards, (), (), include_rng=False))
+    assert data[-2:] == b"\x00\x00"
+    data[len(snapshot.MAGIC)] = version
+    del data[-2:]
+    data += _varint(2)
+    for side, ai in enumerate(engine.shooters):
+        target = engine.boards[1 - side]
+        data += _varint(1 - side) + _varint(0) + _text(ai.difficulty)
+        data += b"\x00" + bytes((ai.use_book,))
+        if version >= 2:
+            data += _text("") + _varint(0)
+        data += _varint(len(ai.ships_config))
+        for name, length in ai.ships_config.items():
+            data += _text(name) + _varint(length)
+        last = ai.last_hit
+        data += _varint(0 if last is None else last[1] * size + last[0] + 1)
+        for cells in (ai.potential_targets, ai.successful_hits):
+            data += _varint(len(cells))
+            for x, y in cells:
+                data += _varint(y * size + x)
+        data += _varint(len(ai.sunk_ships))
+        for ship in ai.sunk_ships:
+            data += _varint(target.ships.index(ship))
+        data += struct.pack("<Q", 0x0123456789ABCDEF) + _varint(len(target.shots))
+    data += _varint(2) + _varint(engine.current) + _varint(1)
+    return bytes(data)
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_legacy_versions_are_decoded(version):
+    engine = new_engine(("density", "density"))
+    for _ in range(41):
+        engine.step()
+    decoded = decode_snapshot(legacy_snapshot(engine, version))
+    assert decoded.counters == (engine.current, 1)
+    for (ai, target), original in zip(decoded.ais, engine.shooters):
+        assert ai.difficulty == "density" and ai.profile is None
+        assert ai.last_hit == original.last_hit
+        assert ai.successful_hits == original.successful_hits
+        assert [ship.name for ship in ai.sunk_ships] == \
+            [ship.name for ship in original.sunk_ships]
+    restored = restore_engine(legacy_snapshot(engine, version))
+    assert restored.boards[0].zobrist == engine.boards[0].zobrist
+    assert remaining_shots(restored) == remaining_shots(engine)
+
+
+def test_invalid_snapshots_are_rejected():
+    data = snapshot_engine(new_engine())
+    with pytest.raises(ValueError, match="invalide"):
+        decode_snapshot(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="Version"):
+        decode_snapshot(data[:4] + b"\x09" + data[5:])
+    with pytest.raises(ValueError, match="tronqué"):
+        decode_snapshot(data[:-40])
@@ -0,0 +1,86 @@
+"""Tests du solveur (énumération exacte et tirages Monte Carlo)."""
+
+import itertools
+import random
+import pytest
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.placement import place_random_fleet, placement_index
+from battleship.models.solver import MonteCarloTargeting, exact_occupancy
+from battleship.models.ship import Ship
+
+
+def brute_force(size, lengths, blocked, open_hits):
+    """Occupation par énumération naïve (flottes comptées une fois)."""
+    options = [[mask for mask in placement_index(size, length).masks
+                if not mask & blocked] for length in lengths]
+    fleets = set()
+    for masks in itertools.product(*options):
+        union = 0
+        for mask in masks:
+            if mask & union:
+                break
+            union |= mask
+        else:
+            if not open_hits & ~union:
+                fleets.add(tuple(sorted(zip(lengths, masks))))
+    counts = [0] * (size * size)
+    for fleet in fleets:
+        for _, mask in fleet:
+            for cell in range(size * size):
+                counts[cell] += mask >> cell & 1
+    return len(fleets), tuple(counts)
+
+
+@pytest.mark.parametrize("lengths, blocked, open_hits", [
+    ((3, 2), 0, 0),
+    ((3, 2, 2), 1 << 5 | 1 << 10, 0),
+    ((3, 2), 1 << 0, 1 << 6),
+    ((2, 2, 2), 0, 1 << 15 | 1 << 3),
+])
+def test_exact_occupancy_matches_brute_force(lengths, blocked, open_hits):
+    assert exact_occupancy(4, lengths, blocked, open_hits) == \
+        brute_force(4, lengths, blocked, open_hits)
+
+
+def play(ai, board):
+    shots = 0
+    while not board.all_ships_sunk():
+        x, y = ai.get_shot(board)
+        assert not board.is_shot(x, y)
+        shots += 1
+        hit, ship = board.receive_shot(x, y)
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    return shots
+
+
+def test_solver_finishes_games_quickly():
+    rng = random.Random(11)
+    fleet = {"a": 4, "b": 3, "c": 2}
+    total = 0
+    for game in range(3):
+        board = Board(8)
+        place_random_fleet(board, fleet, rng)
+        total += play(ComputerAI("solver", random.Random(game), fleet), board)
+    assert total / 3 < 40
+
+
+def test_solver_targets_the_only_possible_cell():
+    fleet = {"a": 2}
+    board = Board(4)
+    board.place_ship(Ship("a", 2), 1, 1, True)
+    solver = MonteCarloTargeting(4, fleet, random.Random(0))
+    board.receive_shot(1, 1)
+    for x, y in [(0, 1), (1, 0), (1, 2)]:
+        board.receive_shot(x, y)
+    assert solver.best_cell(board) == (2, 1)
+    assert solver.last_exact and solver.last_samples == 1
+
+
+def test_sampling_is_used_on_open_boards():
+    solver = MonteCarloTargeting(10, {"a": 5, "b": 4, "c": 3, "d": 3, "e": 2},
+                                 random.Random(0), samples=200)
+    x, y = solver.best_cell(Board(10))
+    assert not solver.last_exact and solver.last_samples == 200
+    assert 0 <= x < 10 and 0 <= y < 10
@@ -0,0 +1,94 @@
+"""Tests du tournoi multi-processus."""
+
+import random
+import pytest
+from battleship.simulation import SimulationReport, play_games
+from battleship.tournament import (chunk_seed, format_table, make_tasks,
+                                   mean_interval, play_chunk, run_tournament, wilson_interval)
+
+
+def totals(strategies, games, **options):
+    results = {}
+    for pairing, report in run_tournament(strategies, games, master_seed=4,
+                                          chunk_size=5, **options):
+        results.setdefault(pairing, SimulationReport()).merge(report)
+    return {pairing: (report.games, report.wins, report.winning_shots,
+                      report.winning_shots_sq)
+            for pairing, report in results.items()}
+
+
+def test_make_tasks_splits_every_pairing():
+    tasks = make_tasks(["easy", "hard", "density"], 12, 5, 0)
+    assert len(tasks) == 3 * 3
+    assert {task.pairing for task in tasks} == {("easy", "hard"),
+                                                ("easy", "density"),
+                                                ("hard", "density")}
+    assert [task.games for task in tasks[:3]] == [5, 5, 2]
+
+
+def test_results_do_not_depend_on_worker_count():
+    sequential = totals(["easy", "hard"], 12, workers=1)
+    parallel = totals(["easy", "hard"], 12, workers=2)
+    assert sequential == parallel
+    assert sequential[("easy", "hard")][0] == 12
+
+
+def test_shared_cache_does_not_change_results():
+    sequential = totals(["density", "hard"], 10, workers=1)
+    shared = totals(["density", "hard"], 10, workers=2, warmup_games=3)
+    assert sequential == shared
+
+
+def test_warmup_also_runs_in_a_single_process(monkeypatch):
+    from battleship import tournament
+    from battleship.models import transposition
+
+    warmups = []
+
+    def counting_play_games(games, pairing, *args, **kwargs):
+        warmups.append((games, pairing))
+        return play_games(games, pairing, *args, **kwargs)
+
+    cache = transposition.SHARED_CACHE
+    saved = cache.max_size, cache.policy
+    cache.clear()
+    try:
+        expected = totals(["density", "hard"], 10, workers=1)
+        cache.clear()
+        monkeypatch.setattr(tournament, "play_games", counting_play_games)
+        warmed = totals(["density", "hard"], 10, workers=1, warmup_games=3)
+        assert warmups[0] == (3, ("density", "hard"))
+        assert warmed == expected
+        # Sans lot à jouer, la table ne contient que l'échauffement
+        cache.clear()
+        assert totals(["density", "hard"], 0, workers=1, warmup_games=3) == {}
+        assert len(cache) > 0
+    finally:
+        cache.clear()
+        cache.configure(*saved)
+
+
+def test_chunk_matches_play_games_with_its_seed():
+    task = make_tasks(["easy", "hard"], 10, 5, 8)[1]
+    pairing, report = play_chunk(task)
+    expected = play_games(5, ("easy", "hard"),
+                          random.Random(chunk_seed(8, ("easy", "hard"), 1)),
+                          first_offset=5)
+    assert pairing == ("easy", "hard")
+    assert (report.wins, report.winning_shots) == (expected.wins,
+                                                    expected.winning_shots)
+
+
+def test_wilson_interval_bounds():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(50, 100)
+    assert low < 0.5 < high and high - low == pytest.approx(0.19, abs=0.01)
+    assert wilson_interval(100, 100)[1] == 1.0
+
+
+def test_format_table_lists_pairings():
+    report = play_games(10, ("hard", "easy"), random.Random(0))
+    table = format_table({("hard", "easy"): report})
+    assert "hard" in table.splitlines()[1]
+    interval = mean_interval(report, 0)
+    assert interval is None or interval[1] <= interval[0] <= interval[2]
@@ -0,0 +1,146 @@
+"""Tests des empreintes de Zobrist et de la table de transposition."""
+
+import random
+
+import pytest
+
+from battleship.models import transposition
+from battleship.models.board import Board
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.placement import place_random_fleet
+from battleship.models.transposition import SharedTable, TranspositionCache
+from battleship.utils.constants import SHIPS_CONFIG
+
+
+def fleet_board(seed: int, size: int = 10) -> Board:
+    board = Board(size)
+    place_random_fleet(board, SHIPS_CONFIG, random.Random(seed))
+    return board
+
+
+def play(ai, board):
+    shots = []
+    while not board.all_ships_sunk():
+        x, y = ai.get_shot(board)
+        shots.append((x, y))
+        hit, ship = board.receive_shot(x, y)
+        if hit:
+            ai.notify_hit(x, y, ship is not None, ship)
+    return shots
+
+
+@pytest.fixture
+def shared_cache():
+    """Table du processus, remise dans son état initial après le test."""
+    cache = transposition.SHARED_CACHE
+    saved = cache.max_size, cache.policy
+    cache.clear()
+    yield cache
+    cache.clear()
+    cache.configure(*saved)
+
+
+@pytest.mark.parametrize("size", [10, 70])
+def test_zobrist_does_not_depend_on_shot_order(size):
+    rng = random.Random(size)
+    cells = rng.sample(range(size * size), size * size // 2)
+    boards = [fleet_board(3, size) for _ in range(3)]
+    for index in cells:
+        boards[0].receive_shot(index % size, index // size)
+    for index in reversed(cells):
+        boards[1].receive_shot(index % size, index // size)
+    boards[2].receive_shots(sorted(cells))
+    assert boards[0].zobrist == boards[1].zobrist == boards[2].zobrist
+    assert boards[0].zobrist != fleet_board(3, size).zobrist
+
+
+def test_zobrist_ignores_repeated_shots():
+    board = fleet_board(4)
+    board.receive_shot(2, 3)
+    key = board.zobrist
+    board.receive_shot(2, 3)
+    assert board.zobrist == key
+
+
+def test_zobrist_distinguishes_hit_from_miss_and_sunk():
+    board = fleet_board(5)
+    ship = board.ships[-1]
+    cells = ship.positions
+    other = Board(10)
+    for x, y in cells:
+        board.receive_shot(x, y)
+        other.receive_shot(x, y)
+    assert board.zobrist != other.zobrist
+
+
+def test_cache_on_and_off_play_identical_moves(shared_cache):
+    def games():
+        return [play(ComputerAI("density", random.Random(seed)), fleet_board(seed))
+                for seed in range(4)]
+
+    shared_cache.configure(0)
+    reference = games()
+    assert shared_cache.hits == shared_cache.misses == 0
+    assert shared_cache.evictions == 0 and not len(shared_cache)
+
+    shared_cache.configure(1 << 16)
+    assert games() == reference
+    assert games() == reference
+    assert shared_cache.hits > 0
+
+
+def test_disabled_cache_skips_lookups():
+    cache = TranspositionCache(0)
+    cache.put(1, 5)
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+    assert not cache.active
+
+
+@pytest.mark.parametrize("policy, survivor", [("lru", 1), ("fifo", 3)])
+def test_eviction_policies(policy, survivor):
+    cache = TranspositionCache(2, policy)
+    cache.put(1, 10)
+    cache.put(2, 20)
+    assert cache.get(1) == 10
+    cache.put(3, 30)
+    assert cache.get(survivor) == survivor * 10
+    assert cache.get(2 if policy == "lru" else 1) is None
+    assert cache.evictions == 1
+    assert cache.hit_rate == pytest.approx(2 / 3)
+
+
+def test_configure_rejects_invalid_settings():
+    cache = TranspositionCache(4)
+    with pytest.raises(ValueError):
+        cache.configure(-1)
+    with pytest.raises(ValueError):
+        cache.configure(policy="random")
+    for key in range(1, 5):
+        cache.put(key, key)
+    cache.configure(2)
+    assert len(cache) == 2 and cache.evictions == 2
+
+
+def test_shared_table_round_trip():
+    cache = TranspositionCache(100)
+    entries = {transposition.position_key(7, seed): seed % 100
+               for seed in range(50)}
+    for key, cell in entries.items():
+        cache.put(key, cell)
+    missing = next(key for key in range(1, 100) if key not in entries)
+    table = SharedTable.publish(cache)
+    reader = SharedTable.attach(table.name)
+    try:
+        assert len(reader) == 50
+        assert all(reader.get(key) == cell for key, cell in entries.items())
+        assert reader.get(missing) is None
+
+        local = TranspositionCache(0)
+        local.shared = reader
+        assert local.active
+        key, cell = next(iter(entries.items()))
+        assert local.get(key) == cell and local.shared_hits == 1
+    finally:
+        reader.close()
+        table.close()
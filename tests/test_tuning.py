@@ -0,0 +1,120 @@
+"""Tests des paramètres de stratégie, des profils et de la recherche."""
+
+import json
+import random
+import pytest
+from battleship import tuning
+from battleship.models.computer_ai import ComputerAI
+from battleship.models.params import (DEFAULT_PARAMS, SEARCH_SPACE, TUNABLE,
+                                      StrategyParams, is_known_difficulty,
+                                      load_profile, params_from_dict,
+                                      read_profiles, save_profile)
+
+SMALL_FLEET = {"Croiseur": 3, "Torpilleur": 2}
+
+
+def test_params_from_dict_fills_defaults_and_converts_types():
+    params = params_from_dict({"parity": 1.0, "target_weight": 8})
+    assert params == DEFAULT_PARAMS._replace(parity=1, target_weight=8.0)
+    assert isinstance(params.parity, int)
+    assert isinstance(params.target_weight, float)
+    assert params_from_dict({}) == DEFAULT_PARAMS
+
+
+def test_params_from_dict_rejects_unknown_keys():
+    with pytest.raises(ValueError, match="inconnus"):
+        params_from_dict({"parity": 1, "aggressivite": 2})
+
+
+def test_shipped_profile_loads():
+    difficulty, params = load_profile("hard-tuned")
+    assert difficulty == "hard"
+    assert params.parity == 1
+    assert is_known_difficulty("hard-tuned")
+    assert is_known_difficulty("density")
+    assert not is_known_difficulty("introuvable")
+    with pytest.raises(ValueError, match="inconnu"):
+        load_profile("introuvable")
+
+
+def test_save_profile_round_trip_keeps_other_profiles(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    first = StrategyParams(parity=1, space_weight=0.5)
+    second = StrategyParams(target_weight=4.0, smoothing=0.25)
+    save_profile("a", "hard", first, path, mean_shots=50.0)
+    save_profile("b", "density", second, path)
+    assert load_profile("a", path) == ("hard", first)
+    assert load_profile("b", path) == ("density", second)
+    assert read_profiles(path)["a"]["mean_shots"] == 50.0
+
+
+def test_read_profiles_rejects_other_versions(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"version": 99, "profiles": {}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="version"):
+        read_profiles(str(path))
+
+
+def test_computer_ai_uses_profile_params():
+    ai = ComputerAI("hard-tuned", random.Random(0))
+    assert ai.profile == "hard-tuned"
+    assert ai.difficulty == "hard"
+    assert ai.params == load_profile("hard-tuned")[1]
+
+
+@pytest.mark.parametrize("difficulty", ["easy", "hard", "density"])
+def test_sample_params_stays_in_search_space(difficulty):
+    rng = random.Random(3)
+    for _ in range(50):
+        params = tuning.sample_params(difficulty, rng)
+        for name in StrategyParams._fields:
+            value = getattr(params, name)
+            if name in TUNABLE[difficulty]:
+                low, high, _ = SEARCH_SPACE[name]
+                assert low <= value <= high
+            else:
+                assert value == getattr(DEFAULT_PARAMS, name)
+
+
+def test_evaluate_matches_sequential_games():
+    task = tuning.EvalTask(0, "hard", DEFAULT_PARAMS, 3, 4, 7, 6, SMALL_FLEET)
+    shots = [tuning.shots_to_win("hard", DEFAULT_PARAMS,
+                                 random.Random(f"7:{game}"), 6, SMALL_FLEET)
+             for game in range(3, 7)]
+    assert tuning.evaluate(task) == (0, 4, sum(shots),
+                                     sum(shot * shot for shot in shots))
+
+
+def search(**kwargs):
+    rounds = []
+    ranked = tuning.successive_halving(
+        "hard", candidates=4, games=6, seed=5, size=6,
+        ships_config=SMALL_FLEET, chunk_size=4,
+        progress=lambda number, survivors: rounds.append(len(survivors)),
+        **kwargs)
+    return rounds, [(candidate.params, candidate.games, candidate.shots,
+                     candidate.shots_sq) for candidate in ranked]
+
+
+def test_successive_halving_is_deterministic_and_halves():
+    rounds, ranked = search(workers=1)
+    assert rounds == [4, 2, 1]
+    assert search(workers=1) == (rounds, ranked)
+    assert DEFAULT_PARAMS in [params for params, *_ in ranked]
+    # Le vainqueur a joué 6, 12 puis 24 parties
+    assert ranked[0][1] == 24
+    assert sorted(games for _, games, *_ in ranked) == [6, 6, 12, 24]
+
+
+def test_successive_halving_same_result_with_processes():
+    assert search(workers=2) == search(workers=1)
+
+
+def test_main_saves_winning_profile(tmp_path, capsys):
+    path = str(tmp_path / "profiles.json")
+    tuning.main(["--ai", "easy", "--candidates", "2", "-n", "4", "--workers", "1",
+                 "--size", "6", "--fleet", "3,2", "--name", "essai",
+                 "-o", path])
+    difficulty, _ = load_profile("essai", path)
+    assert difficulty == "easy"
+    assert "essai" in capsys.readouterr().out
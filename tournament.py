@@ -0,0 +1,8 @@
+"""
+Script de tournoi entre IA sur plusieurs processus.
+"""
+
+from battleship.tournament import main
+
+if __name__ == "__main__":
+    main()